@@ -13,6 +13,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail
 from flask_cors import CORS
+from flask_migrate import Migrate
 from config import config
 from flask_talisman import Talisman
 
@@ -33,6 +34,7 @@ logger = logging.getLogger(__name__)
 db = SQLAlchemy()
 jwt = JWTManager()
 mail = Mail()
+migrate = Migrate()
 
 # ============================================================================
 #                         FONCTION FACTORY                                    
@@ -171,6 +173,7 @@ def create_app(config_name='default'):
     db.init_app(app)
     jwt.init_app(app)
     mail.init_app(app)
+    migrate.init_app(app, db, directory=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations'))
     
     # Configuration CORS
     CORS(app, resources={
@@ -192,12 +195,62 @@ def create_app(config_name='default'):
     from app.products.routes import products_bp
     from app.orders.routes import orders_bp
     from app.auth.admin_routes import admin_users_bp
+    from app.cart.routes import cart_bp
+    from app.exports.routes import exports_bp
 
     # Enregistrement des blueprints (UN SEUL ENDROIT)
     app.register_blueprint(admin_users_bp)
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(products_bp, url_prefix='/api/products')
     app.register_blueprint(orders_bp, url_prefix='/api/orders')
+    app.register_blueprint(cart_bp, url_prefix='/api/cart')
+    app.register_blueprint(exports_bp, url_prefix='/api/admin/export')
+
+    # ============================================================================
+    #                         COMMANDES CLI                                       
+    # ============================================================================
+
+    from app.products.search import init_search_index, search_cli
+    from app.products.suggest import suggestion_index
+    from app.utils.outbox import email_worker, email_worker_command
+    from app.utils.email_templates import init_email_templates, email_bench_command
+    from app.utils.stock import stock_cli
+    from app.products.importer import catalog_cli
+    from app.products.images import image_pipeline, images_cli
+    from app.utils.response_cache import response_cache
+    from app.utils.assets import asset_manifest, assets_cli, send_asset
+    from app.utils.compression import init_compression, compression_bench_command
+    from app.utils.serializers import init_json_provider, serialization_bench_command
+    from app.products.read import catalog_read_bench_command
+
+    app.cli.add_command(search_cli)
+    app.cli.add_command(email_worker_command)
+    app.cli.add_command(email_bench_command)
+    app.cli.add_command(stock_cli)
+    app.cli.add_command(catalog_cli)
+    app.cli.add_command(images_cli)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(compression_bench_command)
+    app.cli.add_command(serialization_bench_command)
+    app.cli.add_command(catalog_read_bench_command)
+
+    # Templates des emails compilés une fois pour toutes
+    init_email_templates()
+
+    # Cache serveur des réponses du catalogue
+    response_cache.init_app(app)
+
+    # Déclinaisons des images produits
+    image_pipeline.init_app(app)
+
+    # CSS / JS regroupés (manifeste produit par "flask assets build")
+    asset_manifest.init_app(app)
+
+    # Encodeur JSON orjson
+    init_json_provider(app)
+
+    # Compression gzip / brotli des réponses (middleware WSGI)
+    init_compression(app)
 
     # ============================================================================
     #                         GESTIONNAIRES D'ERREURS JWT                         
@@ -309,13 +362,25 @@ def create_app(config_name='default'):
         """
         return send_from_directory(app.static_folder, filename)
     
+    @app.route('/static/dist/<path:filename>')
+    def serve_dist(filename):
+        """
+        Sert les CSS / JS regroupés (précompressés, URL à empreinte)
+        """
+        return send_asset(filename)
+
     @app.route('/static/images/products/<path:filename>')
     def serve_backend_images(filename):
         """
         Sert les images stockées dans le dossier backend
         """
         backend_images_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images', 'products')
-        return send_from_directory(backend_images_path, filename)
+        response = send_from_directory(backend_images_path, filename)
+        
+        # Images stockées par contenu : l'URL change avec le fichier
+        if filename.startswith('sha256/'):
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
 
     # ============================================================================
     #                         ROUTES AUTHENTIFICATION                             
@@ -617,8 +682,13 @@ def create_app(config_name='default'):
     with app.app_context():
         try:
             db.create_all()
+            init_search_index()
+            suggestion_index.build()
             logger.info("Base de données initialisée")
         except Exception as e:
             logger.error(f"Erreur initialisation BDD: {str(e)}")
 
+    # Envoi des emails en arrière-plan (sinon : `flask email-worker`)
+    email_worker.init_app(app)
+
     return app
\ No newline at end of file
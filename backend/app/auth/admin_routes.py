@@ -11,6 +11,7 @@ from flask import Blueprint, request, jsonify, send_from_directory, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
+from app.utils.pagination import keyset_paginate, clamp_per_page
 from functools import wraps
 import secrets
 import string
@@ -63,15 +64,19 @@ def get_users():
     
     Query params:
         page (int): Numéro de page (défaut: 1)
-        per_page (int): Nombre d'éléments par page (défaut: 10)
+        per_page (int): Nombre d'éléments par page (défaut: 10, borné à PAGINATION_MAX_PER_PAGE)
         search (str): Terme de recherche (optionnel)
+        cursor (str): Curseur de pagination (optionnel, remplace page)
+        with_total (str): "false" pour ne pas calculer le total
         
     Returns:
         Response: Liste paginée des utilisateurs au format JSON
     """
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    per_page = clamp_per_page(request.args.get('per_page', type=int))
     search = request.args.get('search', '')
+    cursor = request.args.get('cursor')
+    with_total = request.args.get('with_total', 'true').lower() != 'false'
     
     query = User.query
     
@@ -83,12 +88,33 @@ def get_users():
             (User.lastname.ilike(search_term))
         )
     
-    users_page = query.order_by(User.created_at.desc()).paginate(page=page, per_page=per_page)
+    # Mode curseur : reprise après (created_at, id) de la dernière ligne
+    if cursor is not None:
+        try:
+            keyset_page = keyset_paginate(
+                query,
+                [User.created_at, User.id],
+                cursor=cursor,
+                per_page=per_page,
+                descending=True,
+                with_total=with_total
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+            
+        return jsonify({
+            'users': [user.to_dict() for user in keyset_page.items],
+            'total': keyset_page.total,
+            'next_cursor': keyset_page.next_cursor,
+            'has_more': keyset_page.has_more
+        })
+    
+    users_page = query.order_by(User.created_at.desc()).paginate(page=page, per_page=per_page, count=with_total)
     
     return jsonify({
         'users': [user.to_dict() for user in users_page.items],
         'total': users_page.total,
-        'pages': users_page.pages,
+        'pages': users_page.pages if with_total else None,
         'current_page': page
     })
 
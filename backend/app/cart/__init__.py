@@ -0,0 +1,5 @@
+# ============================================================================
+#                         INITIALISATION DU PACKAGE CART
+# ============================================================================
+
+# Le blueprint est défini dans app.cart.routes (importé par create_app)
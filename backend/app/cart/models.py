@@ -0,0 +1,59 @@
+# ============================================================================
+#                         MODÈLES DU PANIER
+# ============================================================================
+
+"""
+Panier conservé côté serveur
+Un panier appartient soit à un utilisateur connecté, soit à un visiteur
+anonyme identifié par un jeton aléatoire (en-tête X-Cart-Token).
+Les lignes ne stockent que le produit et la quantité : prix, nom et stock
+sont relus en base à chaque calcul (voir app.cart.utils.price_cart).
+"""
+
+from datetime import datetime
+from app import db
+
+class Cart(db.Model):
+    """
+    Panier d'un utilisateur ou d'un visiteur anonyme
+    """
+    __tablename__ = 'carts'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), unique=True, nullable=True)
+    token = db.Column(db.String(64), unique=True, nullable=True)
+    
+    # Métadonnées
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relations
+    items = db.relationship('CartItem', back_populates='cart', cascade='all, delete-orphan',
+                            order_by='CartItem.id')
+
+    def lines(self):
+        """Retourne les lignes sous forme de couples (product_id, quantité)"""
+        return [(item.product_id, item.quantity) for item in self.items]
+
+    def __repr__(self):
+        return f'<Cart {self.id}>'
+
+class CartItem(db.Model):
+    """
+    Ligne de panier
+    """
+    __tablename__ = 'cart_items'
+    __table_args__ = (
+        db.UniqueConstraint('cart_id', 'product_id', name='uq_cart_items_cart_product'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    cart_id = db.Column(db.Integer, db.ForeignKey('carts.id'), nullable=False, index=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False, default=1)
+    
+    # Relations
+    cart = db.relationship('Cart', back_populates='items')
+
+    def __repr__(self):
+        return f'<CartItem {self.product_id} x{self.quantity}>'
@@ -0,0 +1,198 @@
+# ============================================================================
+#                         ROUTES DU PANIER
+# ============================================================================
+
+"""
+API du panier : /api/cart
+Le panier est identifié par le JWT (utilisateur connecté) ou par l'en-tête
+X-Cart-Token (visiteur), dont la valeur est renvoyée dans le champ "token".
+"""
+
+from flask import Blueprint, request, jsonify, current_app
+from app import db
+from app.products.models import Product
+from app.cart.models import CartItem
+from app.cart.utils import get_current_cart, parse_cart_lines, price_cart, MAX_LINE_QUANTITY
+
+cart_bp = Blueprint('cart', __name__)
+
+def cart_response(cart, status=200):
+    """Sérialise un panier recalculé."""
+    data = price_cart(cart.lines() if cart else [])
+    data['token'] = cart.token if cart else None
+    return jsonify(data), status
+
+def _active_product_ids(product_ids):
+    """Filtre les IDs de produits existants et actifs (une requête)."""
+    if not product_ids:
+        return set()
+    rows = db.session.query(Product.id).filter(Product.id.in_(product_ids), Product.is_active == True)
+    return {row.id for row in rows}
+
+# ============================================================================
+#                         CONSULTATION ET REMPLACEMENT
+# ============================================================================
+
+@cart_bp.route('', methods=['GET'])
+def get_cart():
+    """
+    Retourne le panier avec prix, stock et totaux à jour
+    """
+    try:
+        cart = get_current_cart()
+        # Valide une éventuelle fusion panier anonyme -> utilisateur
+        db.session.commit()
+        return cart_response(cart)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de la récupération du panier: {str(e)}")
+        return jsonify({"error": "Erreur lors de la récupération du panier"}), 500
+
+@cart_bp.route('', methods=['PUT'])
+def replace_cart():
+    """
+    Remplace tout le contenu du panier (synchronisation du panier local)
+
+    Attend un JSON avec:
+        - items: [{product_id, quantity}]
+
+    Les produits inconnus ou désactivés sont ignorés.
+    """
+    try:
+        data = request.get_json() or {}
+        lines = parse_cart_lines(data.get('items', []))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        cart = get_current_cart(create=True)
+        active_ids = _active_product_ids([product_id for product_id, _ in lines])
+
+        # Lignes existantes mises à jour sur place (contrainte unique panier/produit) :
+        # un INSERT du même produit avant le DELETE de l'ancienne ligne échouerait
+        existing = {item.product_id: item for item in cart.items}
+        items = []
+        for product_id, quantity in lines:
+            if product_id not in active_ids:
+                continue
+            item = existing.pop(product_id, None) or CartItem(product_id=product_id)
+            item.quantity = quantity
+            items.append(item)
+
+        # Suppression des lignes retirées avant l'ajout des nouvelles
+        for item in existing.values():
+            cart.items.remove(item)
+        db.session.flush()
+        cart.items = items
+        db.session.commit()
+        return cart_response(cart)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de la mise à jour du panier: {str(e)}")
+        return jsonify({"error": "Erreur lors de la mise à jour du panier"}), 500
+
+@cart_bp.route('', methods=['DELETE'])
+def clear_cart():
+    """
+    Vide le panier
+    """
+    try:
+        cart = get_current_cart()
+        if cart:
+            cart.items = []
+        db.session.commit()
+        return cart_response(cart)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors du vidage du panier: {str(e)}")
+        return jsonify({"error": "Erreur lors du vidage du panier"}), 500
+
+# ============================================================================
+#                         GESTION DES LIGNES
+# ============================================================================
+
+@cart_bp.route('/items', methods=['POST'])
+def add_cart_item():
+    """
+    Ajoute un produit au panier (la quantité s'ajoute à l'existante)
+
+    Attend un JSON avec:
+        - product_id: ID du produit
+        - quantity: Quantité à ajouter (1 par défaut)
+    """
+    try:
+        [(product_id, quantity)] = parse_cart_lines([request.get_json() or {}])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        if not _active_product_ids([product_id]):
+            return jsonify({"error": "Produit non trouvé"}), 404
+
+        cart = get_current_cart(create=True)
+        item = next((item for item in cart.items if item.product_id == product_id), None)
+        if item:
+            item.quantity = min(item.quantity + quantity, MAX_LINE_QUANTITY)
+        else:
+            cart.items.append(CartItem(product_id=product_id, quantity=quantity))
+
+        db.session.commit()
+        return cart_response(cart, 201)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de l'ajout au panier: {str(e)}")
+        return jsonify({"error": "Erreur lors de l'ajout au panier"}), 500
+
+@cart_bp.route('/items/<int:product_id>', methods=['PUT'])
+def update_cart_item(product_id):
+    """
+    Fixe la quantité d'un produit du panier (0 le retire)
+
+    Attend un JSON avec:
+        - quantity: Nouvelle quantité
+    """
+    data = request.get_json() or {}
+    try:
+        quantity = int(data.get('quantity'))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Quantité invalide"}), 400
+
+    if quantity < 0 or quantity > MAX_LINE_QUANTITY:
+        return jsonify({"error": "Quantité invalide"}), 400
+
+    try:
+        cart = get_current_cart()
+        item = next((item for item in cart.items if item.product_id == product_id), None) if cart else None
+        if not item:
+            return jsonify({"error": "Article non présent dans le panier"}), 404
+
+        if quantity == 0:
+            cart.items.remove(item)
+        else:
+            item.quantity = quantity
+
+        db.session.commit()
+        return cart_response(cart)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de la mise à jour du panier: {str(e)}")
+        return jsonify({"error": "Erreur lors de la mise à jour du panier"}), 500
+
+@cart_bp.route('/items/<int:product_id>', methods=['DELETE'])
+def remove_cart_item(product_id):
+    """
+    Retire un produit du panier
+    """
+    try:
+        cart = get_current_cart()
+        item = next((item for item in cart.items if item.product_id == product_id), None) if cart else None
+        if not item:
+            return jsonify({"error": "Article non présent dans le panier"}), 404
+
+        cart.items.remove(item)
+        db.session.commit()
+        return cart_response(cart)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de la suppression de l'article: {str(e)}")
+        return jsonify({"error": "Erreur lors de la suppression de l'article"}), 500
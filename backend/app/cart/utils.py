@@ -0,0 +1,220 @@
+# ============================================================================
+#                         UTILITAIRES DU PANIER
+# ============================================================================
+
+"""
+Calcul du panier : prix, stock et totaux relus en base en une seule requête
+"""
+
+import secrets
+from flask import request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from sqlalchemy import select
+from app import db
+from app.products.models import Product, ProductImage
+from app.cart.models import Cart, CartItem
+
+# Configuration
+CART_TOKEN_HEADER = 'X-Cart-Token'
+MAX_LINE_QUANTITY = 999
+
+# Règles de calcul (prix catalogue TTC)
+TVA_RATE = 0.20
+FREE_SHIPPING_THRESHOLD = 49.0
+SHIPPING_COST = 5.90
+
+# Statuts d'une ligne
+LINE_OK = 'ok'
+LINE_NOT_FOUND = 'not_found'
+LINE_UNAVAILABLE = 'unavailable'
+LINE_INSUFFICIENT_STOCK = 'insufficient_stock'
+
+# ============================================================================
+#                         LECTURE DES LIGNES
+# ============================================================================
+
+def parse_cart_lines(items):
+    """
+    Valide une liste d'articles envoyée par le client
+
+    Accepte le format du panier local ({id, quantity, ...}) comme celui de
+    l'API ({product_id, quantity}) ; seuls l'ID et la quantité sont retenus.
+    Les doublons sont regroupés.
+
+    Args:
+        items (list): Articles reçus
+
+    Returns:
+        list: Couples (product_id, quantité)
+
+    Raises:
+        ValueError: Si un article est mal formé
+    """
+    if not isinstance(items, list):
+        raise ValueError('Liste d\'articles invalide')
+
+    quantities = {}
+    for item in items:
+        try:
+            product_id = int(item.get('product_id', item.get('id')))
+            quantity = int(item.get('quantity', 1))
+        except (AttributeError, TypeError, ValueError):
+            raise ValueError('Article invalide')
+
+        if quantity < 1 or quantity > MAX_LINE_QUANTITY:
+            raise ValueError(f'Quantité invalide pour le produit {product_id}')
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+    return list(quantities.items())
+
+# ============================================================================
+#                         CALCUL DU PANIER
+# ============================================================================
+
+def _primary_image():
+    """Sous-requête corrélée : URL de l'image principale du produit."""
+    return (
+        select(ProductImage.url)
+        .where(ProductImage.product_id == Product.id)
+        .order_by(ProductImage.is_primary.desc(), ProductImage.position)
+        .limit(1)
+        .correlate(Product)
+        .scalar_subquery()
+    )
+
+def compute_totals(subtotal_ttc):
+    """
+    Calcule HT, TVA et livraison à partir d'un sous-total TTC
+
+    Args:
+        subtotal_ttc (float): Somme des prix TTC des lignes
+
+    Returns:
+        dict: Totaux arrondis au centime
+    """
+    subtotal_ht = subtotal_ttc / (1 + TVA_RATE)
+    tax = subtotal_ht * TVA_RATE
+    shipping = SHIPPING_COST if 0 < subtotal_ttc < FREE_SHIPPING_THRESHOLD else 0.0
+
+    return {
+        'subtotal_ht': round(subtotal_ht, 2),
+        'tax': round(tax, 2),
+        'subtotal_ttc': round(subtotal_ttc, 2),
+        'shipping': shipping,
+        'total': round(subtotal_ttc + shipping, 2)
+    }
+
+def price_cart(lines):
+    """
+    Reprix et vérifie le stock de toutes les lignes en une requête (IN)
+
+    Args:
+        lines (list): Couples (product_id, quantité)
+
+    Returns:
+        dict: Lignes détaillées, totaux et indicateur de validité
+    """
+    products = {}
+    if lines:
+        rows = db.session.query(
+            Product.id, Product.name, Product.sku, Product.slug, Product.price,
+            Product.stock_quantity, Product.is_active, _primary_image().label('image')
+        ).filter(Product.id.in_([product_id for product_id, _ in lines])).all()
+        products = {row.id: row for row in rows}
+
+    items = []
+    subtotal_ttc = 0.0
+    for product_id, quantity in lines:
+        product = products.get(product_id)
+
+        if product is None:
+            items.append({'product_id': product_id, 'quantity': quantity, 'status': LINE_NOT_FOUND})
+            continue
+
+        stock = product.stock_quantity or 0
+        if not product.is_active:
+            status = LINE_UNAVAILABLE
+        elif stock < quantity:
+            status = LINE_INSUFFICIENT_STOCK
+        else:
+            status = LINE_OK
+
+        line_total = product.price * quantity
+        subtotal_ttc += line_total
+
+        items.append({
+            'product_id': product.id,
+            'name': product.name,
+            'reference': product.sku,
+            'slug': product.slug,
+            'image': product.image,
+            'price': product.price,
+            'quantity': quantity,
+            'line_total': round(line_total, 2),
+            'stock_quantity': stock,
+            'status': status
+        })
+
+    return {
+        'items': items,
+        'item_count': sum(quantity for _, quantity in lines),
+        'valid': bool(items) and all(item['status'] == LINE_OK for item in items),
+        **compute_totals(subtotal_ttc)
+    }
+
+# ============================================================================
+#                         PANIER COURANT
+# ============================================================================
+
+def _merge_into(cart, other):
+    """Ajoute les lignes d'un panier anonyme à celui de l'utilisateur."""
+    existing = {item.product_id: item for item in cart.items}
+    for item in list(other.items):
+        if item.product_id in existing:
+            existing[item.product_id].quantity = min(
+                existing[item.product_id].quantity + item.quantity, MAX_LINE_QUANTITY
+            )
+        else:
+            cart.items.append(CartItem(product_id=item.product_id, quantity=item.quantity))
+    db.session.delete(other)
+
+def get_current_cart(create=False):
+    """
+    Retourne le panier de la requête courante (sans commit)
+
+    Utilisateur connecté : son panier, dans lequel est fusionné le panier
+    anonyme éventuellement transmis. Sinon : le panier du jeton X-Cart-Token.
+
+    Args:
+        create (bool): Créer le panier s'il n'existe pas
+
+    Returns:
+        Cart: Panier, ou None s'il n'existe pas et create est False
+    """
+    verify_jwt_in_request(optional=True)
+    user_id = get_jwt_identity()
+    token = request.headers.get(CART_TOKEN_HEADER)
+
+    anonymous = Cart.query.filter_by(token=token, user_id=None).first() if token else None
+
+    if not user_id:
+        if anonymous is None and create:
+            anonymous = Cart(token=secrets.token_urlsafe(32))
+            db.session.add(anonymous)
+        return anonymous
+
+    cart = Cart.query.filter_by(user_id=int(user_id)).first()
+
+    if anonymous is not None:
+        if cart is None:
+            # Le panier anonyme devient celui de l'utilisateur
+            anonymous.user_id = int(user_id)
+            anonymous.token = None
+            return anonymous
+        _merge_into(cart, anonymous)
+
+    if cart is None and create:
+        cart = Cart(user_id=int(user_id))
+        db.session.add(cart)
+
+    return cart
@@ -0,0 +1,5 @@
+# ============================================================================
+#                         INITIALISATION DU PACKAGE EXPORTS
+# ============================================================================
+
+# Le blueprint est défini dans app.exports.routes (importé par create_app)
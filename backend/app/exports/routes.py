@@ -0,0 +1,157 @@
+# ============================================================================
+#                         ROUTES D'EXPORT (ADMINISTRATION)
+# ============================================================================
+
+"""
+Exports complets pour la comptabilité : /api/admin/export
+
+Les réponses sont produites en flux (CSV séparé par ";" ou NDJSON) : la
+requête est lue par paquets et chaque bloc est envoyé dès qu'il est prêt.
+"""
+
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select, func
+from app.models.user import User
+from app.products.models import Product, Category, Brand
+from app.orders.models import Order, OrderItem
+from app.utils.decorators import admin_required
+from app.exports.utils import FORMATS, stream_rows, generate_csv, generate_ndjson
+
+exports_bp = Blueprint('exports', __name__)
+
+PRODUCT_COLUMNS = (
+    'id', 'sku', 'name', 'slug', 'price', 'stock_quantity', 'min_stock_level',
+    'is_active', 'category', 'brand', 'created_at', 'updated_at'
+)
+
+ORDER_COLUMNS = (
+    'id', 'order_number', 'created_at', 'status', 'payment_method', 'payment_status',
+    'customer_email', 'item_count', 'subtotal_ht', 'tax', 'shipping', 'total'
+)
+
+def export_response(rows, columns, name):
+    """Réponse en flux au format demandé (?format=csv|ndjson)."""
+    fmt = request.args.get('format', 'csv').lower()
+    body = generate_csv(rows, columns) if fmt == 'csv' else generate_ndjson(rows)
+
+    def guarded():
+        # Les en-têtes sont déjà envoyés : une erreur ne peut plus être une 500
+        try:
+            yield from body
+        except Exception as e:
+            current_app.logger.error(f"Export {name} interrompu: {str(e)}")
+            raise
+
+    response = current_app.response_class(stream_with_context(guarded()), content_type=FORMATS[fmt])
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+def _check_format():
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in FORMATS:
+        return jsonify({"error": "Format non supporté (csv ou ndjson)"}), 400
+    return None
+
+def _parse_date(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d')
+
+# ============================================================================
+#                         PRODUITS
+# ============================================================================
+
+@exports_bp.route('/products', methods=['GET'])
+@jwt_required()
+@admin_required
+def export_products():
+    """
+    Exporte le catalogue
+
+    Paramètres:
+        - format: csv (défaut) ou ndjson
+        - active: true / false pour filtrer les produits actifs / inactifs
+        - category_id: ID de catégorie
+    """
+    error = _check_format()
+    if error:
+        return error
+
+    statement = (
+        select(
+            Product.id, Product.sku, Product.name, Product.slug, Product.price,
+            Product.stock_quantity, Product.min_stock_level, Product.is_active,
+            Category.name.label('category'), Brand.name.label('brand'),
+            Product.created_at, Product.updated_at
+        )
+        .outerjoin(Category, Category.id == Product.category_id)
+        .outerjoin(Brand, Brand.id == Product.brand_id)
+        .order_by(Product.id)
+    )
+
+    active = request.args.get('active')
+    if active is not None:
+        statement = statement.where(Product.is_active == (active.lower() in ('1', 'true')))
+
+    category_id = request.args.get('category_id', type=int)
+    if category_id:
+        statement = statement.where(Product.category_id == category_id)
+
+    return export_response(stream_rows(statement), PRODUCT_COLUMNS, 'produits')
+
+# ============================================================================
+#                         COMMANDES
+# ============================================================================
+
+@exports_bp.route('/orders', methods=['GET'])
+@jwt_required()
+@admin_required
+def export_orders():
+    """
+    Exporte les commandes (une ligne par commande)
+
+    Paramètres:
+        - format: csv (défaut) ou ndjson
+        - date_from / date_to: période AAAA-MM-JJ (bornes incluses)
+        - status: un ou plusieurs statuts séparés par des virgules
+    """
+    error = _check_format()
+    if error:
+        return error
+
+    try:
+        date_from = _parse_date('date_from')
+        date_to = _parse_date('date_to')
+    except ValueError:
+        return jsonify({"error": "Date invalide (format AAAA-MM-JJ)"}), 400
+
+    item_count = (
+        select(func.coalesce(func.sum(OrderItem.quantity), 0))
+        .where(OrderItem.order_id == Order.id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(
+            Order.id, Order.order_number, Order.created_at, Order.status,
+            Order.payment_method, Order.payment_status,
+            User.email.label('customer_email'), item_count.label('item_count'),
+            Order.subtotal_ht, Order.tax, Order.shipping, Order.total
+        )
+        .join(User, User.id == Order.user_id)
+        .order_by(Order.created_at, Order.id)
+    )
+
+    if date_from:
+        statement = statement.where(Order.created_at >= date_from)
+    if date_to:
+        statement = statement.where(Order.created_at < date_to + timedelta(days=1))
+
+    statuses = [status.strip().upper() for status in request.args.get('status', '').split(',') if status.strip()]
+    if statuses:
+        statement = statement.where(Order.status.in_(statuses))
+
+    return export_response(stream_rows(statement), ORDER_COLUMNS, 'commandes')
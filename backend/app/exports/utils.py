@@ -0,0 +1,71 @@
+# ============================================================================
+#                         SÉRIALISATION DES EXPORTS
+# ============================================================================
+
+"""
+Écriture en flux des exports CSV / NDJSON.
+
+Les lignes sont lues par paquets (yield_per : curseur côté serveur sous
+PostgreSQL) et écrites par blocs : la mémoire utilisée ne dépend pas de la
+taille de la table.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from app import db
+
+# Lignes lues par aller-retour avec la base
+FETCH_SIZE = 1000
+
+# Lignes regroupées dans un même bloc de réponse
+CHUNK_ROWS = 500
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson'
+}
+
+def _plain(value):
+    """Convertit une valeur de colonne en type JSON / CSV simple."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def stream_rows(statement):
+    """Exécute une requête et produit ses lignes sous forme de dictionnaires."""
+    result = db.session.execute(statement.execution_options(yield_per=FETCH_SIZE))
+    for row in result.mappings():
+        yield {key: _plain(value) for key, value in row.items()}
+
+def generate_csv(rows, columns):
+    """Produit un CSV (en-tête puis blocs de CHUNK_ROWS lignes)."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, delimiter=';', extrasaction='ignore')
+
+    # BOM pour que les tableurs détectent l'UTF-8
+    buffer.write('\ufeff')
+    writer.writeheader()
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def generate_ndjson(rows):
+    """Produit un objet JSON par ligne, par blocs de CHUNK_ROWS lignes."""
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(row, ensure_ascii=False))
+        if len(chunk) == CHUNK_ROWS:
+            yield '\n'.join(chunk) + '\n'
+            chunk = []
+    if chunk:
+        yield '\n'.join(chunk) + '\n'
@@ -0,0 +1,64 @@
+# ============================================================================
+#                         MODÈLE FILE D'ENVOI DES EMAILS
+# ============================================================================
+
+"""
+File d'attente persistante des emails transactionnels
+Les emails sont enregistrés dans la même transaction que l'action qui les
+déclenche, puis envoyés en arrière-plan par app.utils.outbox
+"""
+
+from datetime import datetime
+from app import db
+
+# ============================================================================
+#                         STATUTS
+# ============================================================================
+
+STATUS_PENDING = 'PENDING'
+# Réservé par un worker jusqu'à next_attempt_at (bail), le temps de l'envoi
+STATUS_SENDING = 'SENDING'
+STATUS_SENT = 'SENT'
+STATUS_FAILED = 'FAILED'
+
+# ============================================================================
+#                         MODÈLE PRINCIPAL
+# ============================================================================
+
+class EmailOutbox(db.Model):
+    """
+    Email en attente d'envoi
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        # Sélection des emails à envoyer : statut puis échéance
+        db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    
+    # Contenu
+    recipients = db.Column(db.Text, nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    html_body = db.Column(db.Text)
+    text_body = db.Column(db.Text)
+    
+    # Suivi de l'envoi
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Lot du worker qui a réservé l'email (STATUS_SENDING)
+    claim_token = db.Column(db.String(32), index=True)
+    last_error = db.Column(db.Text)
+    
+    # Métadonnées
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def recipient_list(self):
+        """Liste des destinataires (stockés séparés par des virgules)"""
+        return [address for address in self.recipients.split(',') if address]
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} {self.status}>'
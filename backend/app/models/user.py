@@ -19,6 +19,18 @@ import secrets
 PASSWORD_MIN_LENGTH = 8
 TOKEN_EXPIRY_HOURS = 24
 
+# ============================================================================
+#                         TABLE D'ASSOCIATION
+# ============================================================================
+
+# Produits favoris des utilisateurs
+user_favorites = db.Table(
+    'user_favorites',
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
+    db.Column('product_id', db.Integer, db.ForeignKey('products.id'), primary_key=True),
+    db.Column('created_at', db.DateTime, default=datetime.utcnow)
+)
+
 # ============================================================================
 #                         MODÈLE PRINCIPAL
 # ============================================================================
@@ -28,6 +40,10 @@ class User(db.Model):
     Modèle utilisateur avec gestion de l'authentification
     """
     __tablename__ = 'users'
+    __table_args__ = (
+        # Liste d'administration triée par date d'inscription (curseur created_at, id)
+        db.Index('ix_users_created_id', 'created_at', 'id'),
+    )
 
     # Champs d'identification
     id = db.Column(db.Integer, primary_key=True)
@@ -54,6 +70,7 @@ class User(db.Model):
     # Relations
     orders = db.relationship('Order', back_populates='user', lazy='dynamic')
     addresses = db.relationship('Address', back_populates='user', lazy='dynamic')
+    favorites = db.relationship('Product', secondary=user_favorites, lazy='dynamic')
     
     def __init__(self, email, firstname, lastname, password=None):
         """
@@ -13,7 +13,7 @@ class Address(db.Model):
     __tablename__ = 'addresses'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     
     firstname = db.Column(db.String(50), nullable=False)
     lastname = db.Column(db.String(50), nullable=False)
@@ -52,6 +52,10 @@ class Address(db.Model):
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Historique des commandes d'un utilisateur, du plus récent au plus ancien
+        db.Index('ix_orders_user_created', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_number = db.Column(db.String(20), unique=True, nullable=False)
@@ -66,12 +70,13 @@ class Order(db.Model):
     shipping = db.Column(db.Numeric(10, 2), nullable=False, default=0)
     total = db.Column(db.Numeric(10, 2), nullable=False, default=0)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = db.relationship('app.models.user.User', back_populates='orders')
     items = db.relationship('OrderItem', back_populates='order', cascade='all, delete-orphan')
     shipping_address = db.relationship('OrderAddress', uselist=False, back_populates='order', cascade='all, delete-orphan')
+    stock_reservations = db.relationship('StockReservation', back_populates='order', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Order {self.order_number}>'
@@ -80,8 +85,8 @@ class OrderItem(db.Model):
     __tablename__ = 'order_items'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
-    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
     
     name = db.Column(db.String(255), nullable=False)
     reference = db.Column(db.String(50), nullable=False)
@@ -94,11 +99,48 @@ class OrderItem(db.Model):
     def __repr__(self):
         return f'<OrderItem {self.name}>'
 
+class OrderSequence(db.Model):
+    """
+    Compteur mensuel des numéros de commande
+    
+    Une ligne par mois (période 'AAAA-MM'), incrémentée atomiquement
+    par UPDATE ... RETURNING lors de chaque commande.
+    """
+    __tablename__ = 'order_sequences'
+    
+    period = db.Column(db.String(7), primary_key=True)
+    last_value = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<OrderSequence {self.period}={self.last_value}>'
+
+class StockReservation(db.Model):
+    """
+    Stock retiré d'un produit pour une commande en attente de paiement
+    
+    Le stock est décrémenté à la commande ; la réservation permet de le
+    restituer si la commande est annulée ou n'est pas payée à temps.
+    Elle est supprimée lorsque la vente devient définitive.
+    """
+    __tablename__ = 'stock_reservations'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    order = db.relationship('Order', back_populates='stock_reservations')
+    
+    def __repr__(self):
+        return f'<StockReservation {self.product_id} x{self.quantity}>'
+
 class OrderAddress(db.Model):
     __tablename__ = 'order_addresses'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     
     firstname = db.Column(db.String(50), nullable=False)
     lastname = db.Column(db.String(50), nullable=False)
@@ -0,0 +1,195 @@
+# backend/app/products/bulk.py
+
+"""
+Opérations groupées sur les produits (interface d'administration).
+
+Chaque opération s'exécute en requêtes ensemblistes (UPDATE / DELETE
+... WHERE id IN (...)) dans la transaction courante, sans charger les
+produits dans l'ORM. Les événements du mapper n'étant pas déclenchés,
+l'index plein texte, les suggestions et les caches sont tenus à jour
+explicitement. Les fonctions ne valident pas la transaction : l'appelant
+commit, puis lance la suppression des fichiers images.
+"""
+
+import os
+import threading
+from flask import current_app
+from sqlalchemy import update, delete, func
+from app import db
+from app.products.models import Product, ProductImage, ProductSpecification
+from app.products.search import unindex_products
+from app.products.suggest import queue_suggestion_update
+from app.products.featured import mark_featured_changed
+from app.products.utils import unreferenced_image_paths
+from app.orders.models import OrderItem
+from app.cart.models import CartItem
+from app.utils.http_cache import mark_catalog_changed
+from app.utils.response_cache import invalidate_on_commit
+
+# Nombre maximal de produits par opération
+MAX_BULK_IDS = 1000
+
+# ============================================================================
+#                         UTILITAIRES
+# ============================================================================
+
+def parse_bulk_ids(value):
+    """
+    Valide la liste d'IDs envoyée par l'interface (productIds)
+
+    Args:
+        value (list): IDs (entiers ou chaînes numériques)
+
+    Returns:
+        list: IDs uniques, dans l'ordre reçu
+
+    Raises:
+        ValueError: Liste absente, vide, trop longue ou ID invalide
+    """
+    if not isinstance(value, list) or not value:
+        raise ValueError("Liste de produits (productIds) manquante")
+    if len(value) > MAX_BULK_IDS:
+        raise ValueError(f"{MAX_BULK_IDS} produits au maximum par opération")
+
+    ids = []
+    for item in value:
+        try:
+            product_id = int(item)
+        except (TypeError, ValueError):
+            raise ValueError(f"ID de produit invalide: {item}")
+        if product_id not in ids:
+            ids.append(product_id)
+    return ids
+
+def _existing_ids(product_ids):
+    rows = db.session.query(Product.id).filter(Product.id.in_(product_ids))
+    return {row.id for row in rows}
+
+def _results(product_ids, statuses, default='not_found'):
+    """Résultat par ID, dans l'ordre de la demande."""
+    return [{'id': product_id, 'status': statuses.get(product_id, default)} for product_id in product_ids]
+
+def _catalog_changed(product_ids):
+    """Invalide ETag, cache de réponses et mises en avant au commit."""
+    mark_catalog_changed()
+    mark_featured_changed()
+    invalidate_on_commit('products', *(f'product:{product_id}' for product_id in product_ids))
+
+def _refresh_suggestions(product_ids):
+    """Met à jour l'index de suggestions des produits modifiés au commit."""
+    rows = db.session.query(
+        Product.id, Product.name, Product.sku, Product.slug, Product.brand_id, Product.is_active
+    ).filter(Product.id.in_(product_ids))
+    for row in rows:
+        queue_suggestion_update('product', row._asdict())
+
+# ============================================================================
+#                         OPÉRATIONS
+# ============================================================================
+
+def bulk_set_active(product_ids, is_active):
+    """
+    Active ou désactive des produits (un seul UPDATE)
+
+    Returns:
+        list: [{id, status}] avec status 'updated' ou 'not_found'
+    """
+    found = _existing_ids(product_ids)
+    if found:
+        db.session.execute(
+            update(Product).where(Product.id.in_(found))
+            .values(is_active=is_active, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        _refresh_suggestions(found)
+        _catalog_changed(found)
+
+    return _results(product_ids, dict.fromkeys(found, 'updated'))
+
+def bulk_update_price(product_ids, price=None, percent=None):
+    """
+    Fixe le prix (price) ou l'ajuste en pourcentage (percent) (un seul UPDATE)
+
+    Returns:
+        list: [{id, status}] avec status 'updated' ou 'not_found'
+    """
+    if percent is not None:
+        new_price = func.round(Product.price * (1 + percent / 100.0), 2)
+    else:
+        new_price = price
+
+    found = _existing_ids(product_ids)
+    if found:
+        db.session.execute(
+            update(Product).where(Product.id.in_(found))
+            .values(price=new_price, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        _catalog_changed(found)
+
+    return _results(product_ids, dict.fromkeys(found, 'updated'))
+
+def bulk_delete(product_ids):
+    """
+    Supprime des produits avec leurs images, spécifications et lignes de panier
+
+    Les produits présents dans des commandes sont conservés (l'historique
+    des commandes y fait référence) et signalés 'has_orders'.
+
+    Returns:
+        tuple: ([{id, status}], chemins des fichiers images à supprimer)
+    """
+    found = _existing_ids(product_ids)
+    ordered = {row.product_id for row in db.session.query(OrderItem.product_id)
+               .filter(OrderItem.product_id.in_(found)).distinct()}
+    deletable = found - ordered
+
+    files = []
+    if deletable:
+        images = db.session.query(ProductImage.url, ProductImage.variants).filter(
+            ProductImage.product_id.in_(deletable)
+        ).all()
+
+        for model in (ProductSpecification, ProductImage, CartItem):
+            db.session.execute(
+                delete(model).where(model.product_id.in_(deletable))
+                .execution_options(synchronize_session=False)
+            )
+
+        # Fichiers partagés avec d'autres produits conservés
+        files = unreferenced_image_paths((row.url, row.variants) for row in images)
+        db.session.execute(
+            delete(Product).where(Product.id.in_(deletable))
+            .execution_options(synchronize_session=False)
+        )
+
+        unindex_products(db.session.connection(), deletable)
+        for product_id in deletable:
+            queue_suggestion_update('product_deleted', product_id)
+        _catalog_changed(deletable)
+
+    statuses = {**dict.fromkeys(ordered, 'has_orders'), **dict.fromkeys(deletable, 'deleted')}
+    return _results(product_ids, statuses), files
+
+# ============================================================================
+#                         FICHIERS
+# ============================================================================
+
+def delete_files_in_background(paths):
+    """Supprime des fichiers dans un thread séparé (après le commit)."""
+    if not paths:
+        return None
+
+    logger = current_app.logger
+
+    def run():
+        for path in paths:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                logger.warning(f"Impossible de supprimer le fichier {path}: {str(e)}")
+
+    thread = threading.Thread(target=run, name='bulk-file-delete', daemon=True)
+    thread.start()
+    return thread
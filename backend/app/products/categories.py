@@ -0,0 +1,185 @@
+# backend/app/products/categories.py
+
+"""
+Arborescence des catégories.
+
+Chaque catégorie porte le chemin matérialisé de ses ancêtres ("/1/4/9/"),
+tenu à jour par les événements du mapper : les descendants d'une catégorie
+sont toutes les lignes dont le chemin commence par le sien, sans requête
+récursive.
+
+L'arbre est gardé en mémoire (chemins triés + document JSON imbriqué prêt à
+servir) jusqu'à la prochaine modification d'une catégorie : il est vidé au
+commit dans le processus qui l'a faite, et reconstruit dans les autres dès
+que la version du catalogue (app.utils.http_cache) a changé.
+"""
+
+import json
+import threading
+from bisect import bisect_left
+from sqlalchemy import event, inspect, literal, func, select, update
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db
+from app.products.models import Category
+from app.utils.http_cache import current_catalog_version
+
+# Clé de session signalant une modification de catégorie pendant la transaction
+DIRTY_KEY = 'category_tree_dirty'
+
+# Champs exposés pour chaque nœud de l'arbre
+NODE_FIELDS = ('id', 'name', 'slug', 'description', 'image_url', 'parent_id', 'path')
+
+# ============================================================================
+#                         CHEMINS MATÉRIALISÉS
+# ============================================================================
+
+def build_path(parent_path, category_id):
+    """Construit le chemin d'une catégorie à partir de celui de son parent."""
+    return f"{parent_path or '/'}{category_id}/"
+
+def _parent_path(connection, parent_id):
+    if parent_id is None:
+        return None
+    return connection.execute(
+        select(Category.path).where(Category.id == parent_id)
+    ).scalar()
+
+@event.listens_for(Category, 'after_insert')
+def _set_path(mapper, connection, category):
+    path = build_path(_parent_path(connection, category.parent_id), category.id)
+    connection.execute(
+        update(Category.__table__).where(Category.__table__.c.id == category.id).values(path=path)
+    )
+    set_committed_value(category, 'path', path)
+
+@event.listens_for(Category, 'after_update')
+def _move_subtree(mapper, connection, category):
+    history = inspect(category).attrs.parent_id.history
+    if not history.has_changes() or not category.path:
+        return
+
+    old_path = category.path
+    new_path = build_path(_parent_path(connection, category.parent_id), category.id)
+
+    if new_path.startswith(old_path):
+        raise ValueError("Une catégorie ne peut pas être déplacée sous l'une de ses sous-catégories")
+
+    # Toute la sous-arborescence est réécrite en une seule requête
+    table = Category.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.path.like(f'{old_path}%'))
+        .values(path=literal(new_path) + func.substr(table.c.path, len(old_path) + 1))
+    )
+    set_committed_value(category, 'path', new_path)
+
+# ============================================================================
+#                         CACHE DE L'ARBRE
+# ============================================================================
+
+class CategoryTree:
+    """Arbre des catégories gardé en mémoire, reconstruit à la demande."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths = None       # [(chemin, id)] trié
+        self._by_id = None       # id -> chemin
+        self._document = None    # arbre imbriqué sérialisé en JSON
+        self._version = None     # version du catalogue de l'arbre chargé
+
+    def invalidate(self):
+        """Oublie l'arbre ; il sera relu au prochain accès."""
+        with self._lock:
+            self._forget()
+
+    def _forget(self):
+        self._paths = None
+        self._by_id = None
+        self._document = None
+        self._version = None
+
+    def _check_version(self):
+        """Oublie l'arbre si le catalogue a changé depuis son chargement. Appelé sous verrou."""
+        version = current_catalog_version()[0]
+        if version != self._version:
+            self._forget()
+            self._version = version
+
+    def _load(self):
+        """Charge les chemins (une requête) si nécessaire. Appelé sous verrou."""
+        if self._paths is None:
+            rows = db.session.query(Category.id, Category.path).all()
+            self._by_id = {row.id: row.path for row in rows if row.path}
+            self._paths = sorted((path, category_id) for category_id, path in self._by_id.items())
+
+    def descendant_ids(self, category_ids):
+        """Retourne les catégories demandées et toutes leurs sous-catégories.
+
+        Chaque sous-arbre est une plage contiguë de chemins triés, trouvée
+        par dichotomie.
+
+        Args:
+            category_ids (iterable): IDs des catégories de départ
+
+        Returns:
+            set: IDs des catégories et de leurs descendants
+        """
+        with self._lock:
+            self._check_version()
+            self._load()
+
+            found = set()
+            for category_id in category_ids:
+                prefix = self._by_id.get(category_id)
+                if prefix is None:
+                    found.add(category_id)
+                    continue
+
+                position = bisect_left(self._paths, (prefix,))
+                while position < len(self._paths) and self._paths[position][0].startswith(prefix):
+                    found.add(self._paths[position][1])
+                    position += 1
+            return found
+
+    def document(self):
+        """Retourne l'arbre complet (JSON imbriqué, enfants triés par nom)."""
+        with self._lock:
+            self._check_version()
+            if self._document is None:
+                self._document = json.dumps(self._build_nested(), ensure_ascii=False)
+            return self._document
+
+    def _build_nested(self):
+        rows = db.session.query(*[getattr(Category, field) for field in NODE_FIELDS]).all()
+
+        nodes = {row.id: {**row._asdict(), 'depth': (row.path or '/').count('/') - 2, 'children': []} for row in rows}
+        roots = []
+        for node in sorted(nodes.values(), key=lambda node: node['name'].lower()):
+            parent = nodes.get(node['parent_id'])
+            (parent['children'] if parent else roots).append(node)
+        return roots
+
+category_tree = CategoryTree()
+
+# ============================================================================
+#                         INVALIDATION
+# ============================================================================
+
+@event.listens_for(Category, 'after_insert')
+@event.listens_for(Category, 'after_update')
+@event.listens_for(Category, 'after_delete')
+def _category_changed(mapper, connection, category):
+    session = object_session(category)
+    if session is not None:
+        session.info[DIRTY_KEY] = True
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    if session.info.pop(DIRTY_KEY, False):
+        category_tree.invalidate()
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_on_rollback(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(DIRTY_KEY, None)
@@ -0,0 +1,175 @@
+# backend/app/products/featured.py
+
+"""
+Produits et catégories mis en avant sur l'accueil.
+
+Les listes combinent les éléments épinglés par un administrateur
+(featured_position, par rang croissant) et les meilleures ventes de la
+période FEATURED_SALES_WINDOW, complétées si besoin par les nouveautés.
+Elles sont calculées une fois, sérialisées en JSON et gardées en mémoire :
+l'agrégation sur order_items n'est refaite qu'après une modification du
+catalogue ou toutes les FEATURED_REFRESH_INTERVAL secondes, jamais à
+chaque visite. Une modification faite par un autre processus est détectée
+par la version du catalogue (app.utils.http_cache).
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.products.models import Product, Category, Brand, ProductImage
+from app.products.schemas import ProductSchema
+from app.products.utils import product_loading_options
+from app.orders.models import Order, OrderItem
+from app.utils.http_cache import current_catalog_version
+
+# Clé de session signalant une modification du catalogue pendant la transaction
+DIRTY_KEY = 'featured_lists_dirty'
+
+featured_products_schema = ProductSchema(many=True, exclude=('category',))
+
+# ============================================================================
+#                         CALCUL DES LISTES
+# ============================================================================
+
+def _best_sellers(column, limit):
+    """IDs groupés par `column`, triés par quantité vendue sur la période."""
+    since = datetime.utcnow() - current_app.config['FEATURED_SALES_WINDOW']
+    sold = func.sum(OrderItem.quantity)
+    rows = (
+        db.session.query(column, sold)
+        .select_from(OrderItem)
+        .join(Order, Order.id == OrderItem.order_id)
+        .join(Product, Product.id == OrderItem.product_id)
+        .filter(Order.status != 'CANCELLED', Order.created_at >= since, column.isnot(None))
+        .group_by(column)
+        .order_by(sold.desc())
+        .limit(limit)
+    )
+    return [row[0] for row in rows]
+
+def _merge(*id_lists, limit):
+    """Concatène des listes d'IDs sans doublon, dans l'ordre."""
+    merged = []
+    for ids in id_lists:
+        for item_id in ids:
+            if item_id not in merged:
+                merged.append(item_id)
+    return merged[:limit]
+
+def compute_featured_products():
+    """Liste des produits mis en avant (dictionnaires sérialisés)."""
+    limit = current_app.config['FEATURED_PRODUCTS_LIMIT']
+    active = db.session.query(Product.id).filter(Product.is_active == True)
+
+    pinned = [row.id for row in active.filter(Product.featured_position.isnot(None))
+              .order_by(Product.featured_position, Product.id).limit(limit)]
+    best = _best_sellers(Product.id, limit * 2)
+    newest = [row.id for row in active.order_by(Product.created_at.desc(), Product.id.desc()).limit(limit)]
+
+    products = {
+        product.id: product for product in Product.query
+        .options(*product_loading_options(('brand',)))
+        .filter(Product.id.in_(set(pinned + best + newest)), Product.is_active == True)
+    }
+    ids = _merge(pinned, [i for i in best if i in products], newest, limit=limit)
+
+    data = featured_products_schema.dump([products[i] for i in ids])
+    for product in data:
+        # L'accueil affiche la première image : l'image principale d'abord
+        product['images'].sort(key=lambda image: (not image.get('is_primary'), image.get('position') or 0))
+    return data
+
+def compute_featured_categories():
+    """Liste des catégories mises en avant (dictionnaires sérialisés)."""
+    limit = current_app.config['FEATURED_CATEGORIES_LIMIT']
+
+    pinned = [row.id for row in db.session.query(Category.id)
+              .filter(Category.featured_position.isnot(None))
+              .order_by(Category.featured_position, Category.id).limit(limit)]
+    best = _best_sellers(Product.category_id, limit)
+    roots = [row.id for row in db.session.query(Category.id)
+             .filter(Category.parent_id.is_(None)).order_by(Category.name).limit(limit)]
+
+    ids = _merge(pinned, best, roots, limit=limit)
+    categories = {category.id: category for category in Category.query.filter(Category.id.in_(ids))}
+    return [categories[i].to_dict() for i in ids if i in categories]
+
+# ============================================================================
+#                         LISTES EN MÉMOIRE
+# ============================================================================
+
+class FeaturedLists:
+    """Listes de l'accueil sérialisées, recalculées à la demande."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._products = None      # JSON des produits
+        self._categories = None    # JSON des catégories
+        self._built_at = None
+        self._version = None       # version du catalogue des listes
+
+    def invalidate(self):
+        """Oublie les listes ; elles seront recalculées au prochain accès."""
+        with self._lock:
+            self._products = None
+            self._categories = None
+            self._built_at = None
+
+    def _load(self):
+        """Recalcule les listes si absentes ou périmées. Appelé sous verrou."""
+        interval = current_app.config['FEATURED_REFRESH_INTERVAL']
+        version = current_catalog_version()[0]
+        if (self._built_at is not None and version == self._version
+                and time.monotonic() - self._built_at < interval):
+            return
+
+        self._products = json.dumps(compute_featured_products(), ensure_ascii=False)
+        self._categories = json.dumps(compute_featured_categories(), ensure_ascii=False)
+        self._built_at = time.monotonic()
+        self._version = version
+
+    def products_document(self):
+        """Retourne le JSON des produits mis en avant."""
+        with self._lock:
+            self._load()
+            return self._products
+
+    def categories_document(self):
+        """Retourne le JSON des catégories mises en avant."""
+        with self._lock:
+            self._load()
+            return self._categories
+
+featured_lists = FeaturedLists()
+
+# ============================================================================
+#                         INVALIDATION
+# ============================================================================
+
+def mark_featured_changed(session=None):
+    """Signale une modification du catalogue faite hors ORM (UPDATE en masse)."""
+    (session or db.session).info[DIRTY_KEY] = True
+
+def _catalog_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info[DIRTY_KEY] = True
+
+for model in (Product, Category, Brand, ProductImage):
+    for event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(model, event_name, _catalog_changed)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    if session.info.pop(DIRTY_KEY, False):
+        featured_lists.invalidate()
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_on_rollback(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(DIRTY_KEY, None)
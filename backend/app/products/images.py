@@ -0,0 +1,273 @@
+# backend/app/products/images.py
+
+"""
+Déclinaisons des images produits.
+
+L'upload enregistre l'original et une ligne ProductImage au statut
+'pending', puis confie le travail à un pool de processus : chaque taille
+de IMAGE_SIZES est produite en JPEG, WebP et AVIF (si Pillow sait
+l'encoder). Le résultat (URLs, dimensions, srcset par type MIME) est
+ensuite enregistré sur l'image, qui passe au statut 'ready' (ou 'failed').
+
+Le rendu (render_variants) s'exécute hors de Flask et ne reçoit que des
+chemins et des paramètres simples.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from PIL import Image, ImageOps
+from app import db
+from app.products.models import ProductImage
+from app.products.utils import (
+    IMAGE_SIZES, PRODUCT_IMAGES_URL, CONTENT_FOLDER,
+    product_images_folder, static_file_path, delete_product_image
+)
+
+# Dossier des déclinaisons des images antérieures au stockage par contenu
+VARIANTS_FOLDER = 'variants'
+
+# format -> (extension, type MIME, encodeur Pillow, options d'encodage)
+FORMATS = {
+    'jpeg': ('jpg', 'image/jpeg', 'JPEG', {'optimize': True, 'progressive': True}),
+    'webp': ('webp', 'image/webp', 'WEBP', {'method': 6}),
+    'avif': ('avif', 'image/avif', 'AVIF', {})
+}
+
+# ============================================================================
+#                         FICHIERS
+# ============================================================================
+
+def output_location(url):
+    """Dossier disque et URL de base des déclinaisons d'une image.
+
+    Les images stockées par contenu (sha256/...) reçoivent leurs
+    déclinaisons à côté de l'original, sous le même nom : elles sont
+    partagées par toutes les lignes qui utilisent ce contenu. Les anciennes
+    images vont dans le dossier variants.
+    """
+    if f"/{CONTENT_FOLDER}/" in url:
+        return os.path.dirname(static_file_path(url)), url.rsplit('/', 1)[0]
+    return (
+        os.path.join(product_images_folder(), VARIANTS_FOLDER),
+        f"{PRODUCT_IMAGES_URL}/{VARIANTS_FOLDER}"
+    )
+
+def supported_formats():
+    """Formats de IMAGE_FORMATS que Pillow sait encoder ici."""
+    Image.init()
+    return [fmt for fmt in current_app.config['IMAGE_FORMATS'] if FORMATS[fmt][2] in Image.SAVE]
+
+# ============================================================================
+#                         RENDU (PROCESSUS DU POOL)
+# ============================================================================
+
+def _flatten(image):
+    """Supprime la transparence (fond blanc) pour le JPEG."""
+    if image.mode == 'RGB':
+        return image
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+def render_variants(source_path, output_dir, stem, sizes, formats, quality):
+    """
+    Produit les déclinaisons d'une image
+
+    Args:
+        source_path (str): Image originale
+        output_dir (str): Dossier de destination
+        stem (str): Préfixe des fichiers produits
+        sizes (dict): {nom: (largeur, hauteur)} maximales
+        formats (list): Formats à produire ('jpeg', 'webp', 'avif')
+        quality (int): Qualité d'encodage
+
+    Returns:
+        dict: {width, height, variants: {taille: {format: {file, width, height}}}}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    produced = []
+    try:
+        with Image.open(source_path) as original:
+            image = ImageOps.exif_transpose(original)
+            width, height = image.size
+            has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+            variants = {}
+            for size_name, box in sizes.items():
+                resized = image.copy()
+                resized.thumbnail(box, Image.LANCZOS)
+
+                variants[size_name] = {}
+                for fmt in formats:
+                    extension, _, encoder, options = FORMATS[fmt]
+                    filename = f"{stem}_{size_name}.{extension}"
+                    path = os.path.join(output_dir, filename)
+
+                    output = _flatten(resized) if fmt == 'jpeg' else resized
+                    output.save(path, encoder, quality=quality, **options)
+                    produced.append(path)
+
+                    variants[size_name][fmt] = {'file': filename, 'width': resized.width, 'height': resized.height}
+
+        return {'width': width, 'height': height, 'variants': variants}
+
+    except Exception:
+        for path in produced:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+
+def build_srcset(variants):
+    """srcset par type MIME ("url 150w, url 400w, ...")."""
+    srcset = {}
+    for fmt, (_, mime_type, _, _) in FORMATS.items():
+        candidates = {}
+        for formats in variants.values():
+            if fmt in formats:
+                candidates.setdefault(formats[fmt]['width'], formats[fmt]['url'])
+        if candidates:
+            srcset[mime_type] = ', '.join(f"{url} {width}w" for width, url in sorted(candidates.items()))
+    return srcset
+
+def copy_existing_variants(image):
+    """
+    Reprend les déclinaisons d'une image au contenu identique déjà traitée
+
+    Returns:
+        bool: True si l'image n'a plus besoin d'être traitée
+    """
+    twins = ProductImage.query.filter(
+        ProductImage.url == image.url, ProductImage.status == 'ready', ProductImage.id != image.id
+    ).limit(10)
+    twin = next((twin for twin in twins if twin.variants), None)
+    if twin is None:
+        return False
+
+    image.width, image.height = twin.width, twin.height
+    image.variants, image.srcset = twin.variants, twin.srcset
+    image.status = 'ready'
+    return True
+
+# ============================================================================
+#                         FILE DE TRAITEMENT
+# ============================================================================
+
+class ImagePipeline:
+    """Pool de processus produisant les déclinaisons après l'upload."""
+
+    def __init__(self):
+        self.app = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+
+    def _pool(self, reset=False):
+        with self._lock:
+            if reset and self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.app.config['IMAGE_PIPELINE_WORKERS'])
+            return self._executor
+
+    def _job(self, image):
+        output_dir, _ = output_location(image.url)
+        stem = os.path.splitext(os.path.basename(image.url))[0]
+        return (
+            static_file_path(image.url), output_dir, stem, IMAGE_SIZES,
+            supported_formats(), current_app.config['IMAGE_QUALITY']
+        )
+
+    def enqueue(self, image):
+        """
+        Programme le traitement d'une image enregistrée (après le commit)
+
+        Avec IMAGE_PIPELINE_WORKERS = 0, le traitement est fait sur place.
+        """
+        if not self.app.config['IMAGE_PIPELINE_WORKERS']:
+            self.process(image)
+            return None
+
+        job = self._job(image)
+        image_id = image.id
+        try:
+            future = self._pool().submit(render_variants, *job)
+        except BrokenProcessPool:
+            future = self._pool(reset=True).submit(render_variants, *job)
+
+        url = image.url
+        future.add_done_callback(lambda done: self._store(image_id, url, done.exception() or done.result()))
+        return future
+
+    def process(self, image):
+        """Traite une image sur place, sans passer par le pool."""
+        job = self._job(image)
+        try:
+            result = render_variants(*job)
+        except Exception as e:
+            result = e
+        self._store(image.id, image.url, result)
+
+    def _store(self, image_id, url, result):
+        """Enregistre le résultat d'un traitement (thread du pool)."""
+        with self.app.app_context():
+            image = db.session.get(ProductImage, image_id)
+            if isinstance(result, Exception):
+                current_app.logger.error(f"Déclinaisons de l'image {image_id} impossibles: {str(result)}")
+                if image is not None:
+                    image.status = 'failed'
+                    db.session.commit()
+                return
+
+            _, base_url = output_location(url)
+            variants = {
+                size_name: {
+                    fmt: {'url': f"{base_url}/{variant['file']}", 'width': variant['width'], 'height': variant['height']}
+                    for fmt, variant in formats.items()
+                }
+                for size_name, formats in result['variants'].items()
+            }
+
+            if image is None:
+                # Image supprimée pendant le traitement
+                delete_product_image(url, variants)
+                return
+
+            image.width = result['width']
+            image.height = result['height']
+            image.variants = variants
+            image.srcset = build_srcset(variants)
+            image.status = 'ready'
+            db.session.commit()
+
+image_pipeline = ImagePipeline()
+
+# ============================================================================
+#                         COMMANDES CLI
+# ============================================================================
+
+images_cli = AppGroup('images', help='Déclinaisons des images produits.')
+
+@images_cli.command('process')
+@click.option('--all', 'process_all', is_flag=True, help='Retraiter toutes les images.')
+def process_command(process_all):
+    """Produit les déclinaisons des images en attente ou en échec (sur place)."""
+    query = db.session.query(ProductImage.id)
+    if not process_all:
+        query = query.filter(ProductImage.status.in_(('pending', 'failed')))
+    image_ids = [row.id for row in query]
+
+    for image_id in image_ids:
+        image_pipeline.process(db.session.get(ProductImage, image_id))
+
+    click.echo(f"{len(image_ids)} image(s) traitée(s).")
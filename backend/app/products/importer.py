@@ -0,0 +1,412 @@
+# backend/app/products/importer.py
+
+"""
+Import du catalogue à partir des flux fournisseurs (CSV ou JSONL).
+
+Le fichier est lu ligne à ligne et traité par lots : pour chaque lot, une
+requête retrouve les produits existants par SKU, puis les nouveaux
+produits sont insérés et les existants mis à jour par des INSERT / UPDATE
+en masse (executemany), suivis des spécifications. Marques et catégories
+sont résolues par nom ou slug dans un dictionnaire chargé une fois (et
+créées si besoin).
+
+Une ligne invalide est signalée avec son numéro sans interrompre le lot ;
+si l'écriture d'un lot échoue, ses lignes sont rejouées une par une pour
+isoler les fautives.
+
+Colonnes reconnues : sku (obligatoire), name, price, description,
+short_description, stock_quantity, min_stock_level, is_active,
+brand / brand_id, category / category_id, et les spécifications
+(colonnes "spec:<nom>" en CSV, champ "specifications" en JSONL).
+"""
+
+import csv
+import json
+import time
+from datetime import datetime
+from itertools import chain
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from slugify import slugify
+from sqlalchemy import insert, update, delete
+from app import db
+from app.products.models import Product, Category, Brand, ProductSpecification
+from app.products.search import reindex_products
+from app.products.suggest import queue_suggestion_update
+from app.products.featured import mark_featured_changed
+from app.utils.http_cache import mark_catalog_changed
+from app.utils.response_cache import invalidate_on_commit
+
+# Nombre maximal d'erreurs détaillées dans le rapport
+MAX_REPORTED_ERRORS = 1000
+
+# Préfixe des colonnes CSV de spécifications ("spec:Couleur")
+SPEC_PREFIX = 'spec:'
+
+TRUE_VALUES = {'1', 'true', 'vrai', 'oui', 'yes', 'o', 'y'}
+
+# ============================================================================
+#                         LECTURE DES FLUX
+# ============================================================================
+
+def detect_format(filename):
+    """Déduit le format ('csv' ou 'jsonl') de l'extension du fichier."""
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    return 'jsonl' if extension in ('jsonl', 'ndjson', 'json') else 'csv'
+
+def iter_records(stream, fmt):
+    """
+    Lit un flux texte enregistrement par enregistrement
+
+    Yields:
+        tuple: (numéro de ligne, enregistrement ou None, message d'erreur ou None)
+    """
+    if fmt == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"JSON invalide: {str(e)}"
+                continue
+            if isinstance(record, dict):
+                yield line_number, record, None
+            else:
+                yield line_number, None, "Objet JSON attendu"
+        return
+
+    # Séparateur des exports tableur français (;) ou CSV standard (,)
+    header = stream.readline()
+    delimiter = ';' if header.count(';') > header.count(',') else ','
+    reader = csv.DictReader(chain([header], stream), delimiter=delimiter)
+    for record in reader:
+        yield reader.line_num, record, None
+
+# ============================================================================
+#                         IMPORT
+# ============================================================================
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+def _number(record, field, cast):
+    value = _text(record.get(field))
+    if value is None:
+        return None
+    try:
+        number = cast(value.replace(',', '.') if cast is float else value)
+    except ValueError:
+        raise ValueError(f"Valeur invalide pour {field}: {value}")
+    if number < 0:
+        raise ValueError(f"Valeur négative pour {field}: {value}")
+    return number
+
+def _specifications(record):
+    """Spécifications d'un enregistrement ([{name, value, unit}] ou None si absentes)."""
+    specs = record.get('specifications')
+    if isinstance(specs, dict):
+        specs = [{'name': name, 'value': value} for name, value in specs.items()]
+    elif specs is None:
+        specs = [
+            {'name': key[len(SPEC_PREFIX):].strip(), 'value': value}
+            for key, value in record.items()
+            if key and key.startswith(SPEC_PREFIX) and _text(value)
+        ]
+        if not specs and not any(key and key.startswith(SPEC_PREFIX) for key in record):
+            return None
+    elif not isinstance(specs, list):
+        raise ValueError("Spécifications invalides")
+
+    parsed = []
+    for position, spec in enumerate(specs):
+        name, value = _text(spec.get('name')), _text(spec.get('value'))
+        if not name or not value:
+            raise ValueError("Spécification sans nom ou sans valeur")
+        parsed.append({'name': name, 'value': value, 'unit': _text(spec.get('unit')) or '', 'position': position})
+    return parsed
+
+def parse_record(record):
+    """
+    Valide un enregistrement et le convertit en colonnes de Product
+
+    Returns:
+        dict: {sku, values, brand, category, specs}
+
+    Raises:
+        ValueError: Enregistrement invalide
+    """
+    sku = _text(record.get('sku'))
+    if not sku:
+        raise ValueError("SKU manquant")
+    if len(sku) > 50:
+        raise ValueError("SKU trop long (50 caractères maximum)")
+
+    values = {}
+    for field in ('name', 'description', 'short_description'):
+        value = _text(record.get(field))
+        if value is not None:
+            values[field] = value
+
+    for field, cast in (('price', float), ('stock_quantity', int), ('min_stock_level', int)):
+        number = _number(record, field, cast)
+        if number is not None:
+            values[field] = number
+
+    is_active = _text(record.get('is_active'))
+    if is_active is not None:
+        values['is_active'] = is_active.lower() in TRUE_VALUES
+
+    return {
+        'sku': sku,
+        'values': values,
+        'brand': _text(record.get('brand_id')) or _text(record.get('brand')),
+        'category': _text(record.get('category_id')) or _text(record.get('category')),
+        'specs': _specifications(record)
+    }
+
+class CatalogImporter:
+    """Importe des enregistrements par lots et compte les résultats."""
+
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size or current_app.config['CATALOG_IMPORT_BATCH_SIZE']
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self._load_lookups()
+
+    # ------------------------------------------------------------------
+    #   Marques et catégories
+    # ------------------------------------------------------------------
+
+    def _load_lookups(self):
+        self.brands = {row.slug: row.id for row in db.session.query(Brand.id, Brand.slug)}
+        self.categories = {row.slug: row.id for row in db.session.query(Category.id, Category.slug)}
+
+    def _resolve(self, value, lookup, model):
+        """ID d'une marque / catégorie donnée par ID, nom ou slug (créée si inconnue)."""
+        if value is None:
+            return None
+        if value.isdigit() and int(value) in lookup.values():
+            return int(value)
+
+        slug = slugify(value)
+        if slug not in lookup:
+            target = model(value)
+            db.session.add(target)
+            db.session.flush()
+            lookup[slug] = target.id
+        return lookup[slug]
+
+    # ------------------------------------------------------------------
+    #   Lots
+    # ------------------------------------------------------------------
+
+    def run(self, records, progress=None):
+        """
+        Importe tous les enregistrements
+
+        Args:
+            records (iterable): Sortie de iter_records()
+            progress (callable): Appelé avec le rapport après chaque lot
+
+        Returns:
+            dict: Rapport final (voir report())
+        """
+        batch = []
+        for line_number, record, error in records:
+            self.rows += 1
+            if error is None:
+                try:
+                    batch.append((line_number, parse_record(record)))
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                self._error(line_number, record and record.get('sku'), error)
+
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+                if progress:
+                    progress(self.report())
+
+        if batch:
+            self._flush(batch)
+        return self.report()
+
+    def _flush(self, batch):
+        try:
+            self._apply(self._write(batch))
+            db.session.commit()
+            return
+        except Exception as e:
+            db.session.rollback()
+            self._load_lookups()
+            if len(batch) == 1:
+                self._error(batch[0][0], batch[0][1]['sku'], str(e))
+                return
+            current_app.logger.warning(f"Import: lot rejoué ligne par ligne ({str(e)})")
+
+        for item in batch:
+            self._flush([item])
+
+    def _apply(self, result):
+        created, updated, errors = result
+        self.created += created
+        self.updated += updated
+        for line_number, sku, message in errors:
+            self._error(line_number, sku, message)
+
+    def _error(self, line_number, sku, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'sku': sku, 'error': message})
+
+    def _write(self, batch):
+        """Écrit un lot (sans commit). Retourne (créés, mis à jour, erreurs)."""
+        # Une même référence répétée dans le lot : la dernière ligne l'emporte
+        items = {}
+        for line_number, item in batch:
+            items[item['sku']] = (line_number, item)
+
+        existing = {
+            row.sku: row.id
+            for row in db.session.query(Product.id, Product.sku).filter(Product.sku.in_(items))
+        }
+        errors = []
+        now = datetime.utcnow()
+        inserts, updates, specs = [], [], {}
+
+        for sku, (line_number, item) in items.items():
+            values = dict(item['values'])
+            if item['brand'] is not None:
+                values['brand_id'] = self._resolve(item['brand'], self.brands, Brand)
+            if item['category'] is not None:
+                values['category_id'] = self._resolve(item['category'], self.categories, Category)
+
+            if sku in existing:
+                updates.append({**values, 'id': existing[sku], 'updated_at': now})
+            elif 'name' not in values or 'price' not in values:
+                errors.append((line_number, sku, "Nom et prix obligatoires pour un nouveau produit"))
+                continue
+            else:
+                inserts.append({
+                    'sku': sku, 'description': None, 'short_description': None,
+                    'stock_quantity': 0, 'min_stock_level': 5, 'is_active': True,
+                    'brand_id': None, 'category_id': None,
+                    **values, 'slug': slugify(values['name']), 'created_at': now, 'updated_at': now
+                })
+
+            if item['specs'] is not None:
+                specs[sku] = item['specs']
+
+        if inserts:
+            self._deduplicate_slugs(inserts)
+            db.session.execute(insert(Product), inserts)
+            existing.update(
+                (row.sku, row.id) for row in db.session.query(Product.id, Product.sku)
+                .filter(Product.sku.in_([row['sku'] for row in inserts]))
+            )
+        if updates:
+            db.session.execute(update(Product), updates)
+
+        if specs:
+            spec_product_ids = [existing[sku] for sku in specs]
+            db.session.execute(
+                delete(ProductSpecification).where(ProductSpecification.product_id.in_(spec_product_ids))
+                .execution_options(synchronize_session=False)
+            )
+            rows = [{**spec, 'product_id': existing[sku]} for sku, product_specs in specs.items() for spec in product_specs]
+            if rows:
+                db.session.execute(insert(ProductSpecification), rows)
+
+        product_ids = [existing[sku] for sku in items if sku in existing]
+        self._sync(product_ids)
+        return len(inserts), len(updates), errors
+
+    def _deduplicate_slugs(self, inserts):
+        """Suffixe par le SKU les slugs déjà utilisés (une requête)."""
+        taken = {
+            row.slug for row in db.session.query(Product.slug)
+            .filter(Product.slug.in_({row['slug'] for row in inserts}))
+        }
+        for row in inserts:
+            if row['slug'] in taken:
+                row['slug'] = f"{row['slug']}-{slugify(row['sku'])}"
+            taken.add(row['slug'])
+
+    def _sync(self, product_ids):
+        """Index plein texte, suggestions et caches (écritures hors ORM)."""
+        if not product_ids:
+            return
+        reindex_products(db.session.connection(), product_ids)
+
+        rows = db.session.query(
+            Product.id, Product.name, Product.sku, Product.slug, Product.brand_id, Product.is_active
+        ).filter(Product.id.in_(product_ids))
+        for row in rows:
+            queue_suggestion_update('product', row._asdict())
+
+        mark_catalog_changed()
+        mark_featured_changed()
+        invalidate_on_commit('products', *(f'product:{product_id}' for product_id in product_ids))
+
+    def report(self):
+        """Compteurs, erreurs détaillées et débit (lignes/s)."""
+        seconds = time.perf_counter() - self.started
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'failed': self.failed,
+            'errors': self.errors,
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(self.rows / seconds, 1) if seconds else None
+        }
+
+def import_catalog(stream, fmt, batch_size=None, progress=None):
+    """
+    Importe un flux texte CSV ou JSONL
+
+    Args:
+        stream: Flux texte (fichier ouvert, upload décodé)
+        fmt (str): 'csv' ou 'jsonl'
+        batch_size (int): Taille des lots (CATALOG_IMPORT_BATCH_SIZE par défaut)
+        progress (callable): Appelé avec le rapport après chaque lot
+
+    Returns:
+        dict: Rapport d'import
+    """
+    return CatalogImporter(batch_size).run(iter_records(stream, fmt), progress)
+
+# ============================================================================
+#                         COMMANDES CLI
+# ============================================================================
+
+catalog_cli = AppGroup('catalog', help='Import du catalogue produits.')
+
+@catalog_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), help="Format (déduit de l'extension par défaut).")
+@click.option('--batch-size', type=int, help='Nombre de lignes par lot.')
+def import_command(path, fmt, batch_size):
+    """Importe un fichier fournisseur CSV ou JSONL."""
+    def progress(report):
+        click.echo(f"{report['rows']} lignes traitées ({report['rows_per_second']} lignes/s)")
+
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        report = import_catalog(stream, fmt or detect_format(path), batch_size, progress)
+
+    click.echo(
+        f"Terminé : {report['rows']} lignes en {report['seconds']} s ({report['rows_per_second']} lignes/s), "
+        f"{report['created']} créés, {report['updated']} mis à jour, {report['failed']} en erreur."
+    )
+    for error in report['errors']:
+        click.echo(f"  ligne {error['line']} ({error['sku'] or '?'}) : {error['error']}", err=True)
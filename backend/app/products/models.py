@@ -16,6 +16,10 @@ class Category(db.Model):
     description = db.Column(db.Text)
     image_url = db.Column(db.String(255))
     parent_id = db.Column(db.Integer, db.ForeignKey('categories.id'))
+    # Chemin matérialisé des ancêtres, ex: "/1/4/9/" (maintenu par app.products.categories)
+    path = db.Column(db.String(255), index=True)
+    # Rang d'affichage sur l'accueil si la catégorie est épinglée par un administrateur
+    featured_position = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -43,6 +47,8 @@ class Category(db.Model):
             'description': self.description,
             'image_url': self.image_url,
             'parent_id': self.parent_id,
+            'path': self.path,
+            'featured_position': self.featured_position,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -86,19 +92,27 @@ class Product(db.Model):
     """Modèle pour les produits (cartouches d'imprimante)."""
     
     __tablename__ = 'products'
+    __table_args__ = (
+        # Catalogue public : filtre is_active/category_id, tri par nom
+        db.Index('ix_products_active_category_name', 'is_active', 'category_id', 'name'),
+        # Tri par nom et pagination par curseur (name, id)
+        db.Index('ix_products_name_id', 'name', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
-    slug = db.Column(db.String(255), nullable=False)
+    slug = db.Column(db.String(255), nullable=False, index=True)
     sku = db.Column(db.String(50), unique=True, nullable=False)
     description = db.Column(db.Text)
     short_description = db.Column(db.String(255))
-    price = db.Column(db.Float, nullable=False)
-    stock_quantity = db.Column(db.Integer, default=0)
+    price = db.Column(db.Float, nullable=False, index=True)
+    stock_quantity = db.Column(db.Integer, default=0, index=True)
     min_stock_level = db.Column(db.Integer, default=5)
-    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'))
-    brand_id = db.Column(db.Integer, db.ForeignKey('brands.id'))
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), index=True)
+    brand_id = db.Column(db.Integer, db.ForeignKey('brands.id'), index=True)
     is_active = db.Column(db.Boolean, default=True)
+    # Rang d'affichage sur l'accueil si le produit est épinglé par un administrateur
+    featured_position = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -136,6 +150,7 @@ class Product(db.Model):
             'category_id': self.category_id,
             'brand_id': self.brand_id,
             'is_active': self.is_active,
+            'featured_position': self.featured_position,
             'images': [img.to_dict() for img in self.images],
             'specifications': [spec.to_dict() for spec in self.specifications],
             'created_at': self.created_at.isoformat() if self.created_at else None,
@@ -148,11 +163,20 @@ class ProductImage(db.Model):
     __tablename__ = 'product_images'
 
     id = db.Column(db.Integer, primary_key=True)
-    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
-    url = db.Column(db.String(255), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
+    # Stockage par contenu : l'URL identifie le fichier (compteur de références)
+    url = db.Column(db.String(255), nullable=False, index=True)
     alt = db.Column(db.String(200))
     is_primary = db.Column(db.Boolean, default=False)
     position = db.Column(db.Integer, default=0)
+    # Déclinaisons produites par app.products.images : 'pending', 'ready' ou 'failed'
+    status = db.Column(db.String(20), default='ready', nullable=False)
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    # {taille: {format: {url, width, height}}}
+    variants = db.Column(db.JSON)
+    # {type MIME: "url 150w, url 400w, ..."}
+    srcset = db.Column(db.JSON)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def to_dict(self):
@@ -163,6 +187,11 @@ class ProductImage(db.Model):
             'alt': self.alt,
             'is_primary': self.is_primary,
             'position': self.position,
+            'status': self.status,
+            'width': self.width,
+            'height': self.height,
+            'variants': self.variants,
+            'srcset': self.srcset,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
@@ -172,7 +201,7 @@ class ProductSpecification(db.Model):
     __tablename__ = 'product_specifications'
 
     id = db.Column(db.Integer, primary_key=True)
-    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     value = db.Column(db.String(200), nullable=False)
     unit = db.Column(db.String(50))
@@ -188,6 +217,19 @@ class ProductSpecification(db.Model):
             'position': self.position
         }
 
+class CatalogVersion(db.Model):
+    """Compteur de version du catalogue, incrémenté à chaque modification.
+
+    Une seule ligne (id = 1) ; sert à calculer les ETag des routes de lecture
+    (voir app.utils.http_cache).
+    """
+    
+    __tablename__ = 'catalog_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class User(db.Model):
     """Modèle pour les utilisateurs."""
     
@@ -0,0 +1,171 @@
+# backend/app/products/projection.py
+
+"""
+Projections des listes de produits (?fields=... / ?view=card|full).
+
+Sans paramètre (ou avec view=full), les routes gardent la sérialisation
+complète par ProductSchema. Avec une liste de champs ou view=card :
+  - seules les colonnes nécessaires sont chargées (load_only) ;
+  - images, spécifications, catégorie et marque ne sont chargées que si
+    elles sont demandées ;
+  - primary_image est lue pour toute la page en un seul SELECT ;
+  - la sérialisation passe par une fonction précompilée par liste de
+    champs, sans marshmallow.
+"""
+
+from functools import lru_cache
+from sqlalchemy import select
+from sqlalchemy.orm import load_only, selectinload, joinedload
+from app import db
+from app.products.models import Product, ProductImage
+from app.products.utils import get_product_stock_status
+
+# Colonnes exposées telles quelles
+COLUMN_FIELDS = (
+    'id', 'sku', 'name', 'slug', 'description', 'short_description', 'price',
+    'stock_quantity', 'min_stock_level', 'category_id', 'brand_id', 'is_active',
+    'featured_position'
+)
+
+# Champs calculés -> colonnes nécessaires
+COMPUTED_FIELDS = {
+    'primary_image': ('id',),
+    'stock_status': ('is_active', 'stock_quantity', 'min_stock_level')
+}
+
+# Relations (mêmes champs que les schémas marshmallow)
+RELATION_FIELDS = {
+    'images': ('id', 'url', 'alt', 'is_primary', 'position', 'status', 'width', 'height', 'variants', 'srcset'),
+    'specifications': ('id', 'name', 'value', 'unit', 'position'),
+    'category': ('id', 'name', 'description', 'image_url', 'parent_id', 'path', 'featured_position'),
+    'brand': ('id', 'name', 'description', 'logo_url', 'website')
+}
+
+# Vues prédéfinies (None : sérialisation complète par ProductSchema)
+VIEWS = {
+    'card': ('id', 'name', 'sku', 'price', 'primary_image', 'stock_quantity', 'stock_status'),
+    'full': None
+}
+
+# ============================================================================
+#                         PARAMÈTRES
+# ============================================================================
+
+def parse_fields(fields=None, view=None, include=()):
+    """
+    Champs demandés via ?fields=id,name,price ou ?view=card
+
+    Args:
+        fields (str): Valeur brute de ?fields
+        view (str): Valeur brute de ?view
+        include (tuple): Relations de ?include, ajoutées aux champs
+
+    Returns:
+        tuple: Champs dans l'ordre demandé, ou None pour la vue complète
+
+    Raises:
+        ValueError: Vue ou champ inconnu
+    """
+    if fields:
+        names = [name.strip() for name in fields.split(',') if name.strip()]
+    elif view:
+        if view not in VIEWS:
+            raise ValueError(f"Vue inconnue: {view} (card ou full)")
+        if VIEWS[view] is None:
+            return None
+        names = list(VIEWS[view])
+    else:
+        return None
+
+    unknown = [name for name in names if name not in COLUMN_FIELDS and name not in COMPUTED_FIELDS
+               and name not in RELATION_FIELDS]
+    if unknown:
+        raise ValueError(f"Champ(s) inconnu(s): {', '.join(unknown)}")
+
+    return tuple(dict.fromkeys(names + list(include)))
+
+def projection_options(fields, *columns):
+    """
+    Options de chargement limitées aux champs demandés
+
+    Args:
+        fields (tuple): Champs retenus par parse_fields
+        *columns: Colonnes supplémentaires nécessaires (tri, curseur)
+
+    Returns:
+        list: Options à passer à query.options()
+    """
+    needed = {'id'}
+    for name in fields:
+        if name in COLUMN_FIELDS:
+            needed.add(name)
+        elif name in COMPUTED_FIELDS:
+            needed.update(COMPUTED_FIELDS[name])
+        elif name in ('category', 'brand'):
+            needed.add(f"{name}_id")
+
+    attributes = [getattr(Product, name) for name in COLUMN_FIELDS if name in needed]
+    options = [load_only(*attributes, *columns)]
+
+    if 'images' in fields:
+        options.append(selectinload(Product.images))
+    if 'specifications' in fields:
+        options.append(selectinload(Product.specifications))
+    if 'category' in fields:
+        options.append(joinedload(Product.category))
+    if 'brand' in fields:
+        options.append(joinedload(Product.brand))
+    return options
+
+# ============================================================================
+#                         SÉRIALISATION
+# ============================================================================
+
+def primary_images(product_ids):
+    """URL de l'image principale de chaque produit (un seul SELECT)."""
+    if not product_ids:
+        return {}
+    rows = db.session.execute(
+        select(ProductImage.product_id, ProductImage.url)
+        .where(ProductImage.product_id.in_(product_ids))
+        .order_by(ProductImage.product_id, ProductImage.is_primary.desc(), ProductImage.position, ProductImage.id)
+    )
+    result = {}
+    for product_id, url in rows:
+        result.setdefault(product_id, url)
+    return result
+
+def _nested(names):
+    def dump(item):
+        return {name: getattr(item, name) for name in names} if item is not None else None
+    return dump
+
+def _getter(name):
+    """Fonction (produit, contexte) -> valeur d'un champ."""
+    if name in COLUMN_FIELDS:
+        return lambda product, context: getattr(product, name)
+    if name == 'primary_image':
+        return lambda product, context: context['primary_images'].get(product.id)
+    if name == 'stock_status':
+        return lambda product, context: get_product_stock_status(product)[0]
+
+    dump = _nested(RELATION_FIELDS[name])
+    if name in ('images', 'specifications'):
+        return lambda product, context: [dump(item) for item in getattr(product, name)]
+    return lambda product, context: dump(getattr(product, name))
+
+@lru_cache(maxsize=64)
+def compile_serializer(fields):
+    """Sérialiseur précompilé pour une liste de champs."""
+    getters = tuple((name, _getter(name)) for name in fields)
+    needs_images = 'primary_image' in fields
+
+    def serialize(products):
+        context = {'primary_images': primary_images([product.id for product in products]) if needs_images else {}}
+        return [{name: getter(product, context) for name, getter in getters} for product in products]
+
+    return serialize
+
+def serialize_products(products, fields):
+    """Sérialise une liste de produits chargés avec projection_options."""
+    return compile_serializer(fields)(products)
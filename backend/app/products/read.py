@@ -0,0 +1,224 @@
+# backend/app/products/read.py
+
+"""
+Modèle de lecture du catalogue (listes, recherche, fiche produit).
+
+Les routes de consultation ne modifient jamais les produits : elles
+lisent des lignes (select() / with_entities) au lieu d'instances Product,
+sans identity map ni suivi des modifications. Chaque produit devient un
+ProductRead (__slots__), ses images et spécifications des namedtuples,
+lus pour toute la page en une requête chacun.
+
+ProductRead.to_dict() produit le même résultat que ProductSchema.
+"""
+
+import time
+import tracemalloc
+from collections import defaultdict, namedtuple
+import click
+from sqlalchemy import select
+from app import db
+from app.products.models import Product, Category, Brand, ProductImage, ProductSpecification
+from app.products.search import find_product_rows
+from app.utils.serializers import (
+    PRODUCT_COLUMNS, product_serializer, image_serializer, specification_serializer,
+    category_serializer, brand_serializer
+)
+
+ImageRead = namedtuple('ImageRead', image_serializer.fields)
+SpecificationRead = namedtuple('SpecificationRead', specification_serializer.fields)
+CategoryRead = namedtuple('CategoryRead', category_serializer.fields)
+BrandRead = namedtuple('BrandRead', brand_serializer.fields)
+
+# Relation non demandée (à distinguer d'une catégorie / marque absente)
+NOT_LOADED = object()
+
+class ProductRead:
+    """Produit en lecture seule (colonnes de PRODUCT_COLUMNS et relations)."""
+
+    __slots__ = product_serializer.fields + ('images', 'specifications', 'category', 'brand')
+
+    def __init__(self, row, images=(), specifications=(), category=NOT_LOADED, brand=NOT_LOADED):
+        # Même ordre que PRODUCT_COLUMNS
+        (self.id, self.sku, self.name, self.description, self.short_description, self.price,
+         self.stock_quantity, self.min_stock_level, self.category_id, self.brand_id,
+         self.is_active, self.featured_position) = row
+        self.images = images
+        self.specifications = specifications
+        self.category = category
+        self.brand = brand
+
+    def to_dict(self):
+        """Dictionnaire au format de ProductSchema."""
+        data = product_serializer(self)
+        data['images'] = [image._asdict() for image in self.images]
+        data['specifications'] = [specification._asdict() for specification in self.specifications]
+        if self.category is not NOT_LOADED:
+            data['category'] = self.category._asdict() if self.category else None
+        if self.brand is not NOT_LOADED:
+            data['brand'] = self.brand._asdict() if self.brand else None
+        return data
+
+    def __repr__(self):
+        return f'<ProductRead {self.id} {self.sku}>'
+
+# ============================================================================
+#                         CHARGEMENT
+# ============================================================================
+
+def _children(model, record, product_ids):
+    """Images / spécifications des produits, groupées par produit."""
+    grouped = defaultdict(list)
+    rows = db.session.execute(
+        select(model.product_id, *(getattr(model, name) for name in record._fields))
+        .where(model.product_id.in_(product_ids))
+        .order_by(model.product_id, model.id)
+    )
+    for row in rows:
+        grouped[row[0]].append(record._make(row[1:]))
+    return grouped
+
+def _related(model, record, ids):
+    """Catégories / marques par ID."""
+    ids = {value for value in ids if value is not None}
+    if not ids:
+        return {}
+    rows = db.session.execute(select(*(getattr(model, name) for name in record._fields)).where(model.id.in_(ids)))
+    return {row.id: record._make(row) for row in rows}
+
+def load_products(rows, include=()):
+    """
+    Construit les ProductRead de lignes de produits (colonnes PRODUCT_COLUMNS)
+
+    Args:
+        rows (iterable): Lignes de requête
+        include (tuple): Relations supplémentaires ('category', 'brand')
+
+    Returns:
+        list: ProductRead dans l'ordre des lignes
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+
+    product_ids = [row.id for row in rows]
+    images = _children(ProductImage, ImageRead, product_ids)
+    specifications = _children(ProductSpecification, SpecificationRead, product_ids)
+    categories = _related(Category, CategoryRead, (row.category_id for row in rows)) if 'category' in include else None
+    brands = _related(Brand, BrandRead, (row.brand_id for row in rows)) if 'brand' in include else None
+
+    return [
+        ProductRead(
+            row,
+            images.get(row.id, ()),
+            specifications.get(row.id, ()),
+            categories.get(row.category_id) if categories is not None else NOT_LOADED,
+            brands.get(row.brand_id) if brands is not None else NOT_LOADED
+        )
+        for row in rows
+    ]
+
+def product_dicts(rows, include=()):
+    """Sérialise des lignes de produits au format de ProductSchema."""
+    return [product.to_dict() for product in load_products(rows, include)]
+
+# ============================================================================
+#                         REQUÊTES
+# ============================================================================
+
+def listing_query():
+    """Requête de liste à filtrer et paginer (lignes PRODUCT_COLUMNS)."""
+    return Product.query.with_entities(*PRODUCT_COLUMNS)
+
+def search_products(query, limit=20, include=()):
+    """Recherche plein texte, en ProductRead classés par pertinence."""
+    return load_products(find_product_rows(query, limit=limit), include)
+
+def get_product(product_id=None, slug=None, include=()):
+    """
+    Fiche produit par ID ou par slug
+
+    Returns:
+        ProductRead: Produit, ou None s'il n'existe pas
+    """
+    statement = select(*PRODUCT_COLUMNS)
+    if product_id is not None:
+        statement = statement.where(Product.id == product_id)
+    else:
+        statement = statement.where(Product.slug == slug)
+
+    row = db.session.execute(statement.limit(1)).first()
+    if row is None:
+        return None
+    return load_products([row], include)[0]
+
+# ============================================================================
+#                         BANC D'ESSAI
+# ============================================================================
+
+def _measure(page, repeat):
+    """(temps moyen en s, pic mémoire en octets) d'une fonction de lecture."""
+    page()  # Préchauffage (compilation des requêtes)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        page()
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    try:
+        page()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+@click.command('catalog-read-bench')
+@click.option('--size', 'sizes', multiple=True, type=int, default=(20, 100, 1000), show_default=True,
+              help='Produits par page (plusieurs possibles).')
+@click.option('--repeat', default=10, show_default=True, help='Pages lues par mesure.')
+def catalog_read_bench_command(sizes, repeat):
+    """Compare Product.query + ProductSchema et le modèle de lecture (temps et mémoire par page)."""
+    from app.products.schemas import ProductSchema
+    from app.products.utils import product_loading_options
+    from app.products.samples import add_sample_products
+
+    schema = ProductSchema(many=True, exclude=('category', 'brand'))
+    missing = max(sizes) - Product.query.count()
+    try:
+        if missing > 0:
+            click.echo(f"{missing} produit(s) fictif(s) ajouté(s) le temps de la mesure")
+            add_sample_products(missing)
+        product_id = db.session.execute(select(Product.id).order_by(Product.id)).scalar()
+
+        def orm_detail():
+            result = ProductSchema(exclude=('category', 'brand')).dump(db.session.get(Product, product_id))
+            db.session.expunge_all()
+            return result
+
+        def read_detail():
+            return get_product(product_id).to_dict()
+
+        cases = [('fiche produit', orm_detail, read_detail)]
+        for size in sizes:
+            def orm_page(size=size):
+                products = Product.query.options(*product_loading_options()).order_by(Product.name).limit(size).all()
+                result = schema.dump(products)
+                db.session.expunge_all()
+                return result
+
+            def read_page(size=size):
+                return product_dicts(listing_query().order_by(Product.name).limit(size))
+
+            cases.append((f"page de {size}", orm_page, read_page))
+
+        for label, orm_page, read_page in cases:
+            assert orm_page() == read_page(), f"Résultats différents ({label})"
+            orm_time, orm_peak = _measure(orm_page, repeat)
+            read_time, read_peak = _measure(read_page, repeat)
+            click.echo(
+                f"{label:<14}: Product.query {orm_time * 1000:7.2f} ms / {orm_peak / 1024:8.0f} Kio"
+                f"  ->  lecture {read_time * 1000:7.2f} ms / {read_peak / 1024:8.0f} Kio"
+                f"  (x{orm_time / read_time:.1f} temps, x{orm_peak / max(read_peak, 1):.1f} mémoire)"
+            )
+    finally:
+        db.session.rollback()
@@ -7,18 +7,34 @@ from app import db
 from app.models.user import User
 from app.products.models import Product, Category, Brand, ProductImage, ProductSpecification
 from app.products.schemas import ProductSchema, CategorySchema, BrandSchema
-from app.products.utils import save_product_image, delete_product_image, allowed_file
-import os, uuid
+from app.products.categories import category_tree
+from app.products.featured import featured_lists
+from app.products.importer import import_catalog, detect_format
+from app.products.images import image_pipeline, copy_existing_variants
+from app.products.bulk import (
+    parse_bulk_ids, bulk_set_active, bulk_update_price, bulk_delete, delete_files_in_background
+)
+from app.products.utils import (
+    save_product_image, delete_product_image, store_image_content, allowed_file,
+    product_loading_options, parse_include, parse_id_list
+)
+from app.products.search import find_products
+from app.products.projection import parse_fields, projection_options, serialize_products
+from app.products.read import listing_query, product_dicts, search_products as read_search, get_product
+from app.products.suggest import suggestion_index, DEFAULT_LIMIT, MAX_LIMIT
+import io, os, uuid
 from slugify import slugify
 from functools import wraps  # Partie de la bibliothèque standard de Python
 from flask import abort      # Partie de Flask
 from app.utils.decorators import admin_required
+from app.utils.pagination import keyset_paginate, clamp_per_page
+from app.utils.http_cache import catalog_cached
+from app.utils.response_cache import cached_response
 
 products_bp = Blueprint('products', __name__, url_prefix='/api/products')
 
 # Initialisation des schémas pour la sérialisation
-product_schema = ProductSchema()
-products_schema = ProductSchema(many=True)
+product_schema = ProductSchema(exclude=('category', 'brand'))
 category_schema = CategorySchema()
 categories_schema = CategorySchema(many=True)
 brand_schema = BrandSchema()
@@ -44,27 +60,22 @@ def search_products():
         if not query or len(query) < 2:
             return jsonify({"error": "Requête de recherche trop courte"}), 400
             
-        # Diviser la requête en mots clés
-        keywords = query.lower().split()
-        
-        # Construction de la requête
-        search_query = Product.query.filter(Product.is_active == True)
-        
-        # Appliquer chaque mot clé
-        for keyword in keywords:
-            search_term = f"%{keyword}%"
-            search_query = search_query.filter(
-                (Product.name.ilike(search_term)) |
-                (Product.sku.ilike(search_term)) |
-                (Product.short_description.ilike(search_term)) |
-                (Product.description.ilike(search_term))
-            )
-        
-        # Limiter les résultats
-        products = search_query.limit(20).all()
+        include = parse_include(request.args.get('include'))
+        try:
+            fields = parse_fields(request.args.get('fields'), request.args.get('view'), include)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        # Recherche dans l'index plein texte, classée par pertinence
+        if fields:
+            products = find_products(query, limit=20, options=projection_options(fields))
+            results = serialize_products(products, fields)
+        else:
+            products = read_search(query, limit=20, include=include)
+            results = [product.to_dict() for product in products]
         
         return jsonify({
-            "results": products_schema.dump(products),
+            "results": results,
             "count": len(products),
             "query": query
         }), 200
@@ -73,36 +84,75 @@ def search_products():
         current_app.logger.error(f"Erreur de recherche: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@products_bp.route('/suggest', methods=['GET'])
+def suggest_products():
+    """Autocomplétion des références, noms de produits et marques (index en mémoire)"""
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', DEFAULT_LIMIT, type=int), MAX_LIMIT)
+    
+    return jsonify({
+        "suggestions": suggestion_index.suggest(query, limit=limit),
+        "query": query
+    }), 200
+
 # ============================================================================
 #                         Routes pour la gestion des produits
 # ============================================================================
 
 @products_bp.route('/', methods=['GET'])
+@catalog_cached
+@cached_response(tags=['products'])
 def get_products():
     """Récupère la liste des produits avec filtres optionnels."""
     try:
         # Filtres de recherche
         search = request.args.get('search', '')
         category_id = request.args.get('category_id', type=int)
+        include_descendants = request.args.get('include_descendants', 'false').lower() == 'true'
         brand_id = request.args.get('brand_id', type=int)
         min_price = request.args.get('min_price', type=float)
         max_price = request.args.get('max_price', type=float)
         in_stock = request.args.get('in_stock', type=bool, default=False)
+        include = parse_include(request.args.get('include'))
+        
+        # Champs demandés (?fields=... ou ?view=card) : projection sans marshmallow
+        try:
+            fields = parse_fields(request.args.get('fields'), request.args.get('view'), include)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         # Pagination
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        
-        # Construction de la requête
-        query = Product.query
+        per_page = clamp_per_page(request.args.get('per_page', type=int))
+        cursor = request.args.get('cursor')
+        with_total = request.args.get('with_total', 'true').lower() != 'false'
+        
+        # Construction de la requête (relations chargées en lot pour toute la page)
+        if fields:
+            query = Product.query.options(*projection_options(fields, Product.name))
+            serialize = lambda products: serialize_products(products, fields)
+        else:
+            # Lignes (sans instances Product), images et relations lues pour toute la page
+            query = listing_query()
+            serialize = lambda rows: product_dicts(rows, include)
         
         # Application des filtres
         if search:
             search_term = f"%{search}%"
             query = query.filter(Product.name.ilike(search_term) | Product.sku.ilike(search_term))
         
+        # Une ou plusieurs catégories (category_ids=1,2,3), sous-catégories comprises sur demande
+        try:
+            category_ids = parse_id_list(request.args.get('category_ids'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         if category_id:
-            query = query.filter(Product.category_id == category_id)
+            category_ids.append(category_id)
+        
+        if category_ids:
+            if include_descendants:
+                category_ids = category_tree.descendant_ids(category_ids)
+            query = query.filter(Product.category_id.in_(sorted(set(category_ids))))
             
         if brand_id:
             query = query.filter(Product.brand_id == brand_id)
@@ -116,17 +166,38 @@ def get_products():
         if in_stock:
             query = query.filter(Product.stock_quantity > 0)
             
+        # Mode curseur : reprise après (name, id) de la dernière ligne, sans OFFSET
+        if cursor is not None:
+            try:
+                keyset_page = keyset_paginate(
+                    query,
+                    [Product.name, Product.id],
+                    cursor=cursor,
+                    per_page=per_page,
+                    with_total=with_total
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            
+            return jsonify({
+                'items': serialize(keyset_page.items),
+                'total': keyset_page.total,
+                'per_page': per_page,
+                'next_cursor': keyset_page.next_cursor,
+                'has_more': keyset_page.has_more
+            }), 200
+        
         # Tri par défaut
         query = query.order_by(Product.name)
         
         # Exécution de la requête paginée
-        paginated_products = query.paginate(page=page, per_page=per_page, error_out=False)
+        paginated_products = query.paginate(page=page, per_page=per_page, error_out=False, count=with_total)
         
         # Résultat formaté
         result = {
-            'items': products_schema.dump(paginated_products.items),
+            'items': serialize(paginated_products.items),
             'total': paginated_products.total,
-            'pages': paginated_products.pages,
+            'pages': paginated_products.pages if with_total else None,
             'page': page,
             'per_page': per_page
         }
@@ -137,11 +208,22 @@ def get_products():
         current_app.logger.error(f"Erreur lors de la récupération des produits: {str(e)}")
         return jsonify({"error": str(e)}), 500
     
+@products_bp.route('/featured', methods=['GET'])
+def get_featured_products():
+    """Récupère les produits mis en avant sur l'accueil (liste précalculée en mémoire)."""
+    try:
+        return current_app.response_class(featured_lists.products_document(), mimetype='application/json'), 200
+    except Exception as e:
+        current_app.logger.error(f"Erreur lors de la récupération des produits mis en avant: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @products_bp.route('/favorites', methods=['GET'])
 @jwt_required()
 def get_favorites():
     """
     Récupère les produits favoris de l'utilisateur.
+    
+    Paramètres: fields / view comme pour la liste des produits.
     """
     try:
         current_user_id = get_jwt_identity()
@@ -150,11 +232,20 @@ def get_favorites():
         if not user:
             return jsonify({'error': 'Utilisateur non trouvé'}), 404
 
-        favorites = user.favorites.all()
+        try:
+            fields = parse_fields(request.args.get('fields'), request.args.get('view'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if fields:
+            favorites = user.favorites.options(*projection_options(fields)).all()
+            return jsonify(serialize_products(favorites, fields)), 200
+
+        favorites = user.favorites.options(*product_loading_options()).all()
         return jsonify([product.to_dict() for product in favorites]), 200
 
     except Exception as e:
-        logger.error(f"Erreur récupération favoris: {str(e)}")
+        current_app.logger.error(f"Erreur récupération favoris: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/favorites/<int:product_id>', methods=['POST'])
@@ -174,8 +265,9 @@ def add_favorite(product_id):
         if not product:
             return jsonify({'error': 'Produit non trouvé'}), 404
 
-        user.favorites.append(product)
-        db.session.commit()
+        if not user.favorites.filter(Product.id == product_id).count():
+            user.favorites.append(product)
+            db.session.commit()
 
         return jsonify({
             'message': 'Produit ajouté aux favoris',
@@ -184,7 +276,7 @@ def add_favorite(product_id):
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Erreur ajout favori: {str(e)}")
+        current_app.logger.error(f"Erreur ajout favori: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/favorites/<int:product_id>', methods=['DELETE'])
@@ -204,8 +296,9 @@ def remove_favorite(product_id):
         if not product:
             return jsonify({'error': 'Produit non trouvé'}), 404
 
-        user.favorites.remove(product)
-        db.session.commit()
+        if user.favorites.filter(Product.id == product_id).count():
+            user.favorites.remove(product)
+            db.session.commit()
 
         return jsonify({
             'message': 'Produit supprimé des favoris',
@@ -214,25 +307,33 @@ def remove_favorite(product_id):
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Erreur suppression favori: {str(e)}")
+        current_app.logger.error(f"Erreur suppression favori: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/<int:product_id>', methods=['GET'])
+@catalog_cached
+@cached_response(tags=lambda kwargs, response: [f"product:{kwargs['product_id']}"])
 def get_product_by_id(product_id):
-    """Récupère un produit par son ID."""
+    """Récupère un produit par son ID (relations category / brand via ?include=...)."""
     try:
-        product = Product.query.get_or_404(product_id)
-        return jsonify(product_schema.dump(product)), 200
+        product = get_product(product_id, include=parse_include(request.args.get('include')))
+        if product is None:
+            return jsonify({"error": "Produit non trouvé"}), 404
+        return jsonify(product.to_dict()), 200
     except Exception as e:
         current_app.logger.error(f"Erreur lors de la récupération du produit {product_id}: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 @products_bp.route('/<string:slug>', methods=['GET'])
+@catalog_cached
+@cached_response(tags=lambda kwargs, response: [f"product:{response.get_json()['id']}"])
 def get_product_by_slug(slug):
-    """Récupère un produit par son slug."""
+    """Récupère un produit par son slug (relations category / brand via ?include=...)."""
     try:
-        product = Product.query.filter_by(slug=slug).first_or_404()
-        return jsonify(product_schema.dump(product)), 200
+        product = get_product(slug=slug, include=parse_include(request.args.get('include')))
+        if product is None:
+            return jsonify({"error": "Produit non trouvé"}), 404
+        return jsonify(product.to_dict()), 200
     except Exception as e:
         current_app.logger.error(f"Erreur lors de la récupération du produit {slug}: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -349,6 +450,10 @@ def update_product(product_id):
             
         if 'is_active' in data:
             product.is_active = data['is_active']
+            
+        if 'featured_position' in data:
+            # Rang sur l'accueil (null pour retirer l'épinglage)
+            product.featured_position = data['featured_position']
         
         # Mise à jour des spécifications
         if 'specifications' in data:
@@ -391,18 +496,16 @@ def delete_product(product_id):
         # Récupération du produit
         product = Product.query.get_or_404(product_id)
         
-        # Suppression des images
-        for image in product.images:
-            try:
-                delete_product_image(image.url)
-            except Exception as e:
-                current_app.logger.warning(f"Impossible de supprimer l'image {image.id}: {str(e)}")
-
+        images = [(image.url, image.variants) for image in product.images]
         
         # Suppression du produit (la cascade supprimera les specs et images)
         db.session.delete(product)
         db.session.commit()
         
+        # Fichiers supprimés seulement s'ils ne servent plus à aucun produit
+        for url, variants in images:
+            delete_product_image(url, variants)
+        
         return jsonify({"message": "Produit supprimé avec succès"}), 200
         
     except Exception as e:
@@ -410,6 +513,133 @@ def delete_product(product_id):
         current_app.logger.error(f"Erreur lors de la suppression du produit {product_id}: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+# ============================================================================
+#                       Opérations groupées (administration)
+# ============================================================================
+
+def bulk_response(results, message):
+    """Réponse commune des opérations groupées : résultat par ID."""
+    done = sum(1 for result in results if result['status'] in ('updated', 'deleted'))
+    return jsonify({"message": message, "count": done, "results": results}), 200
+
+@products_bp.route('/bulk-activate', methods=['POST'])
+@jwt_required()
+@admin_required
+def bulk_activate_products():
+    """Active plusieurs produits (attend {productIds: [...]})."""
+    return _bulk_set_active(True, "Produits activés")
+
+@products_bp.route('/bulk-deactivate', methods=['POST'])
+@jwt_required()
+@admin_required
+def bulk_deactivate_products():
+    """Désactive plusieurs produits (attend {productIds: [...]})."""
+    return _bulk_set_active(False, "Produits désactivés")
+
+def _bulk_set_active(is_active, message):
+    try:
+        product_ids = parse_bulk_ids((request.get_json() or {}).get('productIds'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        results = bulk_set_active(product_ids, is_active)
+        db.session.commit()
+        return bulk_response(results, message)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de la mise à jour groupée des produits: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@products_bp.route('/bulk-price', methods=['POST'])
+@jwt_required()
+@admin_required
+def bulk_update_products_price():
+    """
+    Modifie le prix de plusieurs produits
+
+    Attend un JSON avec:
+        - productIds: IDs des produits
+        - price: Nouveau prix commun, ou
+        - percent: Variation en pourcentage (ex: -10 pour une remise de 10 %)
+    """
+    data = request.get_json() or {}
+    try:
+        product_ids = parse_bulk_ids(data.get('productIds'))
+        if ('price' in data) == ('percent' in data):
+            raise ValueError("Indiquer soit price, soit percent")
+        price = float(data['price']) if 'price' in data else None
+        percent = float(data['percent']) if 'percent' in data else None
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    if (price is not None and price < 0) or (percent is not None and percent <= -100):
+        return jsonify({"error": "Le prix ne peut pas être négatif"}), 400
+
+    try:
+        results = bulk_update_price(product_ids, price=price, percent=percent)
+        db.session.commit()
+        return bulk_response(results, "Prix mis à jour")
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de la mise à jour groupée des prix: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@products_bp.route('/bulk-delete', methods=['POST'])
+@jwt_required()
+@admin_required
+def bulk_delete_products():
+    """
+    Supprime plusieurs produits (attend {productIds: [...]})
+
+    Les fichiers images sont supprimés en arrière-plan après le commit.
+    """
+    try:
+        product_ids = parse_bulk_ids((request.get_json() or {}).get('productIds'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        results, files = bulk_delete(product_ids)
+        db.session.commit()
+        delete_files_in_background(files)
+        return bulk_response(results, "Produits supprimés")
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de la suppression groupée des produits: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@products_bp.route('/import', methods=['POST'])
+@jwt_required()
+@admin_required
+def import_products():
+    """
+    Importe un fichier fournisseur (multipart, champ "file")
+
+    Le format est déduit de l'extension (.csv, .jsonl) ou du paramètre
+    "format". Retourne le rapport d'import (compteurs, erreurs par ligne,
+    débit en lignes/s).
+    """
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({"error": "Aucun fichier envoyé"}), 400
+
+    fmt = request.form.get('format') or detect_format(upload.filename)
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({"error": "Format non supporté (csv ou jsonl)"}), 400
+
+    try:
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        report = import_catalog(stream, fmt)
+        return jsonify(report), 200
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return jsonify({"error": "Le fichier doit être encodé en UTF-8"}), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de l'import du catalogue: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 # ============================================================================
 #                       Routes pour la gestion des images
 # ============================================================================
@@ -442,40 +672,42 @@ def upload_product_image(product_id):
         
         # Sauvegarde de l'image
         try:
-            # Génération d'un nom de fichier unique
-            filename = secure_filename(file.filename)
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            
-            # Chemin de sauvegarde
-            upload_folder = os.path.join(current_app.root_path, 'static', 'images', 'products')
-            os.makedirs(upload_folder, exist_ok=True)
-            file_path = os.path.join(upload_folder, unique_filename)
-            
-            # Sauvegarde du fichier
-            file.save(file_path)
-            
-            # URL relative pour la base de données
-            relative_path = f"/static/images/products/{unique_filename}"
+            # Stockage par contenu : une image déjà connue n'est pas réécrite
+            try:
+                relative_path = store_image_content(file)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
             
             # Création de l'entrée dans la base de données
             new_image = ProductImage(
                 product_id=product_id,
                 url=relative_path,
                 alt=request.form.get('alt', product.name),
-                is_primary=request.form.get('is_primary', 'false').lower() == 'true'
+                is_primary=request.form.get('is_primary', 'false').lower() == 'true',
+                status='pending'
             )
             
+            # Même contenu déjà traité : ses déclinaisons sont réutilisées
+            needs_processing = not copy_existing_variants(new_image)
+            
             db.session.add(new_image)
             db.session.commit()
             
+            image_data = {
+                "id": new_image.id,
+                "url": new_image.url,
+                "alt": new_image.alt,
+                "is_primary": new_image.is_primary,
+                "status": new_image.status
+            }
+            
+            # Déclinaisons (tailles, WebP/AVIF) produites en arrière-plan
+            if needs_processing:
+                image_pipeline.enqueue(new_image)
+            
             return jsonify({
                 "message": "Image uploadée avec succès",
-                "image": {
-                    "id": new_image.id,
-                    "url": new_image.url,
-                    "alt": new_image.alt,
-                    "is_primary": new_image.is_primary
-                }
+                "image": image_data
             }), 201
             
         except Exception as e:
@@ -502,17 +734,15 @@ def delete_image(image_id):
         # Récupération de l'image
         image = ProductImage.query.get_or_404(image_id)
         
-        # Chemin du fichier
-        file_path = os.path.join(current_app.root_path, 'static', image.url.lstrip('/static/'))
-        
-        # Suppression du fichier
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        url, variants = image.url, image.variants
         
         # Suppression de l'entrée dans la base de données
         db.session.delete(image)
         db.session.commit()
         
+        # Fichiers supprimés seulement s'ils ne servent plus à aucun produit
+        delete_product_image(url, variants)
+        
         return jsonify({"message": "Image supprimée avec succès"}), 200
         
     except Exception as e:
@@ -567,6 +797,8 @@ def set_primary_image(product_id, image_id):
 # ============================================================================
 
 @products_bp.route('/categories', methods=['GET'])
+@catalog_cached
+@cached_response(tags=['categories'])
 def get_categories():
     """Récupère la liste des catégories."""
     try:
@@ -576,6 +808,26 @@ def get_categories():
         current_app.logger.error(f"Erreur lors de la récupération des catégories: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@products_bp.route('/categories/tree', methods=['GET'])
+@catalog_cached
+@cached_response(tags=['categories'])
+def get_category_tree():
+    """Récupère l'arborescence complète des catégories (document préconstruit en mémoire)."""
+    try:
+        return current_app.response_class(category_tree.document(), mimetype='application/json'), 200
+    except Exception as e:
+        current_app.logger.error(f"Erreur lors de la récupération de l'arborescence: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@products_bp.route('/categories/featured', methods=['GET'])
+def get_featured_categories():
+    """Récupère les catégories mises en avant sur l'accueil (liste précalculée en mémoire)."""
+    try:
+        return current_app.response_class(featured_lists.categories_document(), mimetype='application/json'), 200
+    except Exception as e:
+        current_app.logger.error(f"Erreur lors de la récupération des catégories mises en avant: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @products_bp.route('/categories', methods=['POST'])
 @jwt_required()
 def create_category():
@@ -597,6 +849,7 @@ def create_category():
             image_url=data.get('image_url'),
             parent_id=data.get('parent_id')
         )
+        new_category.featured_position = data.get('featured_position')
         
         db.session.add(new_category)
         db.session.commit()
@@ -616,6 +869,8 @@ def create_category():
 # ============================================================================
 
 @products_bp.route('/brands', methods=['GET'])
+@catalog_cached
+@cached_response(tags=['brands'])
 def get_brands():
     """Récupère la liste des marques."""
     try:
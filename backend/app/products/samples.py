@@ -0,0 +1,41 @@
+# backend/app/products/samples.py
+
+"""
+Produits fictifs pour les bancs d'essai (serialization-bench,
+catalog-read-bench) : ajoutés dans la transaction courante, que
+l'appelant annule une fois la mesure faite.
+"""
+
+from app import db
+from app.products.models import Product, Category, Brand, ProductImage, ProductSpecification
+
+def add_sample_products(count, label="Banc d'essai"):
+    """
+    Ajoute des produits fictifs, avec une image et une spécification chacun (sans commit)
+
+    Args:
+        count (int): Nombre de produits
+        label (str): Nom de la catégorie et de la marque créées
+
+    Returns:
+        list: Produits ajoutés (flushés)
+    """
+    category = Category(label)
+    brand = Brand(label)
+    db.session.add_all([category, brand])
+    db.session.flush()
+
+    products = []
+    for index in range(count):
+        product = Product(
+            name=f"Produit de test {index}", sku=f"BENCH-{index:06d}", price=9.9 + index % 50,
+            category_id=category.id, brand_id=brand.id, stock_quantity=index % 20,
+            description="Cartouche d'encre compatible, rendement standard. " * 4
+        )
+        product.images.append(ProductImage(url=f"/static/images/products/bench-{index}.jpg", is_primary=True))
+        product.specifications.append(ProductSpecification(name='Couleur', value='Noir'))
+        products.append(product)
+
+    db.session.add_all(products)
+    db.session.flush()
+    return products
@@ -10,6 +10,8 @@ class CategorySchema(Schema):
     description = fields.Str()
     image_url = fields.Str()
     parent_id = fields.Int(allow_none=True)
+    path = fields.Str(dump_only=True)
+    featured_position = fields.Int(allow_none=True)
 
 class BrandSchema(Schema):
     """Schéma de validation pour les marques."""
@@ -28,6 +30,11 @@ class ProductImageSchema(Schema):
     alt = fields.Str()
     is_primary = fields.Bool()
     position = fields.Int()
+    status = fields.Str(dump_only=True)
+    width = fields.Int(dump_only=True)
+    height = fields.Int(dump_only=True)
+    variants = fields.Dict(dump_only=True)
+    srcset = fields.Dict(dump_only=True)
 
 class ProductSpecificationSchema(Schema):
     """Schéma de validation pour les spécifications produits."""
@@ -52,5 +59,10 @@ class ProductSchema(Schema):
     category_id = fields.Int(required=True)
     brand_id = fields.Int(required=True)
     is_active = fields.Bool()
+    featured_position = fields.Int(allow_none=True)
     images = fields.Nested(ProductImageSchema, many=True)
-    specifications = fields.Nested(ProductSpecificationSchema, many=True)
\ No newline at end of file
+    specifications = fields.Nested(ProductSpecificationSchema, many=True)
+    
+    # Relations incluses uniquement sur demande (?include=category,brand)
+    category = fields.Nested(CategorySchema, dump_only=True)
+    brand = fields.Nested(BrandSchema, dump_only=True)
\ No newline at end of file
@@ -0,0 +1,274 @@
+# backend/app/products/search.py
+
+"""
+Index plein texte des produits.
+
+SQLite : table virtuelle FTS5 synchronisée par les événements du mapper Product,
+classement BM25 et recherche par préfixe.
+PostgreSQL : index GIN sur l'expression tsvector, maintenu par la base elle-même.
+Les autres moteurs retombent sur l'ancienne recherche ILIKE.
+"""
+
+import re
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event, inspect, text, select
+from app import db
+from app.products.models import Product
+from app.utils.serializers import PRODUCT_COLUMNS
+
+# Configuration
+FTS_TABLE = 'products_fts'
+PG_INDEX = 'ix_products_search'
+
+# Colonnes indexées et poids BM25 associés (dans le même ordre)
+INDEXED_COLUMNS = ('name', 'sku', 'short_description', 'description')
+BM25_WEIGHTS = (10.0, 8.0, 3.0, 1.0)
+
+# Expression tsvector partagée entre l'index GIN et les requêtes PostgreSQL
+PG_DOCUMENT = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(sku, '') || ' ' || "
+    "coalesce(short_description, '') || ' ' || coalesce(description, ''))"
+)
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# ============================================================================
+#                         CRÉATION ET RECONSTRUCTION
+# ============================================================================
+
+def _dialect_name(bind=None):
+    """Retourne le nom du dialecte de la base courante."""
+    return (bind or db.engine).dialect.name
+
+def init_search_index():
+    """Crée l'index plein texte s'il n'existe pas encore.
+
+    Sous SQLite, la table FTS5 est remplie à partir des produits existants
+    lors de sa création.
+    """
+    dialect = _dialect_name()
+
+    if dialect == 'sqlite':
+        with db.engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': FTS_TABLE}
+            ).first()
+            if exists:
+                return
+
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"{', '.join(INDEXED_COLUMNS)}, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            ))
+            _populate_fts(conn)
+
+    elif dialect == 'postgresql':
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON products USING GIN ({PG_DOCUMENT})"
+            ))
+
+def rebuild_search_index():
+    """Reconstruit entièrement l'index plein texte.
+
+    Returns:
+        int: Nombre de produits indexés
+    """
+    dialect = _dialect_name()
+
+    with db.engine.begin() as conn:
+        if dialect == 'sqlite':
+            conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+            _populate_fts(conn)
+        elif dialect == 'postgresql':
+            conn.execute(text(f"REINDEX INDEX {PG_INDEX}"))
+
+        return conn.execute(text("SELECT COUNT(*) FROM products")).scalar()
+
+def _populate_fts(conn):
+    """Copie les colonnes indexées de tous les produits dans la table FTS5."""
+    columns = ', '.join(INDEXED_COLUMNS)
+    conn.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM products"
+    ))
+
+# ============================================================================
+#                         SYNCHRONISATION (SQLITE)
+# ============================================================================
+
+def _index_row(connection, product):
+    """Insère ou remplace la ligne FTS5 d'un produit."""
+    connection.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"),
+        {'id': product.id}
+    )
+    connection.execute(
+        text(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(INDEXED_COLUMNS)}) "
+            f"VALUES (:id, {', '.join(':' + column for column in INDEXED_COLUMNS)})"
+        ),
+        {'id': product.id, **{column: getattr(product, column) for column in INDEXED_COLUMNS}}
+    )
+
+@event.listens_for(Product, 'after_insert')
+def _product_inserted(mapper, connection, product):
+    if connection.dialect.name == 'sqlite':
+        _index_row(connection, product)
+
+@event.listens_for(Product, 'after_update')
+def _product_updated(mapper, connection, product):
+    if connection.dialect.name != 'sqlite':
+        return
+
+    # Pas de réindexation si aucune colonne indexée n'a changé (ex: stock)
+    state = inspect(product)
+    if any(state.attrs[column].history.has_changes() for column in INDEXED_COLUMNS):
+        _index_row(connection, product)
+
+@event.listens_for(Product, 'after_delete')
+def _product_deleted(mapper, connection, product):
+    if connection.dialect.name == 'sqlite':
+        connection.execute(
+            text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"),
+            {'id': product.id}
+        )
+
+def reindex_products(connection, product_ids):
+    """Réindexe des produits écrits hors ORM (insertions / mises à jour en masse)."""
+    if connection.dialect.name != 'sqlite' or not product_ids:
+        return
+
+    ids = ', '.join(str(int(i)) for i in product_ids)
+    columns = ', '.join(INDEXED_COLUMNS)
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({ids})"))
+    connection.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM products WHERE id IN ({ids})"
+    ))
+
+def unindex_products(connection, product_ids):
+    """Retire de l'index des produits supprimés hors ORM (DELETE en masse)."""
+    if connection.dialect.name == 'sqlite' and product_ids:
+        connection.execute(
+            text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(str(int(i)) for i in product_ids)})")
+        )
+
+# ============================================================================
+#                         RECHERCHE
+# ============================================================================
+
+def search_product_ids(query, limit=20):
+    """Recherche les produits actifs correspondant à tous les mots de la requête.
+
+    Chaque mot est recherché par préfixe ("302" trouve "302XL").
+
+    Args:
+        query (str): Texte saisi par l'utilisateur
+        limit (int): Nombre maximum de résultats
+
+    Returns:
+        list: IDs des produits, du plus pertinent au moins pertinent
+    """
+    tokens = TOKEN_PATTERN.findall(query.lower())
+    if not tokens:
+        return []
+
+    dialect = _dialect_name()
+
+    if dialect == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+        rows = db.session.execute(
+            text(
+                f"SELECT {FTS_TABLE}.rowid FROM {FTS_TABLE} "
+                f"JOIN products ON products.id = {FTS_TABLE}.rowid "
+                f"WHERE {FTS_TABLE} MATCH :match AND products.is_active = 1 "
+                f"ORDER BY bm25({FTS_TABLE}, {weights}) "
+                "LIMIT :limit"
+            ),
+            {'match': match, 'limit': limit}
+        )
+        return [row[0] for row in rows]
+
+    if dialect == 'postgresql':
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+        rows = db.session.execute(
+            text(
+                "SELECT id FROM products "
+                f"WHERE is_active AND {PG_DOCUMENT} @@ to_tsquery('simple', :tsquery) "
+                f"ORDER BY ts_rank_cd({PG_DOCUMENT}, to_tsquery('simple', :tsquery)) DESC "
+                "LIMIT :limit"
+            ),
+            {'tsquery': tsquery, 'limit': limit}
+        )
+        return [row[0] for row in rows]
+
+    # Autres moteurs : recherche ILIKE sans index
+    search_query = db.session.query(Product.id).filter(Product.is_active == True)
+    for token in tokens:
+        search_term = f"%{token}%"
+        search_query = search_query.filter(
+            (Product.name.ilike(search_term)) |
+            (Product.sku.ilike(search_term)) |
+            (Product.short_description.ilike(search_term)) |
+            (Product.description.ilike(search_term))
+        )
+    return [row[0] for row in search_query.limit(limit)]
+
+def find_products(query, limit=20, options=()):
+    """Recherche les produits et les retourne dans l'ordre de pertinence.
+
+    Args:
+        query (str): Texte saisi par l'utilisateur
+        limit (int): Nombre maximum de résultats
+        options (iterable): Options de chargement à appliquer à la requête
+
+    Returns:
+        list: Instances Product classées
+    """
+    ids = search_product_ids(query, limit=limit)
+    if not ids:
+        return []
+
+    products = {
+        product.id: product
+        for product in Product.query.options(*options).filter(Product.id.in_(ids))
+    }
+    return [products[product_id] for product_id in ids if product_id in products]
+
+def find_product_rows(query, limit=20, columns=None):
+    """Comme find_products, en lignes de requête (sans instances Product).
+
+    Args:
+        query (str): Texte saisi par l'utilisateur
+        limit (int): Nombre maximum de résultats
+        columns (iterable): Colonnes à lire, id compris (PRODUCT_COLUMNS par défaut)
+
+    Returns:
+        list: Lignes classées par pertinence
+    """
+    ids = search_product_ids(query, limit=limit)
+    if not ids:
+        return []
+
+    rows = {row.id: row for row in db.session.execute(
+        select(*(columns or PRODUCT_COLUMNS)).where(Product.id.in_(ids))
+    )}
+    return [rows[product_id] for product_id in ids if product_id in rows]
+
+# ============================================================================
+#                         COMMANDES CLI
+# ============================================================================
+
+search_cli = AppGroup('search', help="Gestion de l'index de recherche des produits.")
+
+@search_cli.command('rebuild')
+def rebuild_command():
+    """Reconstruit l'index plein texte des produits."""
+    init_search_index()
+    count = rebuild_search_index()
+    current_app.logger.info(f"Index de recherche reconstruit ({count} produits)")
+    click.echo(f"Index de recherche reconstruit : {count} produits indexés.")
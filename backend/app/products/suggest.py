@@ -0,0 +1,270 @@
+# backend/app/products/suggest.py
+
+"""
+Moteur d'autocomplétion en mémoire pour la barre de recherche.
+
+Les références (SKU), noms de produits et noms de marques sont normalisés puis
+rangés dans un tableau trié ; une recherche de préfixe est une simple
+dichotomie (bisect). Seule la version du catalogue (app.utils.http_cache)
+est relue : l'index est reconstruit quand un autre processus a modifié le
+catalogue, les modifications locales étant appliquées au commit.
+"""
+
+import re
+import threading
+from bisect import bisect_left, insort
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.products.models import Product, Brand
+from app.utils.http_cache import current_catalog_version
+
+# Configuration
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+# Nombre d'entrées examinées par suggestion demandée avant classement
+SCAN_FACTOR = 8
+
+# Priorité d'affichage par type d'entrée (plus petit = plus haut)
+KIND_PRIORITY = {'brand': 0, 'sku': 1, 'name': 2}
+
+NORMALIZE_PATTERN = re.compile(r'[^0-9a-z]+')
+
+def normalize(value):
+    """Normalise une saisie : minuscules, sans espaces ni ponctuation.
+
+    "HP 302XL", "hp-302xl" et "HP302XL" donnent tous "hp302xl".
+    """
+    return NORMALIZE_PATTERN.sub('', (value or '').lower())
+
+# ============================================================================
+#                         INDEX DE SUGGESTIONS
+# ============================================================================
+
+class SuggestionIndex:
+    """Tableau trié de clés normalisées pointant vers des suggestions."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = []          # [(clé, type, id)] trié
+        self._owned_keys = {}    # (cible, id) -> [(clé, type, id)]
+        self._products = {}      # id -> données produit
+        self._brands = {}        # id -> nom de la marque
+        self._version = None     # version du catalogue de la dernière construction
+
+    # ------------------------------------------------------------------
+    #   Construction
+    # ------------------------------------------------------------------
+
+    def build(self):
+        """Reconstruit l'index à partir de la base (au démarrage, puis à chaque nouvelle version)."""
+        version = current_catalog_version()[0]
+        products = db.session.query(
+            Product.id, Product.name, Product.sku, Product.slug, Product.brand_id
+        ).filter(Product.is_active == True).all()
+        brands = db.session.query(Brand.id, Brand.name).all()
+
+        with self._lock:
+            self._keys = []
+            self._owned_keys = {}
+            self._products = {}
+            self._brands = {}
+
+            for brand in brands:
+                self._add_brand(brand.id, brand.name)
+            for product in products:
+                self._add_product(product._asdict())
+
+            self._keys.sort()
+            self._version = version
+
+    def _own(self, owner, entries):
+        self._owned_keys[owner] = entries
+        for entry in entries:
+            insort(self._keys, entry)
+
+    def _drop(self, owner):
+        for entry in self._owned_keys.pop(owner, []):
+            position = bisect_left(self._keys, entry)
+            if position < len(self._keys) and self._keys[position] == entry:
+                del self._keys[position]
+
+    def _add_product(self, product):
+        entries = set()
+
+        sku_key = normalize(product['sku'])
+        if sku_key:
+            entries.add((sku_key, 'sku', product['id']))
+
+        # Une clé par début de mot : "302" trouve "HP 302XL Noir"
+        words = (product['name'] or '').split()
+        for start in range(len(words)):
+            name_key = normalize(' '.join(words[start:]))
+            if name_key:
+                entries.add((name_key, 'name', product['id']))
+
+        self._products[product['id']] = product
+        self._own(('product', product['id']), sorted(entries))
+
+    def _add_brand(self, brand_id, name):
+        self._brands[brand_id] = name
+        key = normalize(name)
+        self._own(('brand', brand_id), [(key, 'brand', brand_id)] if key else [])
+
+    # ------------------------------------------------------------------
+    #   Mises à jour incrémentales
+    # ------------------------------------------------------------------
+
+    def upsert_product(self, product):
+        """Ajoute ou remplace un produit (dict id, name, sku, slug, brand_id, is_active)."""
+        with self._lock:
+            self._drop(('product', product['id']))
+            self._products.pop(product['id'], None)
+            if product.get('is_active', True):
+                self._add_product(product)
+
+    def remove_product(self, product_id):
+        """Retire un produit de l'index."""
+        with self._lock:
+            self._drop(('product', product_id))
+            self._products.pop(product_id, None)
+
+    def upsert_brand(self, brand_id, name):
+        """Ajoute ou renomme une marque."""
+        with self._lock:
+            self._drop(('brand', brand_id))
+            self._add_brand(brand_id, name)
+
+    def remove_brand(self, brand_id):
+        """Retire une marque de l'index."""
+        with self._lock:
+            self._drop(('brand', brand_id))
+            self._brands.pop(brand_id, None)
+
+    # ------------------------------------------------------------------
+    #   Recherche
+    # ------------------------------------------------------------------
+
+    def suggest(self, query, limit=DEFAULT_LIMIT):
+        """Retourne les meilleures complétions pour un préfixe.
+
+        Args:
+            query (str): Début de saisie
+            limit (int): Nombre maximum de suggestions
+
+        Returns:
+            list: Suggestions (dict) classées marques, références puis noms
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        with self._lock:
+            if current_catalog_version()[0] != self._version:
+                self.build()
+
+            candidates = []
+            position = bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(candidates) < limit * SCAN_FACTOR:
+                entry = self._keys[position]
+                if not entry[0].startswith(prefix):
+                    break
+                candidates.append(entry)
+                position += 1
+
+            # Marques, puis correspondance exacte, puis clés les plus courtes
+            candidates.sort(key=lambda entry: (
+                KIND_PRIORITY[entry[1]], entry[0] != prefix, len(entry[0])
+            ))
+
+            suggestions = []
+            seen = set()
+            for key, kind, target_id in candidates:
+                target = ('brand' if kind == 'brand' else 'product', target_id)
+                if target in seen:
+                    continue
+                seen.add(target)
+                suggestions.append(self._payload(kind, target_id))
+                if len(suggestions) >= limit:
+                    break
+
+            return suggestions
+
+    def _payload(self, kind, target_id):
+        if kind == 'brand':
+            return {'type': 'brand', 'id': target_id, 'label': self._brands.get(target_id)}
+
+        product = self._products[target_id]
+        return {
+            'type': 'product',
+            'id': product['id'],
+            'label': product['name'],
+            'sku': product['sku'],
+            'slug': product['slug'],
+            'brand': self._brands.get(product['brand_id'])
+        }
+
+suggestion_index = SuggestionIndex()
+
+# ============================================================================
+#                         SYNCHRONISATION
+# ============================================================================
+
+# Les modifications sont mémorisées pendant le flush puis appliquées au commit,
+# pour qu'un rollback ne laisse pas de suggestion fantôme.
+PENDING_KEY = 'suggest_pending'
+
+def queue_suggestion_update(operation, value, session=None):
+    """Programme une mise à jour de l'index au commit (modifications hors ORM)."""
+    (session or db.session).info.setdefault(PENDING_KEY, []).append((operation, value))
+
+def _remember(target, operation):
+    session = object_session(target)
+    if session is not None:
+        queue_suggestion_update(*operation, session=session)
+
+def _product_snapshot(product):
+    return {
+        'id': product.id,
+        'name': product.name,
+        'sku': product.sku,
+        'slug': product.slug,
+        'brand_id': product.brand_id,
+        'is_active': product.is_active
+    }
+
+@event.listens_for(Product, 'after_insert')
+@event.listens_for(Product, 'after_update')
+def _product_saved(mapper, connection, product):
+    _remember(product, ('product', _product_snapshot(product)))
+
+@event.listens_for(Product, 'after_delete')
+def _product_deleted(mapper, connection, product):
+    _remember(product, ('product_deleted', product.id))
+
+@event.listens_for(Brand, 'after_insert')
+@event.listens_for(Brand, 'after_update')
+def _brand_saved(mapper, connection, brand):
+    _remember(brand, ('brand', (brand.id, brand.name)))
+
+@event.listens_for(Brand, 'after_delete')
+def _brand_deleted(mapper, connection, brand):
+    _remember(brand, ('brand_deleted', brand.id))
+
+@event.listens_for(Session, 'after_commit')
+def _apply_pending(session):
+    for operation, value in session.info.pop(PENDING_KEY, []):
+        if operation == 'product':
+            suggestion_index.upsert_product(value)
+        elif operation == 'product_deleted':
+            suggestion_index.remove_product(value)
+        elif operation == 'brand':
+            suggestion_index.upsert_brand(*value)
+        elif operation == 'brand_deleted':
+            suggestion_index.remove_brand(value)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
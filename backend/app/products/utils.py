@@ -2,11 +2,16 @@
 
 import os
 import uuid
+import hashlib
+import tempfile
 from datetime import datetime
 from PIL import Image
 from flask import current_app
 from werkzeug.utils import secure_filename
-from app.products.models import Product, Category, Brand
+from sqlalchemy.orm import selectinload, joinedload
+from app import db
+from app.products.models import Product, Category, Brand, ProductImage
+from app.utils.stock import adjust_stock
 # Configuration
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 IMAGE_SIZES = {
@@ -15,6 +20,11 @@ IMAGE_SIZES = {
     'large': (800, 800)
 }
 
+# Images stockées sous le SHA-256 de leur contenu : sha256/ab/cd/abcd....jpg
+PRODUCT_IMAGES_URL = '/static/images/products'
+CONTENT_FOLDER = 'sha256'
+IMAGE_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp'}
+
 def allowed_file(filename):
     """Vérifie si l'extension du fichier est autorisée.
     
@@ -135,22 +145,173 @@ def save_product_image(file):
     except Exception as e:
         raise ValueError(f'Erreur lors de la sauvegarde de l\'image: {str(e)}')
 
-def delete_product_image(url):
+def product_images_folder():
+    """Dossier disque des images produits (static/images/products)."""
+    return os.path.join(current_app.root_path, 'static', 'images', 'products')
+
+def static_file_path(url):
+    """Chemin disque d'une URL /static/..."""
+    prefix = '/static/'
+    relative = url[len(prefix):] if url.startswith(prefix) else url.lstrip('/')
+    return os.path.join(current_app.root_path, 'static', relative)
+
+def image_file_paths(url, variants=None):
+    """Chemins de l'original et de toutes ses déclinaisons."""
+    paths = [static_file_path(url)]
+    for formats in (variants or {}).values():
+        paths.extend(static_file_path(variant['url']) for variant in formats.values())
+    return paths
+
+def store_image_content(file):
+    """Enregistre une image sous le SHA-256 de son contenu.
+
+    Le fichier est écrit une seule fois quel que soit le nombre de produits
+    qui l'utilisent ; son URL ne change jamais et peut être mise en cache
+    sans limite par les navigateurs.
+
+    Args:
+        file: Objet fichier uploadé
+
+    Returns:
+        str: URL de l'image (/static/images/products/sha256/ab/cd/<sha256>.<ext>)
+
+    Raises:
+        ValueError: Le fichier n'est pas une image d'un format autorisé
+    """
+    temp_folder = os.path.join(product_images_folder(), CONTENT_FOLDER, 'tmp')
+    os.makedirs(temp_folder, exist_ok=True)
+
+    # Copie en flux avec calcul de l'empreinte
+    digest = hashlib.sha256()
+    fd, temp_path = tempfile.mkstemp(dir=temp_folder)
     try:
-        # Chemin du fichier
-        file_path = os.path.join(current_app.root_path, 'static', url.lstrip('/static/'))
-        
-        # Vérifier si le fichier existe avant de tenter de le supprimer
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            return True
+        with os.fdopen(fd, 'wb') as output:
+            for chunk in iter(lambda: file.stream.read(64 * 1024), b''):
+                digest.update(chunk)
+                output.write(chunk)
+
+        try:
+            with Image.open(temp_path) as image:
+                extension = IMAGE_EXTENSIONS.get(image.format)
+        except Exception:
+            extension = None
+        if extension is None:
+            raise ValueError("Le fichier n'est pas une image valide")
+
+        sha = digest.hexdigest()
+        relative = f"{CONTENT_FOLDER}/{sha[:2]}/{sha[2:4]}/{sha}.{extension}"
+        path = os.path.join(product_images_folder(), relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if os.path.exists(path):
+            os.remove(temp_path)
         else:
-            current_app.logger.warning(f"Fichier image introuvable: {file_path}")
-            return False
+            os.replace(temp_path, path)
+        return f"{PRODUCT_IMAGES_URL}/{relative}"
+
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def unreferenced_image_paths(images):
+    """Fichiers d'images dont plus aucune ProductImage n'utilise l'URL.
+
+    À appeler après la suppression (flush) des lignes concernées.
+
+    Args:
+        images (iterable): Couples (url, variants) des images supprimées
+
+    Returns:
+        list: Chemins des originaux et déclinaisons à supprimer
+    """
+    images = {url: variants for url, variants in images}
+    if not images:
+        return []
+
+    referenced = {
+        row.url for row in db.session.query(ProductImage.url)
+        .filter(ProductImage.url.in_(images)).distinct()
+    }
+    return [
+        path
+        for url, variants in images.items() if url not in referenced
+        for path in image_file_paths(url, variants)
+    ]
+
+def delete_product_image(url, variants=None):
+    """Supprime les fichiers d'une image si plus aucune ProductImage ne la référence.
+
+    Args:
+        url (str): URL de l'original
+        variants (dict): Déclinaisons de l'image
+
+    Returns:
+        bool: True si les fichiers ont été supprimés
+    """
+    try:
+        paths = unreferenced_image_paths([(url, variants)])
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        return bool(paths)
     except Exception as e:
         current_app.logger.error(f"Erreur lors de la suppression de l'image: {str(e)}")
         return False
 
+def product_loading_options(include=()):
+    """Options de chargement anticipé pour sérialiser des listes de produits.
+    
+    Les images et spécifications sont chargées en une requête IN chacune
+    pour toute la page au lieu d'un SELECT par produit.
+    
+    Args:
+        include (iterable): Relations supplémentaires ('category', 'brand')
+        
+    Returns:
+        list: Options à passer à query.options()
+    """
+    options = [
+        selectinload(Product.images),
+        selectinload(Product.specifications)
+    ]
+    
+    if 'category' in include:
+        options.append(joinedload(Product.category))
+    if 'brand' in include:
+        options.append(joinedload(Product.brand))
+        
+    return options
+
+def parse_include(value):
+    """Extrait les relations demandées via le paramètre ?include=category,brand.
+    
+    Args:
+        value (str): Valeur brute du paramètre
+        
+    Returns:
+        tuple: Relations reconnues, dans un ordre stable
+    """
+    requested = {part.strip() for part in (value or '').split(',')}
+    return tuple(name for name in ('category', 'brand') if name in requested)
+
+def parse_id_list(value):
+    """Extrait une liste d'IDs d'un paramètre ?category_ids=1,2,3.
+    
+    Args:
+        value (str): Valeur brute du paramètre
+        
+    Returns:
+        list: IDs entiers (liste vide si le paramètre est absent)
+        
+    Raises:
+        ValueError: Si une valeur n'est pas un entier
+    """
+    try:
+        return [int(part) for part in (value or '').split(',') if part.strip()]
+    except ValueError:
+        raise ValueError('Liste d\'IDs invalide')
+
 def get_product_stock_status(product):
     """Détermine le statut du stock d'un produit.
     
@@ -174,6 +335,10 @@ def get_product_stock_status(product):
 def update_product_stock(product, quantity, operation='subtract'):
     """Met à jour le stock d'un produit.
     
+    La variation est appliquée par un UPDATE conditionnel (voir
+    app.utils.stock.adjust_stock) : un retrait n'a lieu que si le stock est
+    suffisant au moment de l'écriture, même avec des accès concurrents.
+    
     Args:
         product: Instance du modèle Product
         quantity (int): Quantité à ajouter ou soustraire
@@ -183,13 +348,12 @@ def update_product_stock(product, quantity, operation='subtract'):
         bool: True si la mise à jour est réussie
     """
     try:
-        if operation == 'subtract':
-            if product.stock_quantity < quantity:
-                raise ValueError('Stock insuffisant')
-            product.stock_quantity -= quantity
-        else:
-            product.stock_quantity += quantity
-            
+        delta = -quantity if operation == 'subtract' else quantity
+        if not adjust_stock(product.id, delta):
+            raise ValueError('Stock insuffisant')
+
+        # Relire la valeur calculée par la base au prochain accès
+        db.session.expire(product, ['stock_quantity'])
         return True
         
     except Exception as e:
@@ -0,0 +1,342 @@
+# backend/app/utils/assets.py
+
+"""
+Chaîne de construction des fichiers statiques (CSS / JS).
+
+`flask assets build` parcourt les pages HTML du frontend et repère les
+suites de balises consécutives :
+  - <link rel="stylesheet" href="/static/....css">
+  - <script src="/static/....js"></script> (scripts classiques)
+
+Chaque suite devient un seul fichier concaténé et minifié, nommé d'après
+l'empreinte de son contenu (static/dist/<nom>.<empreinte>.<ext>), avec ses
+versions précompressées .gz (et .br si le paquet brotli est installé).
+Le manifeste (static/dist/manifest.json) associe chaque suite à son fichier.
+
+Au service des pages, les suites connues du manifeste sont remplacées par
+une seule balise. Les fichiers de dist/ sont servis selon Accept-Encoding,
+avec un cache immuable : leur URL change avec leur contenu.
+
+Les modules ES (type="module") ne sont pas regroupés : leurs imports
+relatifs (./config.js) ne fonctionneraient plus depuis dist/.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+from functools import lru_cache
+import click
+from flask import current_app, request, send_from_directory, abort
+from flask.cli import AppGroup
+
+DIST_FOLDER = 'dist'
+MANIFEST_NAME = 'manifest.json'
+STATIC_URL = '/static'
+
+# Cache des fichiers à empreinte (1 an, jamais revalidés)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Encodages précompressés, par ordre de préférence : (encodage, extension)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# type -> (balise à regrouper, balise produite)
+TAGS = {
+    'css': (
+        re.compile(r'<link\s+rel=["\']stylesheet["\']\s+href=["\'](/static/[^"\'?#]+\.css)["\']\s*/?>', re.I),
+        '<link rel="stylesheet" href="{url}">'
+    ),
+    'js': (
+        re.compile(r'<script\s+src=["\'](/static/[^"\'?#]+\.js)["\']\s*>\s*</script>', re.I),
+        '<script src="{url}"></script>'
+    )
+}
+
+# ============================================================================
+#                         MINIFICATION
+# ============================================================================
+
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+CSS_SPACES = re.compile(r'\s+')
+CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+CSS_URL = re.compile(r'url\(\s*(["\']?)([^"\')]+)\1\s*\)')
+
+def minify_css(text):
+    """Supprime commentaires et espaces superflus (sans toucher aux ':')."""
+    text = CSS_COMMENT.sub('', text)
+    text = CSS_SPACES.sub(' ', text)
+    text = CSS_PUNCTUATION.sub(r'\1', text)
+    return text.replace(';}', '}').strip()
+
+def minify_js(text):
+    """Minifie avec rjsmin s'il est installé, sinon retire les lignes vides."""
+    try:
+        import rjsmin
+        return rjsmin.jsmin(text)
+    except ImportError:
+        return '\n'.join(line.rstrip() for line in text.splitlines() if line.strip())
+
+def absolute_css_urls(text, source_url):
+    """Rend absolues les url() relatives d'une feuille déplacée dans dist/."""
+    base = posixpath.dirname(source_url)
+
+    def replace(match):
+        quote, url = match.groups()
+        if url.startswith(('/', 'data:', 'http:', 'https:', '#')):
+            return match.group(0)
+        return f"url({quote}{posixpath.normpath(posixpath.join(base, url))}{quote})"
+
+    return CSS_URL.sub(replace, text)
+
+# ============================================================================
+#                         PAGES HTML
+# ============================================================================
+
+def find_runs(html, kind):
+    """
+    Suites de balises consécutives (séparées par des blancs) d'un type
+
+    Returns:
+        list: [(début, fin, [urls])] dans l'ordre du document
+    """
+    pattern = TAGS[kind][0]
+    runs = []
+    for match in pattern.finditer(html):
+        url = match.group(1)
+        if url.startswith(f"{STATIC_URL}/{DIST_FOLDER}/"):
+            continue
+        if runs and not html[runs[-1][1]:match.start()].strip():
+            start, _, urls = runs[-1]
+            runs[-1] = (start, match.end(), urls + [url])
+        else:
+            runs.append((match.start(), match.end(), [url]))
+    return runs
+
+def run_key(kind, urls):
+    return f"{kind}:" + '|'.join(urls)
+
+def html_files(pages_folder, static_folder):
+    """Pages HTML du frontend (hors dossier static)."""
+    static_folder = os.path.abspath(static_folder)
+    for root, dirs, files in os.walk(pages_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.abspath(os.path.join(root, d)) != static_folder)
+        for name in sorted(files):
+            if name.endswith('.html'):
+                yield os.path.join(root, name)
+
+# ============================================================================
+#                         CONSTRUCTION
+# ============================================================================
+
+def _brotli():
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+def _source_path(static_folder, url):
+    return os.path.join(static_folder, *url[len(STATIC_URL) + 1:].split('/'))
+
+def _bundle_content(static_folder, kind, urls):
+    """
+    Contenu concaténé et minifié d'une suite
+
+    Un fichier absent est ignoré : la balise d'origine ne chargeait rien.
+
+    Returns:
+        tuple: (contenu ou None si aucun fichier n'existe, URLs absentes)
+    """
+    parts = []
+    missing = []
+    for url in urls:
+        path = _source_path(static_folder, url)
+        if not os.path.isfile(path):
+            missing.append(url)
+            continue
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        parts.append(absolute_css_urls(text, url) if kind == 'css' else text)
+
+    if not parts:
+        return None, missing
+    if kind == 'css':
+        return '\n'.join(minify_css(part) for part in parts), missing
+    # ";" : un fichier sans point-virgule final ne doit pas se souder au suivant
+    return '\n;\n'.join(minify_js(part) for part in parts), missing
+
+def _write_compressed(path, data, brotli):
+    """Écrit les versions .gz / .br quand elles sont plus petites."""
+    written = []
+    compressed = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed['.br'] = brotli.compress(data, quality=11)
+
+    for extension, content in compressed.items():
+        if len(content) < len(data):
+            with open(path + extension, 'wb') as f:
+                f.write(content)
+            written.append(extension)
+    return written
+
+def build_assets(static_folder, pages_folder):
+    """
+    Construit static/dist et son manifeste
+
+    Args:
+        static_folder (str): Dossier static du frontend
+        pages_folder (str): Dossier des pages HTML
+
+    Returns:
+        dict: {bundles, files, bytes, missing}
+    """
+    dist_folder = os.path.join(static_folder, DIST_FOLDER)
+    shutil.rmtree(dist_folder, ignore_errors=True)
+    os.makedirs(dist_folder)
+    brotli = _brotli()
+
+    manifest = {}
+    files = {}
+    missing = set()
+    total = 0
+
+    for page in html_files(pages_folder, static_folder):
+        with open(page, encoding='utf-8') as f:
+            html = f.read()
+
+        for kind in TAGS:
+            for _, _, urls in find_runs(html, kind):
+                key = run_key(kind, urls)
+                if key in manifest:
+                    continue
+
+                content, absent = _bundle_content(static_folder, kind, urls)
+                missing.update(absent)
+                if content is None:
+                    continue
+
+                data = content.encode('utf-8')
+                digest = hashlib.sha256(data).hexdigest()[:16]
+                stem = os.path.splitext(posixpath.basename(urls[0]))[0]
+                if len(urls) > 1:
+                    stem += f"+{len(urls) - 1}"
+                filename = f"{stem}.{digest}.{kind}"
+
+                if filename not in files:
+                    path = os.path.join(dist_folder, filename)
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                    files[filename] = _write_compressed(path, data, brotli)
+                    total += len(data)
+
+                manifest[key] = f"{STATIC_URL}/{DIST_FOLDER}/{filename}"
+
+    with open(os.path.join(dist_folder, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return {'bundles': len(manifest), 'files': files, 'bytes': total, 'missing': sorted(missing)}
+
+# ============================================================================
+#                         SERVICE
+# ============================================================================
+
+class AssetManifest:
+    """Manifeste chargé au démarrage et réécriture des pages HTML."""
+
+    def __init__(self):
+        self.bundles = {}
+
+    def init_app(self, app):
+        self.bundles = {}
+        path = os.path.join(app.static_folder, DIST_FOLDER, MANIFEST_NAME)
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.bundles = json.load(f)
+            except (OSError, ValueError) as e:
+                app.logger.warning(f"Manifeste des fichiers statiques illisible: {str(e)}")
+
+        self.rewrite.cache_clear()
+        app.after_request(self.rewrite_response)
+
+    @lru_cache(maxsize=128)
+    def rewrite(self, html):
+        """Remplace les suites de balises connues du manifeste."""
+        replacements = []
+        for kind, (_, template) in TAGS.items():
+            for start, end, urls in find_runs(html, kind):
+                url = self.bundles.get(run_key(kind, urls))
+                if url:
+                    replacements.append((start, end, template.format(url=url)))
+
+        for start, end, tag in sorted(replacements, reverse=True):
+            html = html[:start] + tag + html[end:]
+        return html
+
+    def rewrite_response(self, response):
+        """Réécrit les pages HTML servies (after_request)."""
+        if (not self.bundles or request.method != 'GET'
+                or response.status_code != 200 or response.mimetype != 'text/html'):
+            return response
+
+        response.direct_passthrough = False
+        html = response.get_data(as_text=True)
+        rewritten = self.rewrite(html)
+        if rewritten != html:
+            response.set_data(rewritten)
+            # L'ETag du fichier HTML ne reflète pas les URLs à empreinte
+            del response.headers['ETag']
+            del response.headers['Last-Modified']
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+asset_manifest = AssetManifest()
+
+def send_asset(filename):
+    """
+    Sert un fichier de static/dist selon Accept-Encoding
+
+    Returns:
+        Response: Version .br / .gz si acceptée et présente, sinon l'originale
+    """
+    dist_folder = os.path.join(current_app.static_folder, DIST_FOLDER)
+    if filename == MANIFEST_NAME or filename.endswith(tuple(extension for _, extension in ENCODINGS)):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    for encoding, extension in ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(dist_folder, filename + extension)):
+            response = send_from_directory(dist_folder, filename + extension, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(dist_folder, filename, mimetype=mimetype)
+
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+# ============================================================================
+#                         COMMANDES CLI
+# ============================================================================
+
+assets_cli = AppGroup('assets', help='Fichiers statiques regroupés et à empreinte.')
+
+@assets_cli.command('build')
+def build_command():
+    """Regroupe, minifie et précompresse les CSS / JS des pages."""
+    result = build_assets(current_app.static_folder, current_app.template_folder)
+
+    for url in result['missing']:
+        click.echo(f"Fichier introuvable (ignoré): {url}")
+    compressed = sorted({extension for extensions in result['files'].values() for extension in extensions})
+    click.echo(
+        f"{result['bundles']} suite(s) -> {len(result['files'])} fichier(s), "
+        f"{result['bytes']} octets ({', '.join(compressed) or 'sans compression'})."
+    )
+    if _brotli() is None:
+        click.echo("Paquet brotli non installé : pas de version .br.")
@@ -0,0 +1,264 @@
+# backend/app/utils/compression.py
+
+"""
+Compression des réponses (middleware WSGI).
+
+Les réponses JSON et HTML (types de COMPRESSION_LEVELS) sont compressées
+en brotli (si le paquet est installé et accepté par le client) ou en gzip :
+  - réponse de taille connue : compressée d'un bloc si elle dépasse
+    COMPRESSION_MIN_SIZE, avec un nouveau Content-Length ;
+  - réponse en flux (générateur, sans Content-Length) : chaque bloc est
+    compressé et vidé aussitôt, le flux reste progressif.
+
+Les réponses déjà encodées (fichiers .gz / .br de static/dist), partielles,
+sans corps ou marquées no-transform sont transmises telles quelles.
+L'ETag d'une réponse compressée devient faible (W/"...") : la
+représentation n'est plus identique octet pour octet.
+"""
+
+import time
+import zlib
+import click
+from flask import current_app
+from werkzeug.http import parse_accept_header
+
+# ============================================================================
+#                         ENCODEURS
+# ============================================================================
+
+def _brotli():
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+class GzipStream:
+    """Compression gzip par blocs (vidage à chaque bloc)."""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+class BrotliStream:
+    """Compression brotli par blocs (vidage à chaque bloc)."""
+
+    def __init__(self, level):
+        self._compressor = _brotli().Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+STREAMS = {'br': BrotliStream, 'gzip': GzipStream}
+
+def compress(data, encoding, level):
+    """Compresse un corps complet."""
+    if encoding == 'br':
+        return _brotli().compress(data, quality=level)
+    return zlib.compress(data, level, wbits=31)
+
+# ============================================================================
+#                         MIDDLEWARE
+# ============================================================================
+
+class CompressionMiddleware:
+    """
+    Middleware WSGI de compression
+
+    Args:
+        app: Application WSGI enveloppée (app.wsgi_app)
+        levels (dict): {type MIME: {encodage: niveau}} (gzip 1-9, br 0-11)
+        min_size (int): Taille minimale d'une réponse de taille connue
+    """
+
+    def __init__(self, app, levels, min_size=1024):
+        self.app = app
+        self.levels = levels
+        self.min_size = min_size
+        self.encodings = ('br', 'gzip') if _brotli() is not None else ('gzip',)
+
+    def negotiate(self, environ):
+        """Encodage retenu pour la requête (None : pas de compression)."""
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return None
+        accepted = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        for encoding in self.encodings:
+            if accepted[encoding]:
+                return encoding
+        return None
+
+    def level(self, headers, encoding):
+        """Niveau de compression pour les en-têtes d'une réponse (None : aucune)."""
+        values = {name.lower(): value for name, value in headers}
+        if 'content-encoding' in values or 'no-transform' in values.get('cache-control', ''):
+            return None
+        mimetype = values.get('content-type', '').split(';')[0].strip().lower()
+        return self.levels.get(mimetype, {}).get(encoding)
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ)
+        if encoding is None:
+            return self.app(environ, start_response)
+        return CompressedBody(self, environ, start_response, encoding)
+
+class CompressedBody:
+    """Corps de réponse WSGI : décide de la compression au premier bloc."""
+
+    def __init__(self, middleware, environ, start_response, encoding):
+        self.middleware = middleware
+        self.environ = environ
+        self.start_response = start_response
+        self.encoding = encoding
+        self.app_iter = None
+
+    def close(self):
+        # Indispensable à stream_with_context (fin du contexte de requête)
+        if hasattr(self.app_iter, 'close'):
+            self.app_iter.close()
+
+    def __iter__(self):
+        state = {'written': []}
+
+        def capture(status, headers, exc_info=None):
+            state.update(status=status, headers=headers, exc_info=exc_info)
+            return state['written'].append
+
+        self.app_iter = self.middleware.app(self.environ, capture)
+        chunks = iter(self.app_iter)
+        pending = state['written']
+
+        # Application qui n'appelle start_response qu'au premier bloc
+        if 'status' not in state:
+            for chunk in chunks:
+                pending.append(chunk)
+                if 'status' in state:
+                    break
+
+        status, headers = state['status'], state['headers']
+        level = self._level(status, headers)
+        length = next((value for name, value in headers if name.lower() == 'content-length'), None)
+
+        if level is None or (length is not None and int(length) < self.middleware.min_size):
+            self.start_response(status, headers, state['exc_info'])
+            yield from pending
+            yield from chunks
+            return
+
+        if length is not None:
+            yield from self._buffered(status, headers, pending, chunks, level, state['exc_info'])
+        else:
+            yield from self._streamed(status, headers, pending, chunks, level, state['exc_info'])
+
+    def _level(self, status, headers):
+        if int(status.split(' ', 1)[0]) in (204, 206, 304):
+            return None
+        return self.middleware.level(headers, self.encoding)
+
+    def _headers(self, headers, length=None):
+        """En-têtes de la réponse compressée."""
+        result = []
+        vary = []
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == 'content-length':
+                continue
+            if lowered == 'vary':
+                vary.extend(item.strip() for item in value.split(',') if item.strip())
+                continue
+            if lowered == 'etag' and not value.startswith('W/'):
+                value = f"W/{value}"
+            result.append((name, value))
+
+        if 'accept-encoding' not in (item.lower() for item in vary):
+            vary.append('Accept-Encoding')
+        result.append(('Vary', ', '.join(vary)))
+        result.append(('Content-Encoding', self.encoding))
+        if length is not None:
+            result.append(('Content-Length', str(length)))
+        return result
+
+    def _buffered(self, status, headers, pending, chunks, level, exc_info):
+        body = b''.join(pending) + b''.join(chunks)
+        if len(body) < self.middleware.min_size:
+            self.start_response(status, headers, exc_info)
+            yield body
+            return
+
+        body = compress(body, self.encoding, level)
+        self.start_response(status, self._headers(headers, len(body)), exc_info)
+        yield body
+
+    def _streamed(self, status, headers, pending, chunks, level, exc_info):
+        stream = STREAMS[self.encoding](level)
+        self.start_response(status, self._headers(headers), exc_info)
+        for source in (pending, chunks):
+            for chunk in source:
+                if chunk:
+                    data = stream.compress(chunk)
+                    if data:
+                        yield data
+        yield stream.finish()
+
+def init_compression(app):
+    """Enveloppe l'application WSGI (désactivable par COMPRESSION_ENABLED)."""
+    if app.config['COMPRESSION_ENABLED']:
+        app.wsgi_app = CompressionMiddleware(
+            app.wsgi_app, app.config['COMPRESSION_LEVELS'], app.config['COMPRESSION_MIN_SIZE']
+        )
+
+# ============================================================================
+#                         BANC D'ESSAI
+# ============================================================================
+
+BENCH_URLS = (
+    '/api/products/?per_page=12',
+    '/api/products/?per_page=100',
+    '/api/products/categories',
+    '/api/products/brands',
+    '/'
+)
+
+@click.command('compression-bench')
+@click.option('--repeat', default=50, show_default=True, help='Compressions par réponse.')
+@click.option('--url', 'urls', multiple=True, help='URL à mesurer (plusieurs possibles).')
+def compression_bench_command(repeat, urls):
+    """Mesure octets économisés et temps CPU de compression par réponse."""
+    client = current_app.test_client()
+    levels = current_app.config['COMPRESSION_LEVELS']
+    encodings = ('br', 'gzip') if _brotli() is not None else ('gzip',)
+
+    for url in urls or BENCH_URLS:
+        response = client.get(url, base_url='https://localhost', headers={'Accept-Encoding': 'identity'})
+        body = response.get_data()
+        mimetype = response.mimetype
+        if response.status_code != 200:
+            click.echo(f"{url} : HTTP {response.status_code}, ignorée")
+            continue
+        click.echo(f"{url} ({mimetype}, {len(body)} octets)")
+        if len(body) < current_app.config['COMPRESSION_MIN_SIZE']:
+            click.echo("  sous COMPRESSION_MIN_SIZE : envoyée sans compression")
+            continue
+
+        for encoding in encodings:
+            level = levels.get(mimetype, {}).get(encoding)
+            if level is None:
+                click.echo(f"  {encoding:<4} : type non compressé")
+                continue
+            start = time.process_time()
+            for _ in range(repeat):
+                compressed = compress(body, encoding, level)
+            cpu = (time.process_time() - start) / repeat
+            saved = len(body) - len(compressed)
+            click.echo(
+                f"  {encoding:<4} niveau {level:>2} : {len(compressed)} octets, "
+                f"{saved} économisés ({saved * 100 / max(len(body), 1):.1f} %), "
+                f"{cpu * 1000:.3f} ms CPU par réponse"
+            )
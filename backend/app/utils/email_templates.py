@@ -0,0 +1,188 @@
+# app/utils/email_templates.py
+
+"""
+Templates des emails transactionnels.
+
+Chaque email est décrit par deux templates Jinja (NOM.html et NOM.txt) dans
+app/templates/emails. L'environnement est construit une seule fois au
+démarrage : les styles de _styles.css sont recopiés dans les attributs
+style="" lors du chargement des sources, puis tous les templates sont
+compilés et gardés en mémoire. Un rendu ne fait donc plus qu'exécuter le
+code Python déjà compilé.
+"""
+
+import os
+import re
+import time
+from types import SimpleNamespace
+from datetime import datetime
+from decimal import Decimal
+import click
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+from app.utils.orders import get_country_name
+
+# Configuration
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates', 'emails')
+STYLESHEET = '_styles.css'
+
+RULE_PATTERN = re.compile(r'([^{}]+)\{([^}]*)\}')
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+TAG_PATTERN = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)(\s[^<>]*?)?(/?)>')
+CLASS_PATTERN = re.compile(r'\sclass="([^"]*)"')
+STYLE_PATTERN = re.compile(r'\sstyle="([^"]*)"')
+
+# ============================================================================
+#                         INLINING DES STYLES
+# ============================================================================
+
+def parse_stylesheet(css):
+    """Lit une feuille de style simple (sélecteurs de balise ou de classe).
+
+    Args:
+        css (str): Contenu de la feuille de style
+
+    Returns:
+        dict: Sélecteur ("td", ".header") -> déclarations
+    """
+    rules = {}
+    for selectors, declarations in RULE_PATTERN.findall(COMMENT_PATTERN.sub('', css)):
+        declarations = ' '.join(declarations.split()).strip().rstrip(';')
+        for selector in selectors.split(','):
+            selector = selector.strip()
+            rules[selector] = f"{rules[selector]}; {declarations}" if selector in rules else declarations
+    return rules
+
+def inline_styles(html, rules):
+    """Recopie les styles dans l'attribut style="" de chaque balise.
+
+    Ordre de priorité : balise, puis classes, puis style déjà présent.
+    """
+    def replace(match):
+        tag, attributes, closing = match.group(1), match.group(2) or '', match.group(3)
+
+        declarations = []
+        if tag.lower() in rules:
+            declarations.append(rules[tag.lower()])
+
+        class_match = CLASS_PATTERN.search(attributes)
+        if class_match:
+            declarations.extend(rules[f'.{name}'] for name in class_match.group(1).split() if f'.{name}' in rules)
+            attributes = CLASS_PATTERN.sub('', attributes)
+
+        style_match = STYLE_PATTERN.search(attributes)
+        if style_match:
+            declarations.append(style_match.group(1).rstrip(';'))
+            attributes = STYLE_PATTERN.sub('', attributes)
+
+        if declarations:
+            attributes += f' style="{"; ".join(declarations)}"'
+        return f'<{tag}{attributes}{closing}>'
+
+    return TAG_PATTERN.sub(replace, html)
+
+class InlineStyleLoader(FileSystemLoader):
+    """Chargeur qui applique l'inlining des styles aux templates HTML."""
+
+    def __init__(self, searchpath):
+        super().__init__(searchpath)
+        with open(os.path.join(searchpath, STYLESHEET), encoding='utf-8') as stylesheet:
+            self.rules = parse_stylesheet(stylesheet.read())
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        if template.endswith('.html'):
+            source = inline_styles(source, self.rules)
+        return source, filename, uptodate
+
+# ============================================================================
+#                         ENVIRONNEMENT JINJA
+# ============================================================================
+
+def format_euros(value):
+    """Formate un montant : 12.5 -> "12.50 €"."""
+    return f"{float(value or 0):.2f} €"
+
+def _create_environment():
+    environment = Environment(
+        loader=InlineStyleLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(['html']),
+        undefined=StrictUndefined,
+        auto_reload=False,
+        cache_size=-1
+    )
+    environment.filters['euros'] = format_euros
+    environment.filters['country_name'] = get_country_name
+    return environment
+
+_environment = None
+
+def init_email_templates():
+    """Construit l'environnement et compile tous les templates (au démarrage).
+
+    Returns:
+        int: Nombre de templates compilés
+    """
+    global _environment
+    environment = _create_environment()
+
+    names = [name for name in environment.list_templates() if name.endswith(('.html', '.txt'))]
+    for name in names:
+        environment.get_template(name)
+
+    _environment = environment
+    return len(names)
+
+def render_email(name, **context):
+    """Rend les versions HTML et texte d'un email.
+
+    Args:
+        name (str): Nom du template, sans extension (ex: "order_confirmation")
+        **context: Variables du template
+
+    Returns:
+        tuple: (html, texte)
+    """
+    if _environment is None:
+        init_email_templates()
+
+    html = _environment.get_template(f'{name}.html').render(**context)
+    text = _environment.get_template(f'{name}.txt').render(**context)
+    return html, text
+
+# ============================================================================
+#                         COMMANDE CLI
+# ============================================================================
+
+def _sample_order(item_count):
+    """Commande fictive (sans base de données) pour la mesure du rendu."""
+    items = [
+        SimpleNamespace(name=f'Cartouche {i}', reference=f'REF-{i:04d}', price=Decimal('12.90'), quantity=2)
+        for i in range(item_count)
+    ]
+    subtotal_ht = sum(item.price * item.quantity for item in items) / Decimal('1.2')
+    address = SimpleNamespace(
+        firstname='Jean', lastname='Dupont', company='', address='1 rue de la Paix', address2='',
+        postal_code='75002', city='Paris', country='FR', phone='0102030405'
+    )
+    order = SimpleNamespace(
+        order_number='FMP-2025-01-00001', created_at=datetime.now(), items=items,
+        subtotal_ht=subtotal_ht, tax=subtotal_ht * Decimal('0.2'), shipping=0,
+        total=subtotal_ht * Decimal('1.2'), shipping_address=address, payment_method='transfer'
+    )
+    return order, SimpleNamespace(firstname='Jean')
+
+@click.command('email-bench')
+@click.option('--repeat', default=200, show_default=True, help='Nombre de rendus par taille.')
+def email_bench_command(repeat):
+    """Mesure le temps de rendu de la confirmation de commande (1, 10, 100 articles)."""
+    start = time.perf_counter()
+    count = init_email_templates()
+    click.echo(f"{count} templates compilés en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for item_count in (1, 10, 100):
+        order, user = _sample_order(item_count)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            render_email('order_confirmation', order=order, user=user)
+        elapsed = (time.perf_counter() - start) / repeat
+        click.echo(f"{item_count:>3} article(s) : {elapsed * 1000:.3f} ms par rendu (HTML + texte)")
@@ -1,12 +1,11 @@
 # app/utils/emails.py
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from flask import current_app, render_template
+from flask import current_app
 import secrets
 from datetime import datetime, timedelta
 from app.models.user import User
 from app import db
+from app.utils.outbox import queue_email
+from app.utils.email_templates import render_email
 
 def generate_verification_token():
     """Génère un token de vérification aléatoire."""
@@ -14,13 +13,16 @@ def generate_verification_token():
 
 def send_verification_email(user):
     """
-    Envoie un email de vérification à l'utilisateur.
+    Met en file un email de vérification pour l'utilisateur.
+    
+    Le token et l'email sont enregistrés dans la même transaction ;
+    l'envoi SMTP est assuré en arrière-plan par le worker de app.utils.outbox.
     
     Args:
         user: L'instance utilisateur à vérifier
         
     Returns:
-        bool: True si l'email a été envoyé avec succès, False sinon
+        bool: True si l'email a été mis en file avec succès, False sinon
     """
     # Générer un token de vérification
     token = generate_verification_token()
@@ -28,42 +30,49 @@ def send_verification_email(user):
     # Définir l'expiration (24h)
     expires = datetime.utcnow() + timedelta(hours=24)
     
-    # Enregistrer en base de données
-    user.verification_token = token
-    user.verification_token_expires = expires
-    db.session.commit()
-    
-    # Configuration email
-    msg = MIMEMultipart()
-    msg['Subject'] = 'Vérification de votre compte FMP'
-    msg['From'] = current_app.config['MAIL_USERNAME']
-    msg['To'] = user.email
-    
     # URL de vérification
     verification_url = f"{current_app.config['SITE_URL']}/verify-email?token={token}"
     
-    # Corps du message
-    html = render_template('emails/verification.html', 
-                          user=user, 
-                          verification_url=verification_url)
-    
-    msg.attach(MIMEText(html, 'html'))
-    
     try:
-        # Connexion au serveur SMTP
-        server = smtplib.SMTP(current_app.config['MAIL_SERVER'], current_app.config['MAIL_PORT'])
-        server.starttls()
-        server.login(current_app.config['MAIL_USERNAME'], current_app.config['MAIL_PASSWORD'])
+        # Corps du message (HTML et texte)
+        html, text = render_email('verification', user=user, verification_url=verification_url)
         
-        # Envoi du message
-        server.send_message(msg)
-        server.quit()
+        # Enregistrer le token et l'email en base de données
+        user.verification_token = token
+        user.verification_token_expires = expires
+        queue_email('Vérification de votre compte FMP', [user.email], html=html, text=text)
+        db.session.commit()
         
         return True
     except Exception as e:
-        current_app.logger.error(f"Erreur lors de l'envoi de l'email: {str(e)}")
+        db.session.rollback()
+        current_app.logger.error(f"Erreur lors de la mise en file de l'email: {str(e)}")
         return False
 
+def queue_order_confirmation_email(order):
+    """
+    Met en file l'email de confirmation d'une commande
+    
+    L'email est enregistré dans la transaction de la commande et envoyé
+    en arrière-plan après le commit.
+    
+    Args:
+        order (Order): Commande à confirmer (déjà flushée)
+    """
+    try:
+        user = User.query.get(order.user_id)
+        if not user or not user.email:
+            current_app.logger.error("Impossible d'envoyer l'email de confirmation: utilisateur non trouvé")
+            return
+        
+        html, text = render_email('order_confirmation', order=order, user=user)
+        queue_email(f"Confirmation de votre commande #{order.order_number}", [user.email], html=html, text=text)
+        
+        current_app.logger.info(f"Email de confirmation mis en file pour la commande #{order.order_number}")
+        
+    except Exception as e:
+        current_app.logger.error(f"Erreur lors de la préparation de l'email de confirmation: {str(e)}")
+
 def verify_email_token(token):
     """
     Vérifie un token de vérification d'email.
@@ -0,0 +1,162 @@
+# app/utils/http_cache.py
+
+"""
+Cache HTTP des routes de lecture du catalogue.
+
+Toute transaction qui modifie le catalogue (produits, images, spécifications,
+catégories, marques) incrémente une fois, juste avant son commit, le
+compteur de la table catalog_version. Les routes décorées par
+@catalog_cached en tirent un ETag fort et un Last-Modified : une requête
+conditionnelle dont la version n'a pas changé reçoit un 304 sans que la
+route ne soit exécutée ni sérialisée. Les en-têtes Cache-Control permettent
+en outre à un proxy inverse de servir lui-même la majorité du trafic.
+
+Les mouvements de stock (ventes, annulations) ne changent pas la version :
+ils ne verrouillent pas la ligne du compteur et ne vident pas les caches à
+chaque commande. Le stock affiché est rafraîchi par période de
+HTTP_CACHE_STOCK_REFRESH secondes, numéro de période compris dans l'ETag ;
+la disponibilité réelle est vérifiée à la commande (app.utils.stock).
+"""
+
+import hashlib
+import time
+from datetime import datetime
+from functools import wraps
+from flask import current_app, request, make_response, g, has_request_context
+from sqlalchemy import event, update, insert
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.products.models import Product, Category, Brand, ProductImage, ProductSpecification, CatalogVersion
+
+# Clé de session : le catalogue a été modifié pendant la transaction
+CHANGED_KEY = 'catalog_changed'
+
+# Modèles dont la modification change une réponse du catalogue
+CATALOG_MODELS = (Product, Category, Brand, ProductImage, ProductSpecification)
+
+# ============================================================================
+#                         VERSION DU CATALOGUE
+# ============================================================================
+
+def mark_catalog_changed(session=None):
+    """Signale une modification du catalogue faite hors ORM (UPDATE en masse)."""
+    (session or db.session).info[CHANGED_KEY] = True
+
+def bump_catalog_version(connection):
+    """Incrémente le compteur de version (crée la ligne au premier appel)."""
+    table = CatalogVersion.__table__
+    now = datetime.utcnow()
+    result = connection.execute(
+        update(table).where(table.c.id == 1).values(version=table.c.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(id=1, version=1, updated_at=now))
+
+def get_catalog_version():
+    """Retourne (version, date de dernière modification) du catalogue."""
+    row = db.session.query(CatalogVersion.version, CatalogVersion.updated_at).filter(
+        CatalogVersion.id == 1
+    ).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+def current_catalog_version():
+    """
+    Comme get_catalog_version, mais relue une seule fois par requête HTTP
+
+    Les caches en mémoire (arbre des catégories, suggestions, listes de
+    l'accueil) comparent leur version à celle-ci à chaque lecture : une
+    modification validée par un autre processus les rend ainsi périmés.
+    """
+    if not has_request_context():
+        return get_catalog_version()
+
+    # g peut survivre à la requête (contexte d'application déjà ouvert) :
+    # la valeur est rattachée à la requête qui l'a lue
+    current = request._get_current_object()
+    if g.get('catalog_version_request') is not current:
+        g.catalog_version_request = current
+        g.catalog_version_row = get_catalog_version()
+    return g.catalog_version_row
+
+def _stock_period():
+    """Numéro de la période de rafraîchissement du stock en cours."""
+    return int(time.time() // current_app.config['HTTP_CACHE_STOCK_REFRESH'])
+
+def catalog_version_key():
+    """
+    Version des réponses du catalogue : version du catalogue et période de stock
+
+    Returns:
+        tuple: (clé "version.période", date de dernière modification)
+    """
+    version, updated_at = current_catalog_version()
+    period = _stock_period()
+    period_start = datetime.utcfromtimestamp(period * current_app.config['HTTP_CACHE_STOCK_REFRESH'])
+    return f"{version}.{period}", max(updated_at, period_start) if updated_at else period_start
+
+def _catalog_object_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info[CHANGED_KEY] = True
+
+for model in CATALOG_MODELS:
+    for event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(model, event_name, _catalog_object_changed)
+
+@event.listens_for(Session, 'before_commit')
+def _bump_before_commit(session):
+    # Le flush final a lieu ici pour que ses modifications soient comptées ;
+    # la ligne du compteur n'est ainsi verrouillée que le temps du commit.
+    session.flush()
+    if session.info.pop(CHANGED_KEY, False):
+        bump_catalog_version(session.connection())
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_on_rollback(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(CHANGED_KEY, None)
+
+# ============================================================================
+#                         DÉCORATEUR
+# ============================================================================
+
+def _cache_control():
+    return (
+        f"public, max-age={current_app.config['HTTP_CACHE_MAX_AGE']}, "
+        f"stale-while-revalidate={current_app.config['HTTP_CACHE_STALE_WHILE_REVALIDATE']}"
+    )
+
+def catalog_cached(f):
+    """
+    Rend une route de lecture du catalogue conditionnelle (ETag / 304)
+
+    L'ETag dépend de la version du catalogue, de la période de stock et de
+    l'URL complète (chemin et paramètres). Seules les réponses 200 reçoivent
+    les en-têtes de cache.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        version, updated_at = catalog_version_key()
+        etag = f"{version}-{hashlib.sha1(request.full_path.encode('utf-8')).hexdigest()[:16]}"
+        last_modified = updated_at.replace(microsecond=0)
+
+        # If-None-Match prime sur If-Modified-Since (RFC 9110)
+        if request.if_none_match:
+            # Comparaison faible : la compression rend l'ETag faible (W/)
+            not_modified = request.if_none_match.contains_weak(etag)
+        else:
+            since = request.if_modified_since
+            not_modified = bool(since and last_modified <= since.replace(tzinfo=None))
+
+        if not_modified:
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.headers['Cache-Control'] = _cache_control()
+        return response
+    return decorated_function
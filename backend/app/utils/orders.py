@@ -1,27 +1,91 @@
-from sqlalchemy.sql.expression import extract
+"""
+Attribution des numéros de commande
+Format: FMP-ANNÉE-MOIS-XXXXX (ex: FMP-2025-02-00001)
+"""
+
 from datetime import datetime
-from app.orders.models import Order
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.orders.models import Order, OrderSequence
+
+ORDER_NUMBER_PREFIX = 'FMP'
+
+# Pays de livraison acceptés
+COUNTRY_NAMES = {
+    'FR': 'France',
+    'BE': 'Belgique',
+    'CH': 'Suisse',
+    'LU': 'Luxembourg'
+}
+
+def get_country_name(country_code):
+    """
+    Convertit un code pays en nom complet
+    
+    Args:
+        country_code (str): Code pays à 2 lettres (ISO 3166-1 alpha-2)
+        
+    Returns:
+        str: Nom complet du pays
+    """
+    return COUNTRY_NAMES.get(country_code, country_code)
+
+def generate_order_number(now=None):
+    """
+    Génère un numéro de commande unique en temps constant
+    
+    Le compteur du mois est incrémenté par un seul UPDATE ... RETURNING :
+    la ligne reste verrouillée jusqu'au commit de la commande, deux
+    validations simultanées ne peuvent donc pas obtenir le même numéro.
+    
+    Args:
+        now (datetime, optional): Date de référence (maintenant par défaut)
+        
+    Returns:
+        str: Numéro de commande unique
+    """
+    now = now or datetime.now()
+    period = f"{now.year}-{now.month:02d}"
+    
+    seq_number = _increment_sequence(period)
+    if seq_number is None:
+        # Première commande du mois : création du compteur puis nouvel essai
+        _create_sequence(period)
+        seq_number = _increment_sequence(period)
+    
+    return f"{ORDER_NUMBER_PREFIX}-{period}-{seq_number:05d}"
+
+def _increment_sequence(period):
+    """Incrémente le compteur du mois et retourne la nouvelle valeur (None s'il n'existe pas)."""
+    return db.session.execute(
+        update(OrderSequence)
+        .where(OrderSequence.period == period)
+        .values(last_value=OrderSequence.last_value + 1)
+        .returning(OrderSequence.last_value)
+        .execution_options(synchronize_session=False)
+    ).scalar()
 
-def generate_order_number():
-    now = datetime.now()
-    year = now.year
-    month = now.month
-    
-    # Trouver le dernier numéro de commande pour ce mois
-    last_order = Order.query.filter(
-        extract('year', Order.created_at) == year,
-        extract('month', Order.created_at) == month
-    ).order_by(Order.id.desc()).first()
-    
-    if last_order and last_order.order_number:
-        try:
-            seq_number = int(last_order.order_number.split('-')[-1])
-            seq_number += 1
-        except (ValueError, IndexError):
-            seq_number = 1
-    else:
-        seq_number = 1
-    
-    # Formater le numéro de commande
-    order_number = f"FMP-{year}-{month:02d}-{seq_number:05d}"
-    return order_number
\ No newline at end of file
+def _create_sequence(period):
+    """
+    Crée le compteur d'un mois, initialisé avec le dernier numéro déjà attribué
+    
+    La recherche du dernier numéro passe par l'index unique de order_number
+    (préfixe LIKE) et n'a lieu qu'une fois par mois.
+    """
+    prefix = f"{ORDER_NUMBER_PREFIX}-{period}-"
+    last_number = db.session.query(func.max(Order.order_number)).filter(
+        Order.order_number.like(f"{prefix}%")
+    ).scalar()
+    
+    try:
+        last_value = int(last_number.rsplit('-', 1)[-1]) if last_number else 0
+    except ValueError:
+        last_value = 0
+    
+    try:
+        with db.session.begin_nested():
+            db.session.add(OrderSequence(period=period, last_value=last_value))
+    except IntegrityError:
+        # Compteur créé en parallèle par une autre commande
+        pass
@@ -0,0 +1,268 @@
+# app/utils/outbox.py
+
+"""
+Envoi asynchrone des emails.
+
+queue_email() enregistre le message dans la table email_outbox, dans la
+transaction de l'appelant : l'email n'existe que si l'action (ex: la commande)
+est validée. Un worker envoie ensuite les messages par lots sur une seule
+connexion SMTP, avec de nouvelles tentatives espacées exponentiellement :
+  - en production, un processus dédié (`flask email-worker`) ;
+  - sinon (EMAIL_WORKER_ENABLED), un thread du processus web, démarré à la
+    première requête (jamais par les commandes CLI).
+
+Chaque lot est réservé (statut SENDING, jeton et bail) avant l'envoi :
+plusieurs workers peuvent tourner en même temps sans envoyer deux fois
+le même email.
+"""
+
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from app import db, mail
+from app.models.outbox import EmailOutbox, STATUS_PENDING, STATUS_SENDING, STATUS_SENT, STATUS_FAILED
+
+# Clé de session indiquant qu'un email a été mis en file pendant la transaction
+QUEUED_KEY = 'outbox_queued'
+
+# ============================================================================
+#                         MISE EN FILE
+# ============================================================================
+
+def queue_email(subject, recipients, html=None, text=None):
+    """
+    Ajoute un email à la file d'envoi (sans commit)
+
+    Args:
+        subject (str): Sujet
+        recipients (list): Adresses des destinataires
+        html (str): Corps HTML
+        text (str): Corps texte brut
+
+    Returns:
+        EmailOutbox: Entrée créée
+    """
+    entry = EmailOutbox(
+        recipients=','.join(recipients),
+        subject=subject,
+        html_body=html,
+        text_body=text,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.session.add(entry)
+    db.session.info[QUEUED_KEY] = True
+    return entry
+
+@event.listens_for(Session, 'after_commit')
+def _wake_worker(session):
+    if session.info.pop(QUEUED_KEY, False):
+        email_worker.wake()
+
+# ============================================================================
+#                         ENVOI PAR LOTS
+# ============================================================================
+
+def _retry_delay(attempts):
+    """Délai avant la prochaine tentative (exponentiel, plafonné)."""
+    base = current_app.config['EMAIL_RETRY_BASE_SECONDS']
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), current_app.config['EMAIL_RETRY_MAX_SECONDS']))
+
+def _failure_values(entry, error):
+    """Colonnes à écrire après un échec d'envoi (nouvel essai ou abandon)."""
+    attempts = entry.attempts + 1
+    values = {'attempts': attempts, 'last_error': str(error), 'status': STATUS_PENDING}
+    if attempts >= current_app.config['EMAIL_MAX_ATTEMPTS']:
+        values['status'] = STATUS_FAILED
+        current_app.logger.error(f"Email {entry.id} abandonné après {attempts} tentatives: {error}")
+    else:
+        values['next_attempt_at'] = datetime.utcnow() + _retry_delay(attempts)
+    return values
+
+def _finish(entry, token, values):
+    """
+    Enregistre le résultat d'un envoi et libère l'email (commit)
+
+    L'UPDATE ne s'applique que si l'email est toujours réservé par ce lot
+    (un bail expiré a pu être repris par un autre worker).
+    """
+    db.session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == entry.id, EmailOutbox.claim_token == token)
+        .values(claim_token=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+def claim_batch(batch_size):
+    """
+    Réserve un lot d'emails arrivés à échéance (commit)
+
+    Les emails en attente, ou en cours d'envoi dont le bail a expiré (worker
+    arrêté pendant l'envoi), passent en SENDING avec un jeton propre au lot.
+    L'UPDATE revérifie les conditions : deux workers qui choisissent les
+    mêmes lignes ne peuvent pas les réserver tous les deux, même sur SQLite
+    (qui ignore FOR UPDATE SKIP LOCKED).
+
+    Args:
+        batch_size (int): Taille maximale du lot
+
+    Returns:
+        tuple: (jeton du lot, emails réservés)
+    """
+    now = datetime.utcnow()
+    due = (
+        EmailOutbox.status.in_([STATUS_PENDING, STATUS_SENDING]),
+        EmailOutbox.next_attempt_at <= now
+    )
+
+    ids = [row.id for row in db.session.query(EmailOutbox.id).filter(*due)
+           .order_by(EmailOutbox.next_attempt_at).limit(batch_size).with_for_update(skip_locked=True)]
+    if not ids:
+        db.session.rollback()
+        return None, []
+
+    token = uuid.uuid4().hex
+    lease = timedelta(seconds=current_app.config['EMAIL_CLAIM_LEASE_SECONDS'])
+    db.session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(ids), *due)
+        .values(status=STATUS_SENDING, claim_token=token, next_attempt_at=now + lease)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+    entries = EmailOutbox.query.filter_by(claim_token=token).order_by(EmailOutbox.id).all()
+    # Fin de la transaction de lecture : rien n'est verrouillé pendant l'envoi
+    for entry in entries:
+        db.session.expunge(entry)
+    db.session.rollback()
+    return token, entries
+
+def process_outbox(batch_size=None):
+    """
+    Envoie un lot d'emails arrivés à échéance sur une seule connexion SMTP
+
+    Le lot est réservé et validé avant l'envoi ; chaque email est ensuite
+    finalisé (envoyé, reporté ou abandonné) par son propre commit.
+
+    Args:
+        batch_size (int): Taille maximale du lot
+
+    Returns:
+        int: Nombre d'emails traités (envoyés ou reportés)
+    """
+    token, entries = claim_batch(batch_size or current_app.config['EMAIL_BATCH_SIZE'])
+    if not entries:
+        return 0
+
+    finished = 0
+    try:
+        with mail.connect() as connection:
+            for entry in entries:
+                try:
+                    connection.send(Message(
+                        subject=entry.subject,
+                        recipients=entry.recipient_list,
+                        html=entry.html_body,
+                        body=entry.text_body
+                    ))
+                    values = {'status': STATUS_SENT, 'sent_at': datetime.utcnow()}
+                except Exception as e:
+                    values = _failure_values(entry, e)
+
+                # Commit par message : un email envoyé n'est jamais renvoyé
+                finished += 1
+                _finish(entry, token, values)
+    except Exception as e:
+        # Connexion SMTP impossible : seuls les emails non finalisés sont reportés
+        current_app.logger.warning(f"Connexion SMTP impossible: {str(e)}")
+        db.session.rollback()
+        for entry in entries[finished:]:
+            _finish(entry, token, _failure_values(entry, e))
+
+    return len(entries)
+
+# ============================================================================
+#                         WORKER EN ARRIÈRE-PLAN
+# ============================================================================
+
+class EmailWorker:
+    """Thread d'envoi réveillé à chaque commit contenant un email."""
+
+    def __init__(self):
+        self._app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def init_app(self, app):
+        """Démarre le thread à la première requête (les commandes CLI n'en servent pas)."""
+        if app.config['EMAIL_WORKER_ENABLED']:
+            app.before_request(lambda: self.start(app))
+
+    def start(self, app):
+        """Démarre le thread d'envoi pour l'application donnée."""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._app = app
+            self._thread = threading.Thread(target=self._run, name='email-worker', daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """Demande un passage immédiat (sans effet si le worker n'est pas démarré)."""
+        self._wakeup.set()
+
+    def _run(self):
+        with self._app.app_context():
+            run_worker_loop(self._wakeup)
+
+email_worker = EmailWorker()
+
+def run_worker_loop(wakeup=None, once=False):
+    """
+    Traite la file jusqu'à épuisement puis attend de nouveaux emails
+
+    Args:
+        wakeup (threading.Event): Événement de réveil anticipé
+        once (bool): S'arrêter dès que la file est vide
+    """
+    poll_interval = current_app.config['EMAIL_POLL_INTERVAL']
+
+    while True:
+        try:
+            while process_outbox():
+                pass
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Erreur du worker email: {str(e)}")
+        finally:
+            db.session.remove()
+
+        if once:
+            return
+
+        if wakeup is not None:
+            wakeup.wait(poll_interval)
+            wakeup.clear()
+        else:
+            time.sleep(poll_interval)
+
+# ============================================================================
+#                         COMMANDE CLI
+# ============================================================================
+
+@click.command('email-worker')
+@click.option('--once', is_flag=True, help="Vider la file puis s'arrêter.")
+def email_worker_command(once):
+    """Envoie les emails en attente (processus dédié)."""
+    click.echo("Worker email démarré.")
+    run_worker_loop(once=once)
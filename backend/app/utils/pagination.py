@@ -0,0 +1,126 @@
+# app/utils/pagination.py
+
+"""
+Pagination par curseur (keyset).
+
+Au lieu d'un OFFSET, chaque page reprend après la dernière ligne de la page
+précédente en comparant les colonnes de tri ; le coût d'une page ne dépend
+donc plus de sa profondeur. Le curseur transmis au client est opaque et signé
+pour ne pas pouvoir être forgé.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from flask import current_app
+from itsdangerous import URLSafeSerializer, BadSignature
+from sqlalchemy import and_, or_
+
+# Configuration
+CURSOR_SALT = 'keyset-pagination'
+
+KeysetPage = namedtuple('KeysetPage', ['items', 'next_cursor', 'has_more', 'total'])
+
+def _serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt=CURSOR_SALT)
+
+def encode_cursor(values):
+    """Encode les valeurs de tri de la dernière ligne en curseur opaque.
+
+    Args:
+        values (list): Valeurs des colonnes de tri
+
+    Returns:
+        str: Curseur signé
+    """
+    return _serializer().dumps([
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ])
+
+def decode_cursor(token, columns):
+    """Décode un curseur et restaure le type des valeurs.
+
+    Args:
+        token (str): Curseur reçu du client
+        columns (list): Colonnes de tri correspondantes
+
+    Returns:
+        list: Valeurs de tri
+
+    Raises:
+        ValueError: Si le curseur est invalide ou falsifié
+    """
+    try:
+        values = _serializer().loads(token)
+    except BadSignature:
+        raise ValueError('Curseur invalide')
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError('Curseur invalide')
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+def _seek_condition(columns, values, descending):
+    """Construit (c1, c2, ...) > (v1, v2, ...) de façon portable."""
+    column, value = columns[0], values[0]
+    after = column < value if descending else column > value
+
+    if len(columns) == 1:
+        return after
+
+    return or_(after, and_(column == value, _seek_condition(columns[1:], values[1:], descending)))
+
+def clamp_per_page(value, default=10):
+    """Taille de page bornée à 1..PAGINATION_MAX_PER_PAGE.
+
+    Args:
+        value (int): Valeur de ?per_page (None si absente ou invalide)
+        default (int): Taille par défaut
+
+    Returns:
+        int: Taille de page utilisable
+    """
+    if value is None:
+        value = default
+    return max(1, min(value, current_app.config['PAGINATION_MAX_PER_PAGE']))
+
+def keyset_paginate(query, columns, cursor=None, per_page=10, descending=False, with_total=True):
+    """Pagine une requête par curseur.
+
+    Args:
+        query: Requête SQLAlchemy filtrée mais non triée
+        columns (list): Colonnes de tri ; la dernière doit être unique (id)
+        cursor (str): Curseur de la page précédente (None pour la première page)
+        per_page (int): Nombre d'éléments par page
+        descending (bool): Tri décroissant
+        with_total (bool): Calculer le nombre total d'éléments (COUNT)
+
+    Returns:
+        KeysetPage: Éléments, curseur suivant, indicateur de suite et total
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    total = query.order_by(None).count() if with_total else None
+
+    if cursor:
+        query = query.filter(_seek_condition(columns, decode_cursor(cursor, columns), descending))
+
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+
+    # Une ligne de plus pour savoir s'il reste une page
+    items = query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+
+    # Page vide : pas de curseur suivant
+    next_cursor = None
+    if has_more and items:
+        next_cursor = encode_cursor([getattr(items[-1], column.key) for column in columns])
+
+    return KeysetPage(items, next_cursor, has_more, total)
@@ -0,0 +1,310 @@
+# app/utils/response_cache.py
+
+"""
+Cache serveur des réponses de l'API catalogue.
+
+Les réponses 200 des routes décorées par @cached_response sont conservées
+sous une clé (route + paramètres triés) et étiquetées ("products",
+"product:42", "category:3", "brands"...). Les modifications du catalogue
+ajoutent les étiquettes concernées à la session ; elles sont purgées au
+commit, les autres entrées restant valides.
+
+Le stockage tient un compteur de purges et, pour chaque étiquette, la
+valeur du compteur lors de sa dernière purge. Une entrée retient le
+compteur lu avant le calcul de la réponse ; elle est ignorée si l'une de
+ses étiquettes a été purgée depuis. Une réponse calculée pendant la purge
+faite par un autre processus n'est donc jamais servie, sans rien
+invalider d'autre que les étiquettes modifiées.
+
+Le stock n'invalide aucune étiquette : il est rafraîchi à l'expiration
+des entrées (RESPONSE_CACHE_TTL).
+
+Deux stockages sont disponibles :
+  - "memory" (par défaut) : LRU en mémoire avec durée de vie, propre à chaque
+    processus (les purges des autres processus ne l'atteignent pas) ;
+  - "redis" : tout client offrant get/set/sadd/smembers/expire/delete
+    (redis-py, ou un faux client en test), partagé entre les processus.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, request, make_response
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.products.models import Product, Category, Brand, ProductImage, ProductSpecification
+
+# Clé de session : étiquettes à purger au commit
+PENDING_TAGS_KEY = 'response_cache_tags'
+
+# ============================================================================
+#                         STOCKAGES
+# ============================================================================
+
+class MemoryCacheBackend:
+    """LRU en mémoire avec durée de vie et index des étiquettes."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # clé -> (expiration, valeur, étiquettes)
+        self._tags = {}                 # étiquette -> {clés}
+        self._generation = 0            # compteur de purges
+        self._purged_at = {}            # étiquette -> compteur lors de sa dernière purge
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl, tags):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def generation(self):
+        return self._generation
+
+    def tag_generations(self, tags):
+        with self._lock:
+            return [self._purged_at.get(tag, 0) for tag in tags]
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                self._purged_at[tag] = self._generation
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._generation += 1
+            self._purged_at.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class RedisCacheBackend:
+    """Stockage Redis : une clé par réponse, un ensemble de clés et un compteur par étiquette."""
+
+    def __init__(self, client, prefix='fmp:response:'):
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag):
+        return f'{self.prefix}tag:{tag}'
+
+    def _purged_key(self, tag):
+        return f'{self.prefix}purged:{tag}'
+
+    def generation(self):
+        return int(self.client.get(f'{self.prefix}generation') or 0)
+
+    def tag_generations(self, tags):
+        return [int(value or 0) for value in self.client.mget([self._purged_key(tag) for tag in tags])]
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl, tags):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+        for tag in tags:
+            self.client.sadd(self._tag_key(tag), self.prefix + key)
+            self.client.expire(self._tag_key(tag), ttl)
+
+    def invalidate_tags(self, tags):
+        generation = self.client.incr(f'{self.prefix}generation')
+        for tag in tags:
+            self.client.set(self._purged_key(tag), generation)
+            keys = self.client.smembers(self._tag_key(tag))
+            if keys:
+                self.client.delete(*keys)
+            self.client.delete(self._tag_key(tag))
+
+    def clear(self):
+        for key in self.client.keys(f'{self.prefix}*'):
+            self.client.delete(key)
+
+# ============================================================================
+#                         CACHE
+# ============================================================================
+
+class ResponseCache:
+    """Façade du cache de réponses, configurée par init_app()."""
+
+    def __init__(self):
+        self.backend = None
+        self.default_ttl = 300
+
+    def init_app(self, app):
+        """Choisit le stockage selon RESPONSE_CACHE_BACKEND."""
+        self.default_ttl = app.config['RESPONSE_CACHE_TTL']
+        backend = app.config['RESPONSE_CACHE_BACKEND']
+
+        if backend == 'redis':
+            try:
+                import redis
+                self.backend = RedisCacheBackend(redis.Redis.from_url(app.config['RESPONSE_CACHE_REDIS_URL']))
+                return
+            except ImportError:
+                app.logger.warning("Paquet redis non installé : cache de réponses en mémoire")
+
+        if backend == 'null':
+            self.backend = None
+        else:
+            self.backend = MemoryCacheBackend(app.config['RESPONSE_CACHE_MAX_ENTRIES'])
+
+    def generation(self):
+        """Compteur de purges à lire avant de calculer une réponse à stocker."""
+        if self.backend is None:
+            return None
+        try:
+            return self.backend.generation()
+        except Exception as e:
+            current_app.logger.warning(f"Cache de réponses indisponible: {str(e)}")
+            return None
+
+    def get(self, key):
+        """Retourne la valeur stockée, sauf si l'une de ses étiquettes a été purgée depuis."""
+        if self.backend is None:
+            return None
+        try:
+            entry = self.backend.get(key)
+            if entry is None:
+                return None
+            if any(purged > entry['generation'] for purged in self.backend.tag_generations(entry['tags'])):
+                return None
+            return entry['value']
+        except Exception as e:
+            current_app.logger.warning(f"Cache de réponses indisponible: {str(e)}")
+            return None
+
+    def set(self, key, value, tags, generation, ttl=None):
+        """Stocke une valeur calculée après lecture du compteur `generation`."""
+        if self.backend is None or generation is None:
+            return
+        tags = list(tags)
+        try:
+            self.backend.set(
+                key, {'value': value, 'tags': tags, 'generation': generation}, ttl or self.default_ttl, tags
+            )
+        except Exception as e:
+            current_app.logger.warning(f"Cache de réponses indisponible: {str(e)}")
+
+    def invalidate_tags(self, *tags):
+        """Purge les réponses portant l'une des étiquettes."""
+        if self.backend is None or not tags:
+            return
+        try:
+            self.backend.invalidate_tags(tags)
+        except Exception as e:
+            current_app.logger.warning(f"Purge du cache de réponses impossible: {str(e)}")
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+response_cache = ResponseCache()
+
+def cache_key():
+    """Clé de la requête courante : route, chemin et paramètres triés."""
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f'{request.endpoint}:{request.path}?{query}'
+
+def cached_response(tags, ttl=None):
+    """
+    Met en cache les réponses 200 d'une route de lecture
+
+    Args:
+        tags (list|callable): Étiquettes de l'entrée, ou fonction
+            (arguments de la route, réponse) -> étiquettes
+        ttl (int): Durée de vie en secondes (RESPONSE_CACHE_TTL par défaut)
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = cache_key()
+            entry = response_cache.get(key)
+            if entry is not None:
+                return current_app.response_class(entry['body'], mimetype=entry['mimetype'])
+
+            generation = response_cache.generation()
+            response = make_response(f(*args, **kwargs))
+
+            if response.status_code == 200 and not response.direct_passthrough:
+                entry_tags = tags(kwargs, response) if callable(tags) else tags
+                response_cache.set(
+                    key,
+                    {'body': response.get_data(as_text=True), 'mimetype': response.mimetype},
+                    entry_tags, generation, ttl=ttl
+                )
+            return response
+        return decorated_function
+    return decorator
+
+# ============================================================================
+#                         INVALIDATION
+# ============================================================================
+
+def invalidate_on_commit(*tags, session=None):
+    """Programme la purge d'étiquettes au commit de la transaction courante."""
+    (session or db.session).info.setdefault(PENDING_TAGS_KEY, set()).update(tags)
+
+def _tags_for(target):
+    if isinstance(target, Product):
+        return ('products', f'product:{target.id}')
+    if isinstance(target, (ProductImage, ProductSpecification)):
+        return ('products', f'product:{target.product_id}')
+    if isinstance(target, Category):
+        # Les listes filtrées par catégorie dépendent aussi de l'arborescence
+        return ('categories', f'category:{target.id}', 'products')
+    if isinstance(target, Brand):
+        return ('brands', f'brand:{target.id}', 'products')
+    return ()
+
+def _catalog_object_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        invalidate_on_commit(*_tags_for(target), session=session)
+
+for model in (Product, Category, Brand, ProductImage, ProductSpecification):
+    for event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(model, event_name, _catalog_object_changed)
+
+@event.listens_for(Session, 'after_commit')
+def _purge_on_commit(session):
+    tags = session.info.pop(PENDING_TAGS_KEY, None)
+    if tags:
+        response_cache.invalidate_tags(*tags)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_on_rollback(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_TAGS_KEY, None)
@@ -0,0 +1,225 @@
+# backend/app/utils/serializers.py
+
+"""
+Sérialisation des produits et commandes pour les routes de lecture.
+
+Un RowSerializer est construit une fois pour une liste de champs : il lit
+les valeurs d'un coup (attrgetter) sur une ligne de requête (Row), un
+namedtuple ou une instance ORM, puis n'applique une conversion qu'aux
+champs qui en ont besoin (dates ISO 8601, montants Numeric en float).
+
+Les produits sont lus en lignes par app.products.read (aucune instance
+Product) et sérialisés avec les champs de ProductSchema.
+
+OrjsonProvider remplace l'encodeur JSON de Flask si orjson est installé
+(JSON_PROVIDER = 'orjson').
+"""
+
+import json
+import time
+from operator import attrgetter
+import click
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select, func
+from app import db
+from app.products.models import Product
+from app.orders.models import Order, OrderItem
+
+# ============================================================================
+#                         CONVERTISSEURS
+# ============================================================================
+
+def iso(value):
+    """Date au format ISO 8601 (None conservé)."""
+    return value.isoformat() if value is not None else None
+
+def money(value):
+    """Montant Numeric (Decimal) en float (None conservé)."""
+    return float(value) if value is not None else None
+
+# ============================================================================
+#                         SÉRIALISEUR
+# ============================================================================
+
+class RowSerializer:
+    """
+    Sérialiseur précompilé d'une liste de champs
+
+    Args:
+        fields (tuple): Champs lus sur la ligne, dans l'ordre de sortie
+        converters (dict): {champ: fonction} pour les champs à convertir
+    """
+
+    __slots__ = ('fields', '_values', '_converters')
+
+    def __init__(self, fields, converters=None):
+        self.fields = tuple(fields)
+        getter = attrgetter(*self.fields)
+        # attrgetter d'un seul champ ne renvoie pas de tuple
+        self._values = getter if len(self.fields) > 1 else (lambda row: (getter(row),))
+        self._converters = tuple((converters or {}).items())
+
+    def __call__(self, row):
+        data = dict(zip(self.fields, self._values(row)))
+        for name, convert in self._converters:
+            data[name] = convert(data[name])
+        return data
+
+    def many(self, rows):
+        return [self(row) for row in rows]
+
+    def columns(self, model):
+        """Colonnes du modèle correspondant aux champs (pour select())."""
+        return [getattr(model, name) for name in self.fields]
+
+# ============================================================================
+#                         PRODUITS
+# ============================================================================
+
+# Mêmes champs que ProductSchema et ses schémas imbriqués
+product_serializer = RowSerializer((
+    'id', 'sku', 'name', 'description', 'short_description', 'price',
+    'stock_quantity', 'min_stock_level', 'category_id', 'brand_id', 'is_active',
+    'featured_position'
+))
+image_serializer = RowSerializer((
+    'id', 'url', 'alt', 'is_primary', 'position', 'status', 'width', 'height', 'variants', 'srcset'
+))
+specification_serializer = RowSerializer(('id', 'name', 'value', 'unit', 'position'))
+category_serializer = RowSerializer((
+    'id', 'name', 'description', 'image_url', 'parent_id', 'path', 'featured_position'
+))
+brand_serializer = RowSerializer(('id', 'name', 'description', 'logo_url', 'website'))
+
+# Colonnes à passer à with_entities() / select() (voir app.products.read)
+PRODUCT_COLUMNS = tuple(product_serializer.columns(Product))
+
+# ============================================================================
+#                         COMMANDES
+# ============================================================================
+
+MONEY = {'subtotal_ht': money, 'tax': money, 'shipping': money, 'total': money}
+
+order_serializer = RowSerializer(
+    ('id', 'order_number', 'created_at', 'status', 'subtotal_ht', 'tax', 'shipping', 'total', 'payment_method'),
+    {'created_at': iso, **MONEY}
+)
+order_summary_serializer = RowSerializer(
+    ('id', 'order_number', 'created_at', 'status', 'total', 'items_count'),
+    {'created_at': iso, 'total': money, 'items_count': int}
+)
+order_item_serializer = RowSerializer(('id', 'name', 'reference', 'price', 'quantity'), {'price': money})
+order_address_serializer = RowSerializer((
+    'firstname', 'lastname', 'company', 'address', 'address2', 'postal_code', 'city', 'country', 'phone'
+))
+
+def order_dict(order):
+    """Détail d'une commande (instance Order avec articles et adresse)."""
+    data = order_serializer(order)
+    data['items'] = order_item_serializer.many(order.items)
+    data['shipping_address'] = order_address_serializer(order.shipping_address) if order.shipping_address else None
+    return data
+
+def order_summary_statement(user_id):
+    """Historique des commandes d'un utilisateur en lignes (nombre d'articles calculé en SQL)."""
+    items_count = (
+        select(func.coalesce(func.sum(OrderItem.quantity), 0))
+        .where(OrderItem.order_id == Order.id)
+        .scalar_subquery()
+    )
+    return (
+        select(Order.id, Order.order_number, Order.created_at, Order.status, Order.total,
+               items_count.label('items_count'))
+        .where(Order.user_id == user_id)
+        .order_by(Order.created_at.desc())
+    )
+
+# ============================================================================
+#                         FOURNISSEUR JSON
+# ============================================================================
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Encodeur JSON de Flask basé sur orjson (mêmes conversions par défaut)."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        import orjson
+        self._orjson = orjson
+
+    def _options(self, indent=False):
+        options = self._orjson.OPT_NON_STR_KEYS | self._orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= self._orjson.OPT_SORT_KEYS
+        if indent:
+            options |= self._orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        # Dates, Decimal, UUID, dataclasses : même rendu que le fournisseur par défaut
+        return self._orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return self._orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = self._orjson.dumps(obj, default=self.default, option=self._options(indent)) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def init_json_provider(app):
+    """Installe OrjsonProvider si JSON_PROVIDER = 'orjson' et le paquet est présent."""
+    if app.config['JSON_PROVIDER'] != 'orjson':
+        return
+    try:
+        app.json = OrjsonProvider(app)
+    except ImportError:
+        app.logger.warning("Paquet orjson non installé : encodeur JSON par défaut")
+
+# ============================================================================
+#                         BANC D'ESSAI
+# ============================================================================
+
+@click.command('serialization-bench')
+@click.option('--size', default=1000, show_default=True, help='Produits par page.')
+@click.option('--repeat', default=10, show_default=True, help='Pages sérialisées par mesure.')
+def serialization_bench_command(size, repeat):
+    """Compare ProductSchema + json et lignes + RowSerializer + fournisseur JSON de l'application."""
+    from app.products.schemas import ProductSchema
+    from app.products.utils import product_loading_options
+    from app.products.read import product_dicts
+    from app.products.samples import add_sample_products
+
+    schema = ProductSchema(many=True, exclude=('category', 'brand'))
+    missing = size - Product.query.count()
+    try:
+        if missing > 0:
+            click.echo(f"{missing} produit(s) fictif(s) ajouté(s) le temps de la mesure")
+            add_sample_products(missing, "Banc d'essai sérialisation")
+
+        def schema_page():
+            products = Product.query.options(*product_loading_options()).order_by(Product.id).limit(size).all()
+            body = json.dumps(schema.dump(products))
+            db.session.expunge_all()
+            return body
+
+        def row_page():
+            rows = db.session.execute(select(*PRODUCT_COLUMNS).order_by(Product.id).limit(size))
+            return current_app.json.dumps(product_dicts(rows))
+
+        assert json.loads(schema_page()) == json.loads(row_page()), "Résultats différents"
+
+        results = {}
+        for label, page in (('ProductSchema + json', schema_page), ('lignes + RowSerializer', row_page)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                page()
+            results[label] = (time.perf_counter() - start) / repeat
+
+        provider = type(current_app.json).__name__
+        for label, elapsed in results.items():
+            click.echo(f"{label:<24}: {elapsed * 1000:8.1f} ms par page de {size} ({size / elapsed:,.0f} produits/s)")
+        click.echo(f"Fournisseur JSON : {provider} ; gain x{results['ProductSchema + json'] / results['lignes + RowSerializer']:.1f}")
+    finally:
+        db.session.rollback()
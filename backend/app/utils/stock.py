@@ -0,0 +1,236 @@
+# app/utils/stock.py
+
+"""
+Gestion atomique du stock.
+
+Le stock n'est jamais lu puis réécrit en Python : chaque mouvement est un
+UPDATE conditionnel exécuté par la base,
+
+    UPDATE products SET stock_quantity = stock_quantity - :q
+    WHERE id = :id AND stock_quantity >= :q
+
+et deux acheteurs simultanés ne peuvent donc pas vendre la même unité.
+À la commande, le stock est décrémenté et une réservation à durée limitée
+est enregistrée ; elle est restituée si la commande est annulée ou si elle
+expire avant le paiement, et supprimée sans restitution quand le paiement
+est confirmé (à la commande pour les moyens réglés immédiatement).
+"""
+
+from datetime import datetime
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import update, delete
+from app import db
+from app.products.models import Product
+from app.orders.models import Order, StockReservation
+
+# ============================================================================
+#                         MOUVEMENTS DE STOCK
+# ============================================================================
+
+def adjust_stock(product_id, delta):
+    """
+    Ajoute (delta > 0) ou retire (delta < 0) du stock de façon atomique
+
+    Un retrait n'est appliqué que si le stock est suffisant.
+
+    Args:
+        product_id (int): ID du produit
+        delta (int): Variation de stock
+
+    Returns:
+        bool: True si la ligne a été mise à jour
+    """
+    statement = update(Product).where(Product.id == product_id)
+    if delta < 0:
+        statement = statement.where(Product.stock_quantity >= -delta)
+
+    result = db.session.execute(
+        statement.values(stock_quantity=Product.stock_quantity + delta)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+
+    # Ni nouvelle version du catalogue ni purge du cache : le stock affiché
+    # est rafraîchi par période (HTTP_CACHE_STOCK_REFRESH, app.utils.http_cache)
+    return True
+
+# ============================================================================
+#                         RÉSERVATIONS
+# ============================================================================
+
+def reservation_ttl(payment_method):
+    """Durée de réservation selon le moyen de paiement."""
+    return current_app.config['STOCK_RESERVATION_TTL'].get(
+        payment_method, current_app.config['STOCK_RESERVATION_DEFAULT_TTL']
+    )
+
+def reserve_stock(order, lines):
+    """
+    Décrémente le stock de chaque ligne et enregistre les réservations (sans commit)
+
+    Les lignes sont traitées par ID croissant pour que deux commandes
+    concurrentes verrouillent les produits dans le même ordre. En cas
+    d'échec, l'appelant doit annuler la transaction (rollback).
+
+    Args:
+        order (Order): Commande en cours de création
+        lines (list): Couples (product_id, quantité)
+
+    Returns:
+        list: IDs des produits dont le stock est insuffisant (vide si tout est réservé)
+    """
+    expires_at = datetime.utcnow() + reservation_ttl(order.payment_method)
+
+    shortages = []
+    for product_id, quantity in sorted(lines):
+        if not adjust_stock(product_id, -quantity):
+            shortages.append(product_id)
+            continue
+
+        order.stock_reservations.append(StockReservation(
+            product_id=product_id,
+            quantity=quantity,
+            expires_at=expires_at
+        ))
+
+    return shortages
+
+def release_order_reservations(order):
+    """
+    Restitue au stock les réservations d'une commande (sans commit)
+
+    Chaque réservation est d'abord supprimée par un DELETE dont on vérifie
+    le résultat : une réservation ne peut être restituée qu'une seule fois,
+    même si l'annulation et l'expiration ont lieu en même temps.
+
+    Args:
+        order (Order): Commande concernée
+
+    Returns:
+        int: Nombre d'unités restituées
+    """
+    reservations = db.session.query(
+        StockReservation.id, StockReservation.product_id, StockReservation.quantity
+    ).filter(StockReservation.order_id == order.id).all()
+
+    released = 0
+    for reservation in reservations:
+        claimed = db.session.execute(
+            delete(StockReservation)
+            .where(StockReservation.id == reservation.id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if claimed:
+            adjust_stock(reservation.product_id, reservation.quantity)
+            released += reservation.quantity
+
+    db.session.expire(order, ['stock_reservations'])
+    return released
+
+def restock_paid_order(order):
+    """
+    Annule une commande payée et remet ses articles en stock (sans commit)
+
+    La vente étant définitive, il n'y a plus de réservation à restituer :
+    les quantités commandées sont réintégrées. Le passage au statut
+    CANCELLED est un UPDATE conditionnel, le stock n'est donc restitué
+    qu'une fois même si deux annulations ont lieu en même temps.
+
+    Args:
+        order (Order): Commande payée
+
+    Returns:
+        int: Nombre d'unités restituées
+    """
+    claimed = db.session.execute(
+        update(Order)
+        .where(Order.id == order.id, Order.status != 'CANCELLED')
+        .values(status='CANCELLED')
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        return 0
+
+    released = 0
+    for item in order.items:
+        adjust_stock(item.product_id, item.quantity)
+        released += item.quantity
+
+    db.session.expire(order, ['status'])
+    return released
+
+def confirm_stock_reservations(order):
+    """
+    Rend la vente définitive : les réservations sont supprimées sans
+    restituer le stock (à appeler lorsque le paiement est confirmé)
+
+    Args:
+        order (Order): Commande payée
+    """
+    db.session.execute(
+        delete(StockReservation)
+        .where(StockReservation.order_id == order.id)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.expire(order, ['stock_reservations'])
+
+def confirm_order_payment(order):
+    """
+    Enregistre le paiement d'une commande et rend la vente définitive (sans commit)
+
+    Args:
+        order (Order): Commande payée
+    """
+    order.payment_status = 'PAID'
+    confirm_stock_reservations(order)
+
+def release_expired_reservations(product_ids=None):
+    """
+    Annule les commandes en attente de paiement dont la réservation a
+    expiré et restitue leur stock (sans commit)
+
+    Une commande payée n'a plus de réservation ; le filtre sur le statut
+    de paiement protège en plus les commandes confirmées entre-temps.
+
+    Args:
+        product_ids (list): Limiter aux commandes réservant ces produits
+
+    Returns:
+        int: Nombre de commandes annulées
+    """
+    query = db.session.query(StockReservation.order_id).join(Order).filter(
+        StockReservation.expires_at <= datetime.utcnow(),
+        Order.status == 'PENDING',
+        Order.payment_status == 'PENDING'
+    )
+    if product_ids:
+        query = query.filter(StockReservation.product_id.in_(product_ids))
+
+    order_ids = [row.order_id for row in query.distinct()]
+    if not order_ids:
+        return 0
+
+    cancelled = 0
+    for order in Order.query.filter(Order.id.in_(order_ids)):
+        if release_order_reservations(order):
+            order.status = 'CANCELLED'
+            cancelled += 1
+            current_app.logger.info(f"Commande {order.order_number} annulée : réservation de stock expirée")
+
+    return cancelled
+
+# ============================================================================
+#                         COMMANDES CLI
+# ============================================================================
+
+stock_cli = AppGroup('stock', help='Gestion du stock et des réservations.')
+
+@stock_cli.command('release-expired')
+def release_expired_command():
+    """Restitue le stock des réservations expirées."""
+    cancelled = release_expired_reservations()
+    db.session.commit()
+    click.echo(f"{cancelled} commande(s) annulée(s), stock restitué.")
@@ -59,9 +59,74 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
 
+    # URL publique du site (liens dans les emails)
+    SITE_URL = os.environ.get('SITE_URL', 'http://localhost:5000')
+
+    # File d'envoi des emails (thread du processus web si EMAIL_WORKER_ENABLED,
+    # sinon processus dédié `flask email-worker`)
+    EMAIL_WORKER_ENABLED = os.environ.get('EMAIL_WORKER_ENABLED', 'True') == 'True'
+    EMAIL_BATCH_SIZE = 50
+    EMAIL_CLAIM_LEASE_SECONDS = 300
+    EMAIL_MAX_ATTEMPTS = 6
+    EMAIL_RETRY_BASE_SECONDS = 30
+    EMAIL_RETRY_MAX_SECONDS = 3600
+    EMAIL_POLL_INTERVAL = 10
+
+    # Taille de page maximale des listes paginées (?per_page)
+    PAGINATION_MAX_PER_PAGE = 100
+
+    # Cache HTTP des routes de lecture du catalogue (secondes)
+    HTTP_CACHE_MAX_AGE = 60
+    HTTP_CACHE_STALE_WHILE_REVALIDATE = 300
+    # Période de rafraîchissement du stock affiché (hors version du catalogue)
+    HTTP_CACHE_STOCK_REFRESH = 300
+
+    # Cache serveur des réponses du catalogue ('memory', 'redis' ou 'null')
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    RESPONSE_CACHE_MAX_ENTRIES = 1024
+    RESPONSE_CACHE_TTL = 300
+
+    # Encodeur JSON des réponses ('orjson' si le paquet est installé, sinon 'default')
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+
+    # Compression des réponses JSON / HTML (gzip, brotli si installé)
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_LEVELS = {
+        'application/json': {'gzip': 6, 'br': 5},
+        'application/x-ndjson': {'gzip': 6, 'br': 5},
+        'text/csv': {'gzip': 6, 'br': 5},
+        'text/html': {'gzip': 6, 'br': 5}
+    }
+
+    # Mises en avant de l'accueil (meilleures ventes + épinglages)
+    FEATURED_PRODUCTS_LIMIT = 8
+    FEATURED_CATEGORIES_LIMIT = 6
+    FEATURED_SALES_WINDOW = timedelta(days=90)
+    FEATURED_REFRESH_INTERVAL = 900
+
+    # Import du catalogue (lignes par lot)
+    CATALOG_IMPORT_BATCH_SIZE = 2000
+
+    # Moyens de paiement réglés à la commande (pas d'étape de confirmation) :
+    # la vente est définitive dès la création, sans réservation à durée limitée
+    PAYMENT_METHODS_PAID_AT_ORDER = ('card',)
+
+    # Réservation du stock des commandes en attente de paiement (par moyen de paiement)
+    STOCK_RESERVATION_TTL = {
+        'transfer': timedelta(days=7)
+    }
+    STOCK_RESERVATION_DEFAULT_TTL = timedelta(hours=1)
+
     # Upload
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
 
+    # Déclinaisons des images produits (processus dédiés, 0 = traitement sur place)
+    IMAGE_PIPELINE_WORKERS = int(os.environ.get('IMAGE_PIPELINE_WORKERS', 2))
+    IMAGE_FORMATS = ('jpeg', 'webp', 'avif')
+    IMAGE_QUALITY = 82
+
     # Sécurité mot de passe
     SECURITY_PASSWORD_LENGTH_MIN = 8
     SECURITY_PASSWORD_REQUIREMENTS = {
@@ -118,6 +183,12 @@ class TestingConfig(Config):
     # Tokens à courte durée pour les tests
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
 
+    # Emails traités explicitement par process_outbox() dans les tests
+    EMAIL_WORKER_ENABLED = False
+
+    # Déclinaisons d'images produites pendant la requête
+    IMAGE_PIPELINE_WORKERS = 0
+
 class ProductionConfig(Config):
     """Configuration de production"""
     
@@ -135,6 +206,9 @@ class ProductionConfig(Config):
     SESSION_COOKIE_SECURE = True
     PERMANENT_SESSION_LIFETIME = timedelta(days=1)
 
+    # Emails envoyés par `flask email-worker` plutôt que par chaque worker web
+    EMAIL_WORKER_ENABLED = os.environ.get('EMAIL_WORKER_ENABLED', 'False') == 'True'
+
 # ============================================================================
 #                         CONFIGURATION PAR DÉFAUT
 # ============================================================================
@@ -0,0 +1,56 @@
+"""Index des colonnes de filtre et de tri
+
+Ajoute les index utilisés par le catalogue (get_products, recherche par slug),
+l'historique des commandes, les adresses et le chargement des images et
+spécifications. Les tables créées par db.create_all() possèdent déjà ces
+index : la migration ne crée que ceux qui manquent.
+
+Revision ID: 0001_index_pack
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_index_pack'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # Produits
+    ('ix_products_slug', 'products', ['slug']),
+    ('ix_products_price', 'products', ['price']),
+    ('ix_products_stock_quantity', 'products', ['stock_quantity']),
+    ('ix_products_category_id', 'products', ['category_id']),
+    ('ix_products_brand_id', 'products', ['brand_id']),
+    ('ix_products_active_category_name', 'products', ['is_active', 'category_id', 'name']),
+    ('ix_products_name_id', 'products', ['name', 'id']),
+    ('ix_product_images_product_id', 'product_images', ['product_id']),
+    ('ix_product_specifications_product_id', 'product_specifications', ['product_id']),
+
+    # Commandes et adresses
+    ('ix_orders_created_at', 'orders', ['created_at']),
+    ('ix_orders_user_created', 'orders', ['user_id', 'created_at']),
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_order_items_product_id', 'order_items', ['product_id']),
+    ('ix_order_addresses_order_id', 'order_addresses', ['order_id']),
+    ('ix_addresses_user_id', 'addresses', ['user_id']),
+
+    # Utilisateurs
+    ('ix_users_created_id', 'users', ['created_at', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
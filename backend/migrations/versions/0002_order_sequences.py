@@ -0,0 +1,33 @@
+"""Compteur mensuel des numéros de commande
+
+Remplace la recherche du dernier numéro du mois (extract sur created_at) par
+une ligne de compteur par mois, incrémentée atomiquement.
+
+Revision ID: 0002_order_sequences
+Revises: 0001_index_pack
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_order_sequences'
+down_revision = '0001_index_pack'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'order_sequences',
+        sa.Column('period', sa.String(length=7), nullable=False),
+        sa.Column('last_value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('period'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('order_sequences', if_exists=True)
@@ -0,0 +1,47 @@
+"""File d'envoi des emails
+
+Les emails transactionnels sont enregistrés dans la transaction qui les
+déclenche puis envoyés en arrière-plan.
+
+Revision ID: 0003_email_outbox
+Revises: 0002_order_sequences
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_email_outbox'
+down_revision = '0002_order_sequences'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('recipients', sa.Text(), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('html_body', sa.Text(), nullable=True),
+        sa.Column('text_body', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index(
+        'ix_email_outbox_status_next_attempt', 'email_outbox',
+        ['status', 'next_attempt_at'], if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_status_next_attempt', table_name='email_outbox', if_exists=True)
+    op.drop_table('email_outbox', if_exists=True)
@@ -0,0 +1,51 @@
+"""Panier côté serveur
+
+Revision ID: 0004_carts
+Revises: 0003_email_outbox
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_carts'
+down_revision = '0003_email_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'carts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('token', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id'),
+        sa.UniqueConstraint('token'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'cart_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cart_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['cart_id'], ['carts.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('cart_id', 'product_id', name='uq_cart_items_cart_product'),
+        if_not_exists=True
+    )
+    op.create_index('ix_cart_items_cart_id', 'cart_items', ['cart_id'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_cart_items_cart_id', table_name='cart_items', if_exists=True)
+    op.drop_table('cart_items', if_exists=True)
+    op.drop_table('carts', if_exists=True)
@@ -0,0 +1,40 @@
+"""Réservations de stock des commandes en attente
+
+Revision ID: 0005_stock_reservations
+Revises: 0004_carts
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_stock_reservations'
+down_revision = '0004_carts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stock_reservations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_stock_reservations_order_id', 'stock_reservations', ['order_id'], if_not_exists=True)
+    op.create_index('ix_stock_reservations_expires_at', 'stock_reservations', ['expires_at'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_stock_reservations_expires_at', table_name='stock_reservations', if_exists=True)
+    op.drop_index('ix_stock_reservations_order_id', table_name='stock_reservations', if_exists=True)
+    op.drop_table('stock_reservations', if_exists=True)
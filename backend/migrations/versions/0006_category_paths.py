@@ -0,0 +1,57 @@
+"""Chemins matérialisés des catégories
+
+Ajoute categories.path ("/1/4/9/") et le calcule pour les catégories
+existantes, parents avant enfants.
+
+Revision ID: 0006_category_paths
+Revises: 0005_stock_reservations
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_category_paths'
+down_revision = '0005_stock_reservations'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Colonne et index déjà présents si la table a été créée par db.create_all()
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('categories')}
+    indexes = {index['name'] for index in inspector.get_indexes('categories')}
+
+    with op.batch_alter_table('categories') as batch_op:
+        if 'path' not in columns:
+            batch_op.add_column(sa.Column('path', sa.String(length=255), nullable=True))
+        if 'ix_categories_path' not in indexes:
+            batch_op.create_index('ix_categories_path', ['path'])
+
+    connection = op.get_bind()
+    parents = dict(connection.execute(sa.text("SELECT id, parent_id FROM categories")).fetchall())
+
+    paths = {}
+    def path_of(category_id, seen=()):
+        if category_id not in paths:
+            parent_id = parents.get(category_id)
+            if parent_id is None or parent_id not in parents or parent_id in seen:
+                paths[category_id] = f"/{category_id}/"
+            else:
+                paths[category_id] = f"{path_of(parent_id, seen + (category_id,))}{category_id}/"
+        return paths[category_id]
+
+    for category_id in parents:
+        connection.execute(
+            sa.text("UPDATE categories SET path = :path WHERE id = :id"),
+            {'path': path_of(category_id), 'id': category_id}
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('categories') as batch_op:
+        batch_op.drop_index('ix_categories_path')
+        batch_op.drop_column('path')
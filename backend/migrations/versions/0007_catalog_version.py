@@ -0,0 +1,34 @@
+"""Compteur de version du catalogue (ETag des routes de lecture)
+
+Revision ID: 0007_catalog_version
+Revises: 0006_category_paths
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_catalog_version'
+down_revision = '0006_category_paths'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_version = op.create_table(
+        'catalog_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    if catalog_version is not None:
+        op.bulk_insert(catalog_version, [{'id': 1, 'version': 1, 'updated_at': datetime.utcnow()}])
+
+
+def downgrade():
+    op.drop_table('catalog_version', if_exists=True)
@@ -0,0 +1,34 @@
+"""Produits et catégories épinglés sur l'accueil
+
+Revision ID: 0008_featured_positions
+Revises: 0007_catalog_version
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_featured_positions'
+down_revision = '0007_catalog_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Colonnes déjà présentes si les tables ont été créées par db.create_all()
+    inspector = sa.inspect(op.get_bind())
+
+    for table in ('products', 'categories'):
+        if 'featured_position' not in {column['name'] for column in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column('featured_position', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('categories') as batch_op:
+        batch_op.drop_column('featured_position')
+
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_column('featured_position')
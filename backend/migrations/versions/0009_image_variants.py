@@ -0,0 +1,46 @@
+"""Déclinaisons des images produits (tailles, WebP/AVIF, srcset)
+
+Les images existantes restent servies telles quelles (statut 'ready',
+sans déclinaison) ; `flask images process --all` peut les traiter.
+
+Revision ID: 0009_image_variants
+Revises: 0008_featured_positions
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_image_variants'
+down_revision = '0008_featured_positions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Colonnes déjà présentes si la table a été créée par db.create_all()
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('product_images')}
+    columns = [
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='ready'),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('variants', sa.JSON(), nullable=True),
+        sa.Column('srcset', sa.JSON(), nullable=True)
+    ]
+
+    missing = [column for column in columns if column.name not in existing]
+    if missing:
+        with op.batch_alter_table('product_images') as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+
+
+def downgrade():
+    with op.batch_alter_table('product_images') as batch_op:
+        batch_op.drop_column('srcset')
+        batch_op.drop_column('variants')
+        batch_op.drop_column('height')
+        batch_op.drop_column('width')
+        batch_op.drop_column('status')
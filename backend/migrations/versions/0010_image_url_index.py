@@ -0,0 +1,26 @@
+"""Index sur l'URL des images produits
+
+Les images sont stockées par contenu : plusieurs lignes peuvent partager
+la même URL, comptée avant de supprimer un fichier.
+
+Revision ID: 0010_image_url_index
+Revises: 0009_image_variants
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_image_url_index'
+down_revision = '0009_image_variants'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_product_images_url', 'product_images', ['url'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_product_images_url', table_name='product_images', if_exists=True)
@@ -0,0 +1,36 @@
+"""Produits favoris des utilisateurs
+
+Table d'association de User.favorites, utilisée par les routes
+/api/products/favorites.
+
+Revision ID: 0011_user_favorites
+Revises: 0010_image_url_index
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_user_favorites'
+down_revision = '0010_image_url_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_favorites',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('user_id', 'product_id'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('user_favorites', if_exists=True)
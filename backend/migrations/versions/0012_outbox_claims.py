@@ -0,0 +1,37 @@
+"""Réservation des emails de la file par lot
+
+Ajoute email_outbox.claim_token : un worker réserve ses emails (statut
+SENDING) par un UPDATE validé avant l'envoi.
+
+Revision ID: 0012_outbox_claims
+Revises: 0011_user_favorites
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_outbox_claims'
+down_revision = '0011_user_favorites'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('email_outbox')}
+    indexes = {index['name'] for index in inspector.get_indexes('email_outbox')}
+
+    with op.batch_alter_table('email_outbox') as batch_op:
+        if 'claim_token' not in columns:
+            batch_op.add_column(sa.Column('claim_token', sa.String(length=32), nullable=True))
+        if 'ix_email_outbox_claim_token' not in indexes:
+            batch_op.create_index('ix_email_outbox_claim_token', ['claim_token'])
+
+
+def downgrade():
+    with op.batch_alter_table('email_outbox') as batch_op:
+        batch_op.drop_index('ix_email_outbox_claim_token')
+        batch_op.drop_column('claim_token')
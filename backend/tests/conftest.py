@@ -5,7 +5,13 @@ Configuration des tests.
 Contient les fixtures pytest utilisées dans les tests.
 """
 
+import os
 import pytest
+
+# config.py lit ces variables à l'import (ProductionConfig)
+for name in ('DATABASE_URL', 'SECRET_KEY', 'JWT_SECRET_KEY', 'PASSWORD_SALT', 'SECURITY_PASSWORD_SALT'):
+    os.environ.setdefault(name, 'sqlite://' if name == 'DATABASE_URL' else 'test')
+
 from app import create_app, db
 from app.models.user import User
 
@@ -21,6 +27,26 @@ def app():
         db.session.remove()  # Nettoyage de la session
         db.drop_all()  # Suppression des tables
 
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """
+    Application sur une base SQLite fichier, partagée entre threads
+    (tests de concurrence : chaque requête a sa propre connexion).
+    """
+    from config import TestingConfig
+
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    # Attente du verrou d'écriture au lieu de "database is locked"
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS', {'connect_args': {'timeout': 60}}, raising=False)
+    app = create_app('testing')
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
 @pytest.fixture
 def client(app):
     """Crée un client de test."""
@@ -36,8 +62,112 @@ def test_user(app):
     )
     user.set_password('password123')
     
-    with app.app_context():
-        db.session.add(user)
-        db.session.commit()
+    # Contexte déjà ouvert par la fixture app (l'instance reste attachée)
+    db.session.add(user)
+    db.session.commit()
     
-    return user
\ No newline at end of file
+    return user
+
+@pytest.fixture
+def auth_headers(app):
+    """En-têtes Authorization (JWT) pour un utilisateur."""
+    from flask_jwt_extended import create_access_token
+
+    def _auth_headers(user):
+        return {'Authorization': f"Bearer {create_access_token(identity=str(user.id))}"}
+
+    return _auth_headers
+
+@pytest.fixture
+def make_catalog(app):
+    """
+    Ajoute une catégorie (et une sous-catégorie), une marque et N produits
+    avec une image et une spécification chacun.
+
+    Usage:
+        category, brand, products = make_catalog(30)
+    """
+    from app.products.models import Category, Brand, Product, ProductImage, ProductSpecification
+
+    def _make_catalog(count, prefix='Encre', stock_quantity=5):
+        category = Category(f"{prefix} catégorie")
+        brand = Brand(f"{prefix} marque")
+        db.session.add_all([category, brand])
+        db.session.flush()
+        db.session.add(Category(f"{prefix} sous-catégorie", parent_id=category.id))
+
+        products = []
+        for index in range(count):
+            product = Product(
+                f"{prefix} produit {index:03d}", f"{prefix.upper()}-{index:03d}", 10 + index,
+                category.id, brand.id, stock_quantity=stock_quantity
+            )
+            product.images.append(ProductImage(url=f"/static/images/products/{prefix}-{index}.jpg", is_primary=True))
+            product.specifications.append(ProductSpecification(name='Couleur', value='Noir'))
+            products.append(product)
+        db.session.add_all(products)
+        db.session.commit()
+        return category, brand, products
+
+    return _make_catalog
+
+@pytest.fixture
+def assert_max_queries(app):
+    """
+    Vérifie qu'un bloc n'exécute pas plus de N requêtes SQL.
+
+    Usage:
+        with assert_max_queries(3):
+            client.get('/api/products/')
+    """
+    from contextlib import contextmanager
+    from sqlalchemy import event
+
+    @contextmanager
+    def _assert_max_queries(max_queries):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} requêtes exécutées (maximum {max_queries}):\n"
+            + "\n".join(statements)
+        )
+
+    return _assert_max_queries
+
+
+@pytest.fixture
+def assert_uses_index(app):
+    """
+    Vérifie via EXPLAIN QUERY PLAN (SQLite) qu'une requête n'effectue pas
+    de parcours complet d'une table.
+
+    Usage:
+        assert_uses_index(Product.query.filter_by(slug='x'), 'products')
+        assert_uses_index(query, 'products', index='ix_products_slug')
+    """
+    from sqlalchemy import text
+
+    def _assert_uses_index(query, table, index=None):
+        statement = getattr(query, 'statement', query)
+        compiled = statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+        plan = [row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+        full_scans = [
+            detail for detail in plan
+            if detail.startswith(f"SCAN {table}") and 'USING' not in detail
+        ]
+        assert not full_scans, f"Parcours complet de {table}: {plan}"
+        if index is not None:
+            assert any(f"USING INDEX {index} " in f"{detail} " for detail in plan), f"Index {index} non utilisé: {plan}"
+        return plan
+
+    return _assert_uses_index
@@ -0,0 +1,96 @@
+# backend/tests/test_cart.py
+
+"""
+Panier serveur : remplacement, jeton anonyme, fusion à la connexion et
+validation des prix et du stock.
+"""
+
+from app import db
+from app.cart.utils import CART_TOKEN_HEADER
+
+BASE_URL = 'https://localhost'
+
+def _put_cart(client, items, headers=None):
+    return client.put('/api/cart', headers=headers or {}, base_url=BASE_URL, json={'items': items})
+
+def _quantities(cart):
+    return {item['product_id']: item['quantity'] for item in cart['items']}
+
+def test_replace_twice_with_same_product(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(3)
+    headers = auth_headers(test_user)
+
+    first = _put_cart(client, [{'product_id': products[0].id, 'quantity': 1},
+                               {'product_id': products[1].id, 'quantity': 2}], headers)
+    assert first.status_code == 200
+
+    # Même produit conservé, un retiré, un ajouté (synchronisation de checkout.js)
+    second = _put_cart(client, [{'product_id': products[0].id, 'quantity': 3},
+                                {'product_id': products[2].id, 'quantity': 1}], headers)
+    assert second.status_code == 200
+    assert _quantities(second.get_json()) == {products[0].id: 3, products[2].id: 1}
+
+    cart = client.get('/api/cart', headers=headers, base_url=BASE_URL).get_json()
+    assert _quantities(cart) == {products[0].id: 3, products[2].id: 1}
+
+def test_anonymous_token_replace(client, make_catalog):
+    _, _, products = make_catalog(2)
+
+    created = _put_cart(client, [{'id': products[0].id, 'quantity': 1}])
+    assert created.status_code == 200
+    token = created.get_json()['token']
+    assert token
+
+    headers = {CART_TOKEN_HEADER: token}
+    replaced = _put_cart(client, [{'id': products[0].id, 'quantity': 2},
+                                  {'id': products[1].id, 'quantity': 1}], headers)
+    assert replaced.status_code == 200
+    assert replaced.get_json()['token'] == token
+    assert _quantities(replaced.get_json()) == {products[0].id: 2, products[1].id: 1}
+
+def test_anonymous_cart_merged_on_login(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(2)
+    _put_cart(client, [{'product_id': products[0].id, 'quantity': 1}], auth_headers(test_user))
+    token = _put_cart(client, [{'product_id': products[0].id, 'quantity': 2},
+                               {'product_id': products[1].id, 'quantity': 1}]).get_json()['token']
+
+    headers = {**auth_headers(test_user), CART_TOKEN_HEADER: token}
+    merged = client.get('/api/cart', headers=headers, base_url=BASE_URL).get_json()
+    assert _quantities(merged) == {products[0].id: 3, products[1].id: 1}
+
+    # Le panier anonyme a été absorbé
+    orphan = client.get('/api/cart', headers={CART_TOKEN_HEADER: token}, base_url=BASE_URL).get_json()
+    assert orphan['items'] == []
+
+def test_price_and_stock_validation(client, make_catalog):
+    _, _, products = make_catalog(3, stock_quantity=2)
+    products[1].is_active = False
+    db.session.commit()
+
+    response = client.post('/api/cart/items', base_url=BASE_URL,
+                           json={'product_id': products[0].id, 'quantity': 1})
+    assert response.status_code == 201
+    headers = {CART_TOKEN_HEADER: response.get_json()['token']}
+
+    cart = _put_cart(client, [{'product_id': products[0].id, 'quantity': 1},
+                              {'product_id': products[1].id, 'quantity': 1},
+                              {'product_id': products[2].id, 'quantity': 5}], headers).get_json()
+
+    # Produit désactivé ignoré, stock insuffisant signalé
+    statuses = {item['product_id']: item['status'] for item in cart['items']}
+    assert statuses == {products[0].id: 'ok', products[2].id: 'insufficient_stock'}
+    assert cart['valid'] is False
+    assert cart['item_count'] == 6
+    assert cart['subtotal_ttc'] == round(products[0].price + products[2].price * 5, 2)
+    assert cart['shipping'] == 0.0
+
+    products[2].stock_quantity = 10
+    db.session.commit()
+    cart = client.get('/api/cart', headers=headers, base_url=BASE_URL).get_json()
+    assert cart['valid'] is True
+
+def test_invalid_quantity_is_rejected(client, make_catalog):
+    _, _, products = make_catalog(1)
+
+    response = _put_cart(client, [{'product_id': products[0].id, 'quantity': 0}])
+    assert response.status_code == 400
@@ -0,0 +1,55 @@
+# backend/tests/test_catalog_caches.py
+
+"""
+Caches en mémoire du catalogue (suggestions, arbre des catégories) : une
+modification validée par un autre processus doit être vue au prochain accès.
+
+L'autre processus est simulé par des UPDATE hors ORM suivis d'une nouvelle
+version du catalogue : aucun événement local ne vide les caches.
+"""
+
+import json
+from sqlalchemy import update
+from app import db
+from app.products.models import Product, Category
+from app.products.categories import category_tree
+from app.utils.http_cache import bump_catalog_version
+
+BASE_URL = 'https://localhost'
+
+def _commit_from_other_process(statement):
+    db.session.execute(statement.execution_options(synchronize_session=False))
+    bump_catalog_version(db.session.connection())
+    db.session.commit()
+
+def _suggest(client, query):
+    response = client.get('/api/products/suggest', query_string={'q': query}, base_url=BASE_URL)
+    assert response.status_code == 200
+    return [suggestion['label'] for suggestion in response.get_json()['suggestions']]
+
+def test_suggestions_follow_other_process(client, make_catalog):
+    _, _, products = make_catalog(2)
+    assert 'Encre produit 000' in _suggest(client, 'Encre produit')
+
+    _commit_from_other_process(
+        update(Product).where(Product.id == products[0].id).values(name='Toner laser 000')
+    )
+
+    assert _suggest(client, 'Toner') == ['Toner laser 000']
+    assert 'Encre produit 000' not in _suggest(client, 'Encre produit')
+
+def test_category_tree_follows_other_process(app, make_catalog):
+    category, _, _ = make_catalog(1)
+    sub = Category.query.filter_by(parent_id=category.id).one()
+    assert category_tree.descendant_ids([category.id]) == {category.id, sub.id}
+
+    _commit_from_other_process(
+        update(Category).where(Category.id == sub.id).values(
+            name='Toners', parent_id=None, path=f'/{sub.id}/'
+        )
+    )
+
+    assert category_tree.descendant_ids([category.id]) == {category.id}
+    roots = {node['name']: node for node in json.loads(category_tree.document())}
+    assert roots['Toners']['depth'] == 0
+    assert roots[category.name]['children'] == []
@@ -0,0 +1,54 @@
+# backend/tests/test_http_cache.py
+
+"""
+ETag / 304 des routes de lecture du catalogue : version du catalogue et
+période de rafraîchissement du stock.
+"""
+
+from app import db
+from app.products.models import Product
+from app.utils import http_cache
+from app.utils.http_cache import get_catalog_version
+from app.utils.stock import adjust_stock
+
+BASE_URL = 'https://localhost'
+
+def _get(client, url, etag=None):
+    headers = {'If-None-Match': etag} if etag else {}
+    return client.get(url, headers=headers, base_url=BASE_URL)
+
+def test_catalog_edit_changes_etag(client, make_catalog):
+    _, _, products = make_catalog(3)
+    etag = _get(client, '/api/products/').headers['ETag']
+    assert _get(client, '/api/products/', etag).status_code == 304
+
+    products[0].price = 99
+    db.session.commit()
+
+    response = _get(client, '/api/products/', etag)
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_sale_does_not_bump_catalog_version(client, make_catalog):
+    _, _, products = make_catalog(3)
+    version = get_catalog_version()[0]
+    etag = _get(client, f"/api/products/{products[0].id}").headers['ETag']
+
+    assert adjust_stock(products[0].id, -1)
+    db.session.commit()
+    assert db.session.get(Product, products[0].id).stock_quantity == 4
+
+    assert get_catalog_version()[0] == version
+    assert _get(client, f"/api/products/{products[0].id}", etag).status_code == 304
+
+def test_stock_refresh_period_changes_etag(client, make_catalog, monkeypatch):
+    _, _, products = make_catalog(3)
+    url = f"/api/products/{products[0].id}"
+    etag = _get(client, url).headers['ETag']
+
+    period = http_cache._stock_period()
+    monkeypatch.setattr(http_cache, '_stock_period', lambda: period + 1)
+
+    response = _get(client, url, etag)
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
@@ -0,0 +1,40 @@
+# backend/tests/test_indexes.py
+
+"""
+Plans d'exécution (EXPLAIN QUERY PLAN) des requêtes les plus fréquentes :
+chacune doit passer par l'index prévu (voir migration 0001_index_pack).
+"""
+
+import pytest
+from sqlalchemy import select
+from app.products.models import Product
+from app.products.read import listing_query
+from app.orders.models import Address
+from app.utils.serializers import order_summary_statement, PRODUCT_COLUMNS
+
+@pytest.mark.parametrize('condition, index', [
+    (lambda: Product.category_id.in_([1, 2]), 'ix_products_category_id'),
+    (lambda: Product.brand_id == 3, 'ix_products_brand_id'),
+    (lambda: Product.price.between(10, 20), 'ix_products_price'),
+    (lambda: Product.stock_quantity > 0, 'ix_products_stock_quantity')
+])
+def test_product_listing_filters(assert_uses_index, condition, index):
+    # Sans tri : avec ORDER BY name, SQLite peut préférer ix_products_name_id
+    query = listing_query().filter(condition())
+    assert_uses_index(query, 'products', index=index)
+
+def test_product_listing_sort(assert_uses_index):
+    query = listing_query().order_by(Product.name, Product.id).limit(10)
+    assert_uses_index(query, 'products', index='ix_products_name_id')
+
+def test_product_slug_lookup(assert_uses_index):
+    statement = select(*PRODUCT_COLUMNS).where(Product.slug == 'cartouche-noire').limit(1)
+    assert_uses_index(statement, 'products', index='ix_products_slug')
+
+def test_order_history(assert_uses_index):
+    statement = order_summary_statement(1)
+    assert_uses_index(statement, 'orders', index='ix_orders_user_created')
+    assert_uses_index(statement, 'order_items', index='ix_order_items_order_id')
+
+def test_user_addresses(assert_uses_index):
+    assert_uses_index(Address.query.filter_by(user_id=1), 'addresses', index='ix_addresses_user_id')
@@ -0,0 +1,39 @@
+# backend/tests/test_migrations.py
+
+"""
+Migrations Flask-Migrate appliquées à une base déjà créée par
+db.create_all() (create_app() crée les tables au démarrage).
+"""
+
+from flask_migrate import upgrade, downgrade
+from sqlalchemy import inspect, text
+from app import db
+
+HEAD = '0012_outbox_claims'
+
+def _revision():
+    return db.session.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+def test_upgrade_on_create_all_database(file_app):
+    upgrade()
+
+    assert _revision() == HEAD
+
+def test_downgrade_then_upgrade_restores_schema(file_app):
+    upgrade()
+    downgrade(revision='0005_stock_reservations')
+
+    inspector = inspect(db.engine)
+    assert 'path' not in {column['name'] for column in inspector.get_columns('categories')}
+    assert 'status' not in {column['name'] for column in inspector.get_columns('product_images')}
+
+    upgrade()
+
+    inspector = inspect(db.engine)
+    assert _revision() == HEAD
+    assert 'ix_categories_path' in {index['name'] for index in inspector.get_indexes('categories')}
+    assert 'featured_position' in {column['name'] for column in inspector.get_columns('products')}
+    assert {'status', 'width', 'height', 'variants', 'srcset'} <= {
+        column['name'] for column in inspector.get_columns('product_images')
+    }
+    assert 'claim_token' in {column['name'] for column in inspector.get_columns('email_outbox')}
@@ -0,0 +1,48 @@
+# backend/tests/test_order_numbers.py
+
+"""
+Numéros de commande attribués par le compteur mensuel (order_sequences)
+sous des validations de commande simultanées.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from app import db
+from app.orders.models import Order
+
+BASE_URL = 'https://localhost'
+ORDERS = 200
+THREADS = 16
+
+SHIPPING_ADDRESS = {
+    'firstname': 'Test', 'lastname': 'User', 'address': '1 rue de la Paix',
+    'postal_code': '75001', 'city': 'Paris', 'country': 'FR', 'phone': '0102030405'
+}
+
+def test_parallel_orders_get_unique_numbers(file_app, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(1, stock_quantity=ORDERS)
+    product_id = products[0].id
+    headers = auth_headers(test_user)
+
+    def place_order(_):
+        # Un client par thread : chaque requête a son contexte et sa session
+        response = file_app.test_client().post('/api/orders', headers=headers, base_url=BASE_URL, json={
+            'cart': [{'product_id': product_id, 'quantity': 1}],
+            'shipping_address': SHIPPING_ADDRESS,
+            'payment_method': 'card'
+        })
+        return response.status_code, response.get_json()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(place_order, range(ORDERS)))
+
+    assert [status for status, _ in results] == [201] * ORDERS, [body for status, body in results if status != 201][:3]
+
+    numbers = [body['order_number'] for _, body in results]
+    assert len(set(numbers)) == ORDERS
+
+    # Numéros consécutifs du mois, sans trou ni doublon
+    sequence = sorted(int(number.rsplit('-', 1)[-1]) for number in numbers)
+    assert sequence == list(range(1, ORDERS + 1))
+
+    db.session.expire_all()
+    assert Order.query.count() == ORDERS
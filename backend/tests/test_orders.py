@@ -0,0 +1,147 @@
+# backend/tests/test_orders.py
+
+"""
+Commandes : détail (propriétaire uniquement), historique, paiement et
+expiration des réservations de stock.
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models.user import User
+from app.products.models import Product
+from app.orders.models import Order, StockReservation
+from app.utils.stock import release_expired_reservations
+
+BASE_URL = 'https://localhost'
+
+SHIPPING_ADDRESS = {
+    'firstname': 'Test', 'lastname': 'User', 'address': '1 rue de la Paix',
+    'postal_code': '75001', 'city': 'Paris', 'country': 'FR', 'phone': '0102030405'
+}
+
+@pytest.fixture
+def order(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(2)
+    response = client.post('/api/orders', headers=auth_headers(test_user), base_url=BASE_URL, json={
+        'cart': [{'product_id': products[0].id, 'quantity': 2}, {'product_id': products[1].id, 'quantity': 1}],
+        'shipping_address': SHIPPING_ADDRESS,
+        'payment_method': 'card'
+    })
+    assert response.status_code == 201
+    return response.get_json()
+
+def test_owner_reads_order(client, order, test_user, auth_headers):
+    response = client.get(f"/api/orders/{order['id']}", headers=auth_headers(test_user), base_url=BASE_URL)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data == order
+    assert data['order_number'].startswith('FMP-')
+    assert sum(item['quantity'] for item in data['items']) == 3
+    assert data['shipping_address']['city'] == 'Paris'
+    assert isinstance(data['total'], float)
+
+def test_other_user_is_refused(client, order, auth_headers):
+    other = User('autre@example.com', 'Autre', 'Client', password='password123')
+    db.session.add(other)
+    db.session.commit()
+
+    response = client.get(f"/api/orders/{order['id']}", headers=auth_headers(other), base_url=BASE_URL)
+    assert response.status_code == 403
+
+def test_order_history(client, order, test_user, auth_headers):
+    history = client.get('/api/orders/history', headers=auth_headers(test_user), base_url=BASE_URL).get_json()
+
+    assert [entry['order_number'] for entry in history] == [order['order_number']]
+    assert history[0]['items_count'] == 3
+    assert history[0]['total'] == order['total']
+
+# ============================================================================
+#                         PAIEMENT ET RÉSERVATIONS
+# ============================================================================
+
+def _place_order(client, headers, product, payment_method, quantity=1):
+    response = client.post('/api/orders', headers=headers, base_url=BASE_URL, json={
+        'cart': [{'product_id': product.id, 'quantity': quantity}],
+        'shipping_address': SHIPPING_ADDRESS,
+        'payment_method': payment_method
+    })
+    assert response.status_code == 201
+    return db.session.get(Order, response.get_json()['id'])
+
+def _expire_reservations():
+    StockReservation.query.update({'expires_at': datetime.utcnow() - timedelta(minutes=1)})
+    db.session.commit()
+
+def test_card_order_is_final(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(1)
+    order = _place_order(client, auth_headers(test_user), products[0], 'card', quantity=2)
+
+    assert order.payment_status == 'PAID'
+    assert StockReservation.query.count() == 0
+
+    # Une commande suivante du même produit n'annule pas la première
+    _place_order(client, auth_headers(test_user), products[0], 'card')
+    db.session.expire_all()
+    assert order.status == 'PENDING'
+    assert db.session.get(Product, products[0].id).stock_quantity == 2
+
+def test_unpaid_transfer_expires(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(1)
+    order = _place_order(client, auth_headers(test_user), products[0], 'transfer', quantity=2)
+    _expire_reservations()
+
+    assert release_expired_reservations() == 1
+    db.session.commit()
+    assert order.status == 'CANCELLED'
+    assert db.session.get(Product, products[0].id).stock_quantity == 5
+
+def test_paid_order_survives_expiry(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(1)
+    order = _place_order(client, auth_headers(test_user), products[0], 'transfer', quantity=2)
+    _expire_reservations()
+
+    # Paiement enregistré alors que la réservation a déjà expiré
+    order.payment_status = 'PAID'
+    db.session.commit()
+
+    assert release_expired_reservations() == 0
+    db.session.commit()
+    db.session.expire_all()
+    assert order.status == 'PENDING'
+    assert db.session.get(Product, products[0].id).stock_quantity == 3
+
+def test_admin_confirms_transfer(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(1)
+    order = _place_order(client, auth_headers(test_user), products[0], 'transfer', quantity=2)
+
+    response = client.put(f'/api/orders/{order.id}/payment', headers=auth_headers(test_user), base_url=BASE_URL)
+    assert response.status_code == 403
+
+    admin = User('admin@example.com', 'Admin', 'Boutique', password='password123')
+    admin.is_admin = True
+    db.session.add(admin)
+    db.session.commit()
+
+    response = client.put(f'/api/orders/{order.id}/payment', headers=auth_headers(admin), base_url=BASE_URL)
+    assert response.status_code == 200
+
+    db.session.expire_all()
+    assert order.payment_status == 'PAID'
+    assert StockReservation.query.count() == 0
+
+    _expire_reservations()
+    assert release_expired_reservations() == 0
+
+def test_cancel_paid_order_restocks_once(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(1)
+    order = _place_order(client, auth_headers(test_user), products[0], 'card', quantity=2)
+
+    for expected in (200, 400):
+        response = client.put(f'/api/orders/{order.id}/cancel', headers=auth_headers(test_user), base_url=BASE_URL)
+        assert response.status_code == expected
+
+    db.session.expire_all()
+    assert order.status == 'CANCELLED'
+    assert db.session.get(Product, products[0].id).stock_quantity == 5
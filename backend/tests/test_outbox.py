@@ -0,0 +1,131 @@
+# backend/tests/test_outbox.py
+
+"""
+File d'envoi des emails : réservation des lots, envoi unique par plusieurs
+workers, report des échecs (serveur SMTP local aiosmtpd, voir
+requirements-test.txt).
+"""
+
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pytest
+from aiosmtpd.controller import Controller
+from app import create_app, db, mail
+from app.models.outbox import EmailOutbox, STATUS_PENDING, STATUS_SENDING, STATUS_SENT
+from app.utils.outbox import queue_email, process_outbox
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class Inbox:
+    """Gestionnaire aiosmtpd qui conserve les messages reçus."""
+
+    def __init__(self):
+        self.messages = []
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.messages.append(envelope.content.decode('utf-8', 'replace'))
+        return '250 OK'
+
+def _use_smtp(app, port):
+    app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=port, MAIL_USE_TLS=False, MAIL_USE_SSL=False,
+                      MAIL_DEFAULT_SENDER='boutique@example.com', MAIL_SUPPRESS_SEND=False)
+    mail.init_app(app)
+
+@pytest.fixture
+def inbox(file_app):
+    """Serveur SMTP local utilisé par l'application."""
+    handler = Inbox()
+    server = Controller(handler, hostname='127.0.0.1', port=_free_port())
+    server.start()
+    _use_smtp(file_app, server.port)
+    yield handler
+    server.stop()
+
+def _queue(count):
+    for index in range(count):
+        queue_email(f"Message {index:03d}", [f"client{index}@example.com"], text='Bonjour')
+    db.session.commit()
+
+def test_parallel_workers_send_each_email_once(file_app, inbox):
+    _queue(60)
+
+    def worker(_):
+        with file_app.app_context():
+            sent = 0
+            while True:
+                processed = process_outbox(batch_size=5)
+                if not processed:
+                    return sent
+                sent += processed
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        processed = sum(executor.map(worker, range(4)))
+
+    assert processed == 60
+    subjects = sorted(line for message in inbox.messages for line in message.splitlines() if line.startswith('Subject:'))
+    assert subjects == [f"Subject: Message {index:03d}" for index in range(60)]
+
+    db.session.expire_all()
+    entries = EmailOutbox.query.all()
+    assert {entry.status for entry in entries} == {STATUS_SENT}
+    assert all(entry.claim_token is None and entry.attempts == 0 for entry in entries)
+
+def test_smtp_down_records_one_failure_per_email(file_app):
+    _use_smtp(file_app, _free_port())  # Aucun serveur à l'écoute
+    _queue(3)
+
+    assert process_outbox() == 3
+
+    db.session.expire_all()
+    for entry in EmailOutbox.query.all():
+        assert entry.status == STATUS_PENDING
+        assert entry.attempts == 1
+        assert entry.claim_token is None
+        assert entry.next_attempt_at > datetime.utcnow()
+
+    # Reporté : rien n'est à envoyer avant l'échéance
+    assert process_outbox() == 0
+
+def test_expired_claim_is_taken_over(file_app, inbox):
+    _queue(1)
+    entry = EmailOutbox.query.one()
+    # Worker arrêté pendant l'envoi : bail expiré
+    entry.status = STATUS_SENDING
+    entry.claim_token = 'worker-arrete'
+    entry.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+    assert process_outbox() == 1
+    assert len(inbox.messages) == 1
+
+def test_active_claim_is_skipped(file_app, inbox):
+    _queue(1)
+    entry = EmailOutbox.query.one()
+    entry.status = STATUS_SENDING
+    entry.claim_token = 'autre-worker'
+    entry.next_attempt_at = datetime.utcnow() + timedelta(minutes=5)
+    db.session.commit()
+
+    assert process_outbox() == 0
+    assert inbox.messages == []
+
+def test_worker_thread_starts_on_first_request(monkeypatch):
+    from config import TestingConfig
+    from app.utils.outbox import email_worker
+
+    started = []
+    monkeypatch.setattr(TestingConfig, 'EMAIL_WORKER_ENABLED', True)
+    monkeypatch.setattr(email_worker, 'start', started.append)
+
+    app = create_app('testing')
+    assert started == []  # Ni à la création de l'application, ni pour les commandes CLI
+
+    app.test_client().get('/api/products/categories', base_url='https://localhost')
+    assert started == [app]
@@ -0,0 +1,83 @@
+# backend/tests/test_pagination.py
+
+"""
+Pagination des listes de produits et d'utilisateurs (page et curseur).
+"""
+
+import pytest
+from app import db
+
+BASE_URL = 'https://localhost'
+
+@pytest.fixture
+def admin_headers(test_user, auth_headers):
+    test_user.is_admin = True
+    db.session.commit()
+    return auth_headers(test_user)
+
+@pytest.mark.parametrize('per_page, expected', [(0, 1), (-5, 1), (1000, 100)])
+def test_products_per_page_is_clamped(client, make_catalog, per_page, expected):
+    make_catalog(120)
+
+    for query in ('', '&cursor='):
+        response = client.get(f"/api/products/?per_page={per_page}{query}", base_url=BASE_URL)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['per_page'] == expected
+        assert len(data['items']) == expected
+
+def test_products_cursor_walks_every_product(client, make_catalog):
+    _, _, products = make_catalog(25)
+
+    seen, cursor = [], ''
+    while cursor is not None:
+        data = client.get(f"/api/products/?per_page=10&cursor={cursor}", base_url=BASE_URL).get_json()
+        seen.extend(item['id'] for item in data['items'])
+        cursor = data['next_cursor']
+
+    assert sorted(seen) == sorted(product.id for product in products)
+    assert len(seen) == len(set(seen))
+
+def test_products_cursor_on_empty_catalog(client):
+    response = client.get('/api/products/?per_page=0&cursor=', base_url=BASE_URL)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['items'] == []
+    assert data['next_cursor'] is None
+    assert data['has_more'] is False
+
+def test_products_invalid_cursor(client):
+    response = client.get('/api/products/?cursor=falsifié', base_url=BASE_URL)
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('per_page', [0, -1, 1000])
+def test_admin_users_per_page_is_clamped(client, admin_headers, per_page):
+    for query in ('', '&cursor='):
+        response = client.get(f"/api/admin/users?per_page={per_page}{query}", headers=admin_headers, base_url=BASE_URL)
+        assert response.status_code == 200
+        assert len(response.get_json()['users']) == 1
+
+def test_multi_category_listing_beyond_max_per_page(client, make_catalog):
+    """Listes de catégories (category-products.js) : tous les produits via le curseur."""
+    from app.products.models import Category, Product
+
+    first, brand, _ = make_catalog(80, prefix='Encre')
+    second, _, _ = make_catalog(70, prefix='Toner')
+    child = Category.query.filter_by(parent_id=first.id).one()
+    db.session.add_all([
+        Product(f"Encre enfant {index:03d}", f"CHILD-{index:03d}", 5, child.id, brand.id) for index in range(10)
+    ])
+    db.session.commit()
+
+    url = f"/api/products/?category_ids={first.id},{second.id}&include_descendants=true&per_page=100&with_total=false"
+    first_page = client.get(url, base_url=BASE_URL).get_json()
+    assert len(first_page['items']) == 100
+
+    seen, cursor = [], ''
+    while cursor is not None:
+        data = client.get(f"{url}&cursor={cursor}", base_url=BASE_URL).get_json()
+        seen.extend(item['id'] for item in data['items'])
+        cursor = data['next_cursor'] if data['has_more'] else None
+
+    assert len(seen) == len(set(seen)) == 160
@@ -0,0 +1,41 @@
+# backend/tests/test_projection.py
+
+"""
+Projections des listes de produits (?fields=... / ?view=card).
+"""
+
+from app.products.projection import VIEWS
+
+BASE_URL = 'https://localhost'
+
+def test_listing_card_view(client, make_catalog):
+    make_catalog(3)
+
+    items = client.get('/api/products/?view=card', base_url=BASE_URL).get_json()['items']
+
+    assert all(item.keys() == set(VIEWS['card']) for item in items)
+    assert items[0]['primary_image'] == '/static/images/products/Encre-0.jpg'
+
+def test_listing_unknown_field(client):
+    assert client.get('/api/products/?fields=id,secret', base_url=BASE_URL).status_code == 400
+
+def test_favorites_projection(client, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(3)
+    headers = auth_headers(test_user)
+    for product in products[:2]:
+        client.post(f"/api/products/favorites/{product.id}", headers=headers, base_url=BASE_URL)
+
+    card = client.get('/api/products/favorites?view=card', headers=headers, base_url=BASE_URL)
+    assert card.status_code == 200
+    assert sorted(item['id'] for item in card.get_json()) == sorted(product.id for product in products[:2])
+    assert all(item.keys() == set(VIEWS['card']) for item in card.get_json())
+
+    fields = client.get('/api/products/favorites?fields=id,name', headers=headers, base_url=BASE_URL)
+    assert fields.get_json()[0].keys() == {'id', 'name'}
+
+    full = client.get('/api/products/favorites', headers=headers, base_url=BASE_URL)
+    assert {'images', 'specifications'} <= full.get_json()[0].keys()
+
+    client.delete(f"/api/products/favorites/{products[0].id}", headers=headers, base_url=BASE_URL)
+    remaining = client.get('/api/products/favorites?fields=id', headers=headers, base_url=BASE_URL).get_json()
+    assert remaining == [{'id': products[1].id}]
@@ -0,0 +1,48 @@
+# backend/tests/test_query_budget.py
+
+"""
+Budget de requêtes SQL des routes de lecture du catalogue.
+
+Le nombre de requêtes ne doit pas dépendre du nombre de produits de la
+page (pas de chargement paresseux produit par produit).
+"""
+
+import pytest
+
+BASE_URL = 'https://localhost'
+
+# (URL, requêtes maximum) : version du catalogue + comptage + page + relations
+BUDGETS = [
+    ('/api/products/?per_page=100', 5),
+    ('/api/products/?per_page=100&include=category,brand', 7),
+    ('/api/products/?per_page=100&view=card', 4),
+    ('/api/products/?per_page=100&cursor=', 5),
+    ('/api/products/search?q=Encre', 4),
+    ('/api/products/categories', 2),
+    ('/api/products/categories/tree', 2),
+    ('/api/products/brands', 2)
+]
+
+@pytest.mark.parametrize('url, max_queries', BUDGETS)
+@pytest.mark.parametrize('count', [3, 40])
+def test_catalog_query_budget(client, make_catalog, assert_max_queries, url, max_queries, count):
+    """Même nombre de requêtes pour 3 ou 40 produits."""
+    make_catalog(count)
+
+    with assert_max_queries(max_queries):
+        response = client.get(url, base_url=BASE_URL)
+
+    assert response.status_code == 200
+
+def test_favorites_query_budget(client, make_catalog, test_user, auth_headers, assert_max_queries):
+    """Favoris : une requête utilisateur, une page de produits, leurs relations."""
+    _, _, products = make_catalog(20)
+    headers = auth_headers(test_user)
+    for product in products:
+        assert client.post(f"/api/products/favorites/{product.id}", headers=headers, base_url=BASE_URL).status_code == 200
+
+    with assert_max_queries(4):
+        response = client.get('/api/products/favorites', headers=headers, base_url=BASE_URL)
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 20
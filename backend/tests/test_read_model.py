@@ -0,0 +1,73 @@
+# backend/tests/test_read_model.py
+
+"""
+Le modèle de lecture (ProductRead.to_dict()) produit exactement le
+résultat de ProductSchema pour la liste, la recherche et la fiche produit.
+"""
+
+import json
+import pytest
+from app import db
+from app.products.models import Product, Category, ProductImage, ProductSpecification
+from app.products.schemas import ProductSchema
+from app.products.samples import add_sample_products
+
+BASE_URL = 'https://localhost'
+
+@pytest.fixture
+def catalog(app):
+    products = add_sample_products(12, 'Parité')
+    category = db.session.get(Category, products[0].category_id)
+    category.description = 'Cartouches compatibles'
+    db.session.add(Category('Parité enfant', parent_id=category.id))
+
+    # Champs optionnels renseignés sur un produit, absents sur les autres
+    product = products[0]
+    product.short_description = 'Noir, 20 ml'
+    product.featured_position = 1
+    product.images.append(ProductImage(
+        url='/static/images/products/parite.jpg', alt='Vue de face', position=1, width=800, height=600,
+        variants={'400': {'webp': {'url': '/x.webp', 'width': 400, 'height': 300}}},
+        srcset={'image/webp': '/x.webp 400w'}
+    ))
+    product.specifications.append(ProductSpecification(name='Volume', value='20', unit='ml', position=1))
+    products[1].category_id = None
+    db.session.commit()
+    return products
+
+def _expected(products, include=()):
+    excluded = tuple(name for name in ('category', 'brand') if name not in include)
+    dumped = ProductSchema(many=True, exclude=excluded).dump(products)
+    return json.loads(json.dumps(dumped))
+
+@pytest.mark.parametrize('include', [(), ('category',), ('category', 'brand')])
+def test_listing_matches_schema(client, catalog, include):
+    query = f"&include={','.join(include)}" if include else ''
+    items = client.get(f"/api/products/?per_page=100{query}", base_url=BASE_URL).get_json()['items']
+
+    products = Product.query.order_by(Product.name).all()
+    assert items == _expected(products, include)
+
+@pytest.mark.parametrize('include', [(), ('category', 'brand')])
+def test_search_matches_schema(client, catalog, include):
+    query = f"&include={','.join(include)}" if include else ''
+    results = client.get(f"/api/products/search?q=Produit{query}", base_url=BASE_URL).get_json()['results']
+
+    assert results
+    products = [db.session.get(Product, item['id']) for item in results]
+    assert results == _expected(products, include)
+
+@pytest.mark.parametrize('include', [(), ('category', 'brand')])
+def test_detail_matches_schema(client, catalog, include):
+    query = f"?include={','.join(include)}" if include else ''
+    for product in catalog[:2]:
+        expected = _expected([product], include)[0]
+        by_id = client.get(f"/api/products/{product.id}{query}", base_url=BASE_URL)
+        by_slug = client.get(f"/api/products/{product.slug}{query}", base_url=BASE_URL)
+
+        assert by_id.get_json() == expected
+        assert by_slug.get_json() == expected
+
+def test_missing_product(client):
+    assert client.get('/api/products/999', base_url=BASE_URL).status_code == 404
+    assert client.get('/api/products/inconnu', base_url=BASE_URL).status_code == 404
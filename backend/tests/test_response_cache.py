@@ -0,0 +1,125 @@
+# backend/tests/test_response_cache.py
+
+"""
+Cache serveur des réponses du catalogue : purge par étiquette, compteurs
+de purge partagés entre processus (stockage Redis simulé par un faux
+client en mémoire) et expiration.
+"""
+
+import fnmatch
+import time
+import pytest
+from app import db
+from app.products.models import Product
+from app.utils.stock import adjust_stock
+from app.utils import response_cache as response_cache_module
+from app.utils.response_cache import response_cache, ResponseCache, RedisCacheBackend, MemoryCacheBackend
+
+BASE_URL = 'https://localhost'
+
+class FakeRedis:
+    """Sous-ensemble de redis-py utilisé par RedisCacheBackend (sans expiration)."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value = self.data.get(key)
+        return value.encode('utf-8') if isinstance(value, str) else value
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        return set(self.data.get(key, ()))
+
+    def expire(self, key, ttl):
+        pass
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def keys(self, pattern):
+        return [key for key in self.data if fnmatch.fnmatch(key, pattern)]
+
+@pytest.fixture
+def redis_cache(app, monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(response_cache, 'backend', RedisCacheBackend(client))
+    return client
+
+def test_redis_backend_serves_and_purges(client, make_catalog, redis_cache, assert_max_queries):
+    _, _, products = make_catalog(3)
+
+    first = client.get('/api/products/', base_url=BASE_URL)
+    assert any(key.startswith('fmp:response:products.get_products') for key in redis_cache.data)
+
+    # Réponse en cache : seule la version du catalogue est lue
+    with assert_max_queries(1):
+        second = client.get('/api/products/', base_url=BASE_URL)
+    assert second.get_json() == first.get_json()
+
+    products[0].price = 99
+    db.session.commit()
+
+    assert not any(key.startswith('fmp:response:products.get_products') for key in redis_cache.data)
+    prices = [item['price'] for item in client.get('/api/products/', base_url=BASE_URL).get_json()['items']]
+    assert 99 in prices
+
+def test_write_keeps_other_entries(client, make_catalog, redis_cache, assert_max_queries):
+    """Une modification de product:1 ne purge pas la réponse de product:2."""
+    _, _, products = make_catalog(2)
+    url = f"/api/products/{products[1].id}"
+    cached = client.get(url, base_url=BASE_URL).get_json()
+
+    products[0].name = 'Encre renommée'
+    db.session.commit()
+
+    with assert_max_queries(1):
+        response = client.get(url, base_url=BASE_URL)
+    assert response.get_json() == cached
+
+def test_response_computed_during_purge_is_ignored(app, redis_cache):
+    """Purge faite par un autre processus pendant le calcul d'une réponse."""
+    worker, other = ResponseCache(), ResponseCache()
+    worker.backend = other.backend = response_cache.backend
+
+    generation = worker.generation()
+    other.invalidate_tags('product:1')
+    worker.set('detail-1', {'body': 'ancien'}, ['product:1'], generation)
+    worker.set('detail-2', {'body': 'inchangé'}, ['product:2'], generation)
+
+    assert worker.get('detail-1') is None
+    assert worker.get('detail-2') == {'body': 'inchangé'}
+
+    # Calculée après la purge : servie
+    worker.set('detail-1', {'body': 'nouveau'}, ['product:1'], worker.generation())
+    assert worker.get('detail-1') == {'body': 'nouveau'}
+
+def test_stock_refreshed_on_expiry(client, make_catalog, monkeypatch):
+    _, _, products = make_catalog(1)
+    monkeypatch.setattr(response_cache, 'backend', MemoryCacheBackend())
+    url = f"/api/products/{products[0].id}"
+    client.get(url, base_url=BASE_URL)
+
+    assert adjust_stock(products[0].id, -2)
+    db.session.commit()
+    assert db.session.get(Product, products[0].id).stock_quantity == 3
+
+    # Le stock ne purge rien : réponse en cache jusqu'à son expiration
+    assert client.get(url, base_url=BASE_URL).get_json()['stock_quantity'] == 5
+
+    now = time.monotonic() + response_cache.default_ttl + 1
+    monkeypatch.setattr(response_cache_module.time, 'monotonic', lambda: now)
+    assert client.get(url, base_url=BASE_URL).get_json()['stock_quantity'] == 3
@@ -0,0 +1,43 @@
+# backend/tests/test_stock_race.py
+
+"""
+Réservation atomique du stock : plusieurs acheteurs simultanés se
+disputent les dernières unités d'un produit.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from app import db
+from app.products.models import Product
+from app.orders.models import StockReservation
+
+BASE_URL = 'https://localhost'
+BUYERS = 40
+UNITS = 5
+
+SHIPPING_ADDRESS = {
+    'firstname': 'Test', 'lastname': 'User', 'address': '1 rue de la Paix',
+    'postal_code': '75001', 'city': 'Paris', 'country': 'FR', 'phone': '0102030405'
+}
+
+def test_last_units_are_sold_once(file_app, make_catalog, test_user, auth_headers):
+    _, _, products = make_catalog(1, stock_quantity=UNITS)
+    product_id = products[0].id
+    headers = auth_headers(test_user)
+
+    def buy(_):
+        response = file_app.test_client().post('/api/orders', headers=headers, base_url=BASE_URL, json={
+            'cart': [{'product_id': product_id, 'quantity': 1}],
+            'shipping_address': SHIPPING_ADDRESS,
+            'payment_method': 'transfer'
+        })
+        return response.status_code
+
+    with ThreadPoolExecutor(max_workers=BUYERS) as executor:
+        statuses = Counter(executor.map(buy, range(BUYERS)))
+
+    assert statuses == {201: UNITS, 409: BUYERS - UNITS}
+
+    db.session.expire_all()
+    assert db.session.get(Product, product_id).stock_quantity == 0
+    assert db.session.query(db.func.sum(StockReservation.quantity)).scalar() == UNITS
@@ -18,9 +18,9 @@ class CategoriesManager {
 
     async loadCategories() {
         try {
-            const response = await fetch('/api/products/categories');
-            const data = await response.json();
-            this.categories = this.organizeCategories(data);
+            // Arborescence déjà construite par le serveur (enfants dans "children")
+            const response = await fetch('/api/products/categories/tree');
+            this.categories = await response.json();
         } catch (error) {
             console.error('Erreur chargement catégories:', error);
             notifications.create({
@@ -31,31 +31,6 @@ class CategoriesManager {
         }
     }
 
-    organizeCategories(categories) {
-        // Création de la structure arborescente
-        const categoryMap = {};
-        const rootCategories = [];
-
-        // Première passe : création du mapping
-        categories.forEach(category => {
-            categoryMap[category.id] = {
-                ...category,
-                children: []
-            };
-        });
-
-        // Deuxième passe : organisation de l'arbre
-        categories.forEach(category => {
-            if (category.parent_id) {
-                categoryMap[category.parent_id].children.push(categoryMap[category.id]);
-            } else {
-                rootCategories.push(categoryMap[category.id]);
-            }
-        });
-
-        return rootCategories;
-    }
-
     renderCategoriesTree() {
         const container = document.getElementById('categories-tree');
         container.innerHTML = this.buildCategoryHTML(this.categories);
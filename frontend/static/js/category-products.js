@@ -91,35 +91,28 @@ async function loadProductsByCategories(categoryIds) {
     `;
 
     try {
-        let allProducts = [];
-
-        // Charger les produits pour chaque catégorie en parallèle
-        const promises = categoryIds.map(categoryId => 
-            fetch(`/api/products/?category_id=${categoryId}&per_page=50`)
-                .then(response => {
-                    if (!response.ok) {
-                        throw new Error(`Erreur HTTP: ${response.status}`);
-                    }
-                    return response.json();
-                })
-                .then(data => {
-                    if (data.items && data.items.length > 0) {
-                        console.log(`Chargé ${data.items.length} produits pour la catégorie ${categoryId}`);
-                        return data.items;
-                    }
-                    return [];
-                })
-                .catch(err => {
-                    console.error(`Erreur pour la catégorie ${categoryId}:`, err);
-                    return [];
-                })
-        );
+        // Toutes les catégories (et leurs sous-catégories) en une liste,
+        // parcourue par curseur (per_page est borné côté serveur)
+        const allProducts = [];
+        let cursor = '';
+        while (cursor !== null) {
+            const params = new URLSearchParams({
+                category_ids: categoryIds.join(','),
+                include_descendants: 'true',
+                per_page: 100,
+                with_total: 'false',
+                cursor: cursor
+            });
+            const response = await fetch(`/api/products/?${params}`);
+            if (!response.ok) {
+                throw new Error(`Erreur HTTP: ${response.status}`);
+            }
 
-        // Attendre que toutes les requêtes soient terminées
-        const results = await Promise.all(promises);
-        
-        // Fusionner tous les produits dans un seul tableau
-        allProducts = results.flat();
+            const data = await response.json();
+            allProducts.push(...(data.items || []));
+            cursor = data.has_more ? data.next_cursor : null;
+        }
+        console.log(`Chargé ${allProducts.length} produits pour les catégories ${categoryIds.join(', ')}`);
 
         // Afficher les produits
         displayProducts(allProducts, productsContainer);
@@ -275,14 +275,27 @@ function validatePaymentForm() {
 }
 
 // Traiter la commande
-function processOrder() {
-    // Récupérer les informations de la commande
-    const cart = getCart();
+async function processOrder() {
+    // Le serveur relit prix et stock : on lui transmet d'abord le panier local
+    let serverCart;
+    try {
+        serverCart = await syncServerCart();
+    } catch (error) {
+        console.error('Erreur:', error);
+        alert('Une erreur est survenue lors de la validation de votre commande. Veuillez réessayer.');
+        return;
+    }
+    
+    if (!serverCart.valid) {
+        renderCheckoutSummary(serverCart);
+        alert('Certains articles ne sont plus disponibles dans la quantité demandée. Veuillez vérifier votre panier.');
+        return;
+    }
+    
     const paymentMethod = document.querySelector('input[name="payment_method"]:checked').value;
     
-    // Créer l'objet de commande
+    // Créer l'objet de commande (les articles sont ceux du panier serveur)
     const orderData = {
-        cart: cart,
         shipping_address: {
             firstname: document.getElementById('firstname').value,
             lastname: document.getElementById('lastname').value,
@@ -365,43 +378,50 @@ function displayOrderConfirmation(orderData) {
     orderDetailsContainer.appendChild(totalsElement);
 }
 
-// Mettre à jour le résumé de commande dans la sidebar
+// Mettre à jour le résumé de commande dans la sidebar (prix recalculés par le serveur)
 function updateCheckoutSummary() {
-    const cart = getCart();
+    syncServerCart()
+        .then(renderCheckoutSummary)
+        .catch(error => console.error('Erreur lors du calcul du panier:', error));
+}
+
+// Afficher le panier calculé par le serveur
+function renderCheckoutSummary(serverCart) {
     const container = document.getElementById('checkout-cart-summary');
     
     let html = '';
     
     // Ajouter chaque article
-    cart.forEach(item => {
+    serverCart.items.forEach(item => {
+        if (item.status === 'not_found') return;
+        
+        const warning = item.status === 'ok' ? '' :
+            `<div class="item-warning">${item.status === 'insufficient_stock'
+                ? `Stock disponible : ${item.stock_quantity}`
+                : 'Produit indisponible'}</div>`;
+        
         html += `
             <div class="cart-item">
                 <div class="item-image">
-                    <img src="${item.image}" alt="${item.name}">
+                    <img src="${item.image || '/static/images/products/placeholder.jpg'}" alt="${item.name}">
                 </div>
                 <div class="item-details">
                     <h4>${item.name}</h4>
                     <div class="item-quantity">Qté: ${item.quantity}</div>
+                    ${warning}
                 </div>
                 <div class="item-price">
-                    ${(item.price * item.quantity).toFixed(2)} €
+                    ${item.line_total.toFixed(2)} €
                 </div>
             </div>
         `;
     });
     
-    // Calculer les totaux
-    const subtotalHT = cart.reduce((sum, item) => sum + (item.price * item.quantity / 1.2), 0);
-    const tax = subtotalHT * 0.2;
-    const subtotalTTC = subtotalHT + tax;
-    
-    // Calculer les frais de livraison
-    let shippingCost = 0;
-    if (subtotalTTC < 49) {
-        shippingCost = 5.90;
-    }
-    
-    const total = subtotalTTC + shippingCost;
+    const subtotalHT = serverCart.subtotal_ht;
+    const tax = serverCart.tax;
+    const subtotalTTC = serverCart.subtotal_ttc;
+    const shippingCost = serverCart.shipping;
+    const total = serverCart.total;
     
     // Ajouter le récapitulatif
     html += `
@@ -450,6 +470,22 @@ async function fetchWithAuth(url, options = {}) {
     });
 }
 
+// Envoyer le panier local au serveur, qui renvoie prix, stock et totaux à jour
+async function syncServerCart() {
+    const items = getCart().map(item => ({ product_id: item.id, quantity: item.quantity }));
+    
+    const response = await fetchWithAuth('/api/cart', {
+        method: 'PUT',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ items: items })
+    });
+    
+    if (!response.ok) throw new Error('Erreur lors du calcul du panier');
+    return response.json();
+}
+
 // Récupérer le panier depuis localStorage
 function getCart() {
     return JSON.parse(localStorage.getItem('cart') || '[]');
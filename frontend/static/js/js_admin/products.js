@@ -370,12 +370,47 @@ function getNestedPropertyValue(obj, path) {
     return value;
 }
 
+// État du défilement infini (pagination par curseur)
+let nextCursor = null;
+let isLoadingMore = false;
+let scrollObserver = null;
+
+/**
+ * Construit l'URL de l'API produits avec les filtres du formulaire
+ * @param {string} cursor - Curseur de la page suivante ('' pour la première page)
+ * @param {boolean} withTotal - Demander le nombre total de résultats
+ * @returns {string} URL de requête
+ */
+function buildProductsUrl(cursor, withTotal) {
+    const searchInput = document.getElementById('search-input')?.value || '';
+    const categoryFilter = document.getElementById('category-filter')?.value || '';
+    const brandFilter = document.getElementById('brand-filter')?.value || '';
+    const stockFilter = document.getElementById('stock-filter')?.value || '';
+    const minPrice = document.getElementById('min-price')?.value || '';
+    const maxPrice = document.getElementById('max-price')?.value || '';
+    const activeOnly = document.getElementById('active-only')?.checked || false;
+    const sortBy = document.getElementById('sort-select')?.value || 'name-asc';
+    const perPage = document.getElementById('per-page-select')?.value || '25';
+    
+    let url = `/api/products/?cursor=${encodeURIComponent(cursor)}&per_page=${perPage}&with_total=${withTotal}`;
+    if (searchInput) url += `&search=${encodeURIComponent(searchInput)}`;
+    if (categoryFilter) url += `&category_id=${categoryFilter}`;
+    if (brandFilter) url += `&brand_id=${brandFilter}`;
+    if (stockFilter) url += `&stock=${stockFilter}`;
+    if (minPrice) url += `&min_price=${minPrice}`;
+    if (maxPrice) url += `&max_price=${maxPrice}`;
+    if (activeOnly) url += `&active=1`;
+    if (sortBy) url += `&sort=${sortBy}`;
+    
+    return url;
+}
+
 /**
- * Charge les produits depuis l'API
- * @param {number} page - Numéro de page à charger
+ * Charge la première page de produits depuis l'API
+ * Les pages suivantes sont chargées au défilement (voir loadMoreProducts)
  * @returns {Promise<void>}
  */
-async function loadProducts(page = 1) {
+async function loadProducts() {
     console.log("Chargement des produits...");
     try {
         const tableBody = document.getElementById('products-table-body');
@@ -394,27 +429,10 @@ async function loadProducts(page = 1) {
             </tr>
         `;
         
-        // Construire l'URL avec les filtres
-        const searchInput = document.getElementById('search-input')?.value || '';
-        const categoryFilter = document.getElementById('category-filter')?.value || '';
-        const brandFilter = document.getElementById('brand-filter')?.value || '';
-        const stockFilter = document.getElementById('stock-filter')?.value || '';
-        const minPrice = document.getElementById('min-price')?.value || '';
-        const maxPrice = document.getElementById('max-price')?.value || '';
-        const activeOnly = document.getElementById('active-only')?.checked || false;
-        const sortBy = document.getElementById('sort-select')?.value || 'name-asc';
-        const perPage = document.getElementById('per-page-select')?.value || '25';
-        
-        let url = `/api/products/?page=${page}&per_page=${perPage}`;
-        if (searchInput) url += `&search=${encodeURIComponent(searchInput)}`;
-        if (categoryFilter) url += `&category_id=${categoryFilter}`;
-        if (brandFilter) url += `&brand_id=${brandFilter}`;
-        if (stockFilter) url += `&stock=${stockFilter}`;
-        if (minPrice) url += `&min_price=${minPrice}`;
-        if (maxPrice) url += `&max_price=${maxPrice}`;
-        if (activeOnly) url += `&active=1`;
-        if (sortBy) url += `&sort=${sortBy}`;
+        nextCursor = null;
         
+        // Le total n'est demandé que pour la première page
+        const url = buildProductsUrl('', true);
         console.log("URL de requête produits:", url);
         
         const response = await fetch(url);
@@ -426,18 +444,10 @@ async function loadProducts(page = 1) {
         const data = await response.json();
         console.log("Données produits reçues:", data);
         
-        // Pour le débogage, examiner la structure du premier produit si disponible
-        if (data.items && data.items.length > 0) {
-            console.log("Structure du premier produit:", JSON.stringify(data.items[0], null, 2));
-            console.log("Category du premier produit:", data.items[0].category);
-            console.log("Brand du premier produit:", data.items[0].brand);
-        }
-        
         // Adapter au format de l'API
         const products = data.items || [];
         const total = data.total || 0;
-        const currentPage = data.page || 1;
-        const lastPage = data.pages || 1;
+        nextCursor = data.has_more ? data.next_cursor : null;
         
         // Mettre à jour le compteur de résultats
         const resultsCount = document.getElementById('results-count');
@@ -456,113 +466,10 @@ async function loadProducts(page = 1) {
             `;
         } else {
             tableBody.innerHTML = '';
-            
-            products.forEach(product => {
-                // Sécurité pour éviter les erreurs
-                const stockQuantity = product.stock_quantity || 0;
-                const minStockLevel = product.min_stock_level || 5;
-                
-                const stockClass = stockQuantity > minStockLevel ? 'in-stock' :
-                               stockQuantity > 0 ? 'low-stock' :
-                               'out-of-stock';
-                               
-                const statusClass = product.is_active ? 'active' : 'inactive';
-                const statusText = product.is_active ? 'Actif' : 'Inactif';
-                
-                // Version améliorée pour extraire les noms de catégorie et marque
-                const categoryName = getNestedPropertyValue(product, 'category.name') ||
-                                  getNestedPropertyValue(product, 'category_name') ||
-                                  'Non catégorisé';
-                
-                const brandName = getNestedPropertyValue(product, 'brand.name') ||
-                               getNestedPropertyValue(product, 'brand_name') ||
-                               'Sans marque';
-                
-                // Image placeholder
-                const placeholderPath = '/static/images/products/placeholder.jpg';
-                let imageUrl;
-
-                if (product.images && product.images.length > 0) {
-                    // Utiliser la première image du produit
-                    imageUrl = product.images[0].url;
-                } else if (product.image_url) {
-                    // Utiliser l'URL de l'image si disponible
-                    imageUrl = product.image_url;
-                } else {
-                    // Utiliser le placeholder uniquement si aucune image n'est disponible
-                    imageUrl = placeholderPath;
-                }
-
-                const row = document.createElement('tr');
-                row.innerHTML = `
-                    <td>
-                        <label class="checkbox-container">
-                            <input type="checkbox" class="product-checkbox" value="${product.id}">
-                            <span class="checkmark"></span>
-                        </label>
-                    </td>
-                    <td class="image-cell">
-                        <div class="product-thumbnail">
-                            <img src="${imageUrl}" alt="${product.name || 'Produit'}" onerror="this.src='data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAGQAAABkCAYAAABw4pVUAAAABmJLR0QA/wD/AP+gvaeTAAAB70lEQVR4nO3doW4UQRSG4XeJQBCMIQiMa4JDkwZHHQ9QLPE8BLyAPIUmQYEhQYEiCMIljZ2QS9gEMXvOzM73Sbbnx+zMtydn9+zZSZIkSZIkSZIkSZIkSZKkkVzr8SaHh4dbwCPgDrAFXO/xvjVcAGfAMfABeH1ycvK99xvdGCDCa+ApsNn7/R7IP8A+8DIi3vV6k673gySP4g1OB7Cn/Oi55m7XIUnuAweEs8UJsB0Rv3r9cNKDcJV9asDMJoTNXm9O4kFjlbj0UuCxQJJVPw84FoTu9DQIJRmEkoS7rMsZ67KWcmyQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqTQW5Gzp/RkLQqfmQXqJiM/AdJ3XrGLu7Oz0q5Y28lDWDsfAbfyD9kvAXkQ87HXT3X7YJIvZHe8ZYHb9zG7uvtNz+uGN0y/JJvAIOABOge2a6YeLnM+PRcT5OtZzP8hnALNb84vWdR+QJEmSJEmSJEmSJEmSJElaT/8BRvAPS2qSZhMAAAAASUVORK5CYII='">
-                        </div>
-                    </td>
-                    <td class="name-cell">
-                        <div class="product-name">${product.name || 'Sans nom'}</div>
-                    </td>
-                    <td>${product.sku || 'N/A'}</td>
-                    <td>${categoryName}</td>
-                    <td>${brandName}</td>
-                    <td>${typeof product.price === 'number' ? product.price.toFixed(2) : '0.00'} €</td>
-                    <td class="stock-cell">
-                        <span class="stock-badge ${stockClass}">${stockQuantity}</span>
-                    </td>
-                    <td>
-                        <span class="status-badge ${statusClass}">${statusText}</span>
-                    </td>
-                    <td class="actions-cell">
-                        <div class="actions-dropdown">
-                            <button class="btn-actions">Actions</button>
-                            <div class="dropdown-content">
-                                <a href="/admin/pages/products/edit.html?id=${product.id}" class="dropdown-item">
-                                    <span class="icon-edit"></span> Modifier
-                                </a>
-                                <a href="#" class="dropdown-item duplicate-product" data-id="${product.id}">
-                                    <span class="icon-duplicate"></span> Dupliquer
-                                </a>
-                                <a href="#" class="dropdown-item delete-product" data-id="${product.id}">
-                                    <span class="icon-delete"></span> Supprimer
-                                </a>
-                            </div>
-                        </div>
-                    </td>
-                `;
-                
-                tableBody.appendChild(row);
-            });
-            
-            // Ajouter les écouteurs pour les checkboxes
-            document.querySelectorAll('.product-checkbox').forEach(checkbox => {
-                checkbox.addEventListener('change', updateSelectedCount);
-            });
-            
-            // Ajouter les écouteurs pour les actions
-            document.querySelectorAll('.delete-product').forEach(button => {
-                button.addEventListener('click', (e) => {
-                    e.preventDefault();
-                    showDeleteConfirmation(button.dataset.id);
-                });
-            });
-            
-            document.querySelectorAll('.duplicate-product').forEach(button => {
-                button.addEventListener('click', (e) => {
-                    e.preventDefault();
-                    duplicateProduct(button.dataset.id);
-                });
-            });
+            products.forEach(product => tableBody.appendChild(createProductRow(product)));
         }
         
-        // Générer la pagination
-        generatePagination(currentPage, lastPage);
+        setupInfiniteScroll();
         
         console.log("Produits chargés avec succès");
     } catch (error) {
@@ -584,88 +491,163 @@ async function loadProducts(page = 1) {
 }
 
 /**
- * Génère la pagination
- * @param {number} currentPage - Page actuelle
- * @param {number} lastPage - Dernière page
+ * Charge la page suivante à partir du curseur et l'ajoute au tableau
+ * @returns {Promise<void>}
  */
-function generatePagination(currentPage, lastPage) {
-    const container = document.getElementById('pagination-container');
-    if (!container) return;
-    
-    container.innerHTML = '';
+async function loadMoreProducts() {
+    if (!nextCursor || isLoadingMore) return;
     
-    // Si aucune page, ne pas afficher de pagination
-    if (lastPage <= 1) return;
-    
-    // Bouton précédent
-    const prevButton = document.createElement('button');
-    prevButton.className = 'btn-pagination';
-    prevButton.disabled = currentPage === 1;
-    prevButton.innerHTML = '<span class="icon-chevron-left"></span>';
-    prevButton.addEventListener('click', () => {
-        if (currentPage > 1) {
-            loadProducts(currentPage - 1);
+    isLoadingMore = true;
+    try {
+        const response = await fetch(buildProductsUrl(nextCursor, false));
+        
+        if (!response.ok) {
+            throw new Error(`Erreur lors du chargement des produits: ${response.status} ${response.statusText}`);
         }
-    });
-    container.appendChild(prevButton);
-    
-    // Première page
-    if (currentPage > 3) {
-        const firstButton = document.createElement('button');
-        firstButton.className = 'btn-pagination';
-        firstButton.textContent = '1';
-        firstButton.addEventListener('click', () => loadProducts(1));
-        container.appendChild(firstButton);
-        
-        if (currentPage > 4) {
-            const ellipsis = document.createElement('span');
-            ellipsis.className = 'pagination-ellipsis';
-            ellipsis.textContent = '...';
-            container.appendChild(ellipsis);
+        
+        const data = await response.json();
+        const tableBody = document.getElementById('products-table-body');
+        
+        (data.items || []).forEach(product => tableBody.appendChild(createProductRow(product)));
+        nextCursor = data.has_more ? data.next_cursor : null;
+        
+        if (!nextCursor && scrollObserver) {
+            scrollObserver.disconnect();
         }
+    } catch (error) {
+        console.error('Erreur lors du chargement des produits suivants:', error);
+        showNotification('Erreur lors du chargement des produits: ' + error.message, 'error');
+    } finally {
+        isLoadingMore = false;
     }
+}
+
+/**
+ * Observe le bas du tableau pour charger la suite automatiquement
+ */
+function setupInfiniteScroll() {
+    const container = document.getElementById('pagination-container');
+    if (!container) return;
     
-    // Pages autour de la page courante
-    for (let i = Math.max(1, currentPage - 2); i <= Math.min(lastPage, currentPage + 2); i++) {
-        const button = document.createElement('button');
-        button.className = 'btn-pagination';
-        if (i === currentPage) button.classList.add('active');
-        button.textContent = i;
-        button.addEventListener('click', () => {
-            if (i !== currentPage) {
-                loadProducts(i);
-            }
-        });
-        container.appendChild(button);
+    if (scrollObserver) {
+        scrollObserver.disconnect();
     }
     
-    // Dernière page
-    if (currentPage < lastPage - 2) {
-        if (currentPage < lastPage - 3) {
-            const ellipsis = document.createElement('span');
-            ellipsis.className = 'pagination-ellipsis';
-            ellipsis.textContent = '...';
-            container.appendChild(ellipsis);
-        }
-        
-        const lastButton = document.createElement('button');
-        lastButton.className = 'btn-pagination';
-        lastButton.textContent = lastPage;
-        lastButton.addEventListener('click', () => loadProducts(lastPage));
-        container.appendChild(lastButton);
-    }
+    container.innerHTML = '';
+    if (!nextCursor) return;
     
-    // Bouton suivant
-    const nextButton = document.createElement('button');
-    nextButton.className = 'btn-pagination';
-    nextButton.disabled = currentPage === lastPage;
-    nextButton.innerHTML = '<span class="icon-chevron-right"></span>';
-    nextButton.addEventListener('click', () => {
-        if (currentPage < lastPage) {
-            loadProducts(currentPage + 1);
+    const sentinel = document.createElement('div');
+    sentinel.className = 'infinite-scroll-sentinel';
+    container.appendChild(sentinel);
+    
+    scrollObserver = new IntersectionObserver((entries) => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            loadMoreProducts();
         }
+    }, { rootMargin: '200px' });
+    scrollObserver.observe(sentinel);
+}
+
+/**
+ * Crée la ligne du tableau pour un produit
+ * @param {Object} product - Produit renvoyé par l'API
+ * @returns {HTMLTableRowElement} Ligne prête à être insérée
+ */
+function createProductRow(product) {
+            // Sécurité pour éviter les erreurs
+            const stockQuantity = product.stock_quantity || 0;
+            const minStockLevel = product.min_stock_level || 5;
+            
+            const stockClass = stockQuantity > minStockLevel ? 'in-stock' :
+                           stockQuantity > 0 ? 'low-stock' :
+                           'out-of-stock';
+                           
+            const statusClass = product.is_active ? 'active' : 'inactive';
+            const statusText = product.is_active ? 'Actif' : 'Inactif';
+            
+            // Version améliorée pour extraire les noms de catégorie et marque
+            const categoryName = getNestedPropertyValue(product, 'category.name') ||
+                              getNestedPropertyValue(product, 'category_name') ||
+                              'Non catégorisé';
+            
+            const brandName = getNestedPropertyValue(product, 'brand.name') ||
+                           getNestedPropertyValue(product, 'brand_name') ||
+                           'Sans marque';
+            
+            // Image placeholder
+            const placeholderPath = '/static/images/products/placeholder.jpg';
+            let imageUrl;
+
+            if (product.images && product.images.length > 0) {
+                // Utiliser la première image du produit
+                imageUrl = product.images[0].url;
+            } else if (product.image_url) {
+                // Utiliser l'URL de l'image si disponible
+                imageUrl = product.image_url;
+            } else {
+                // Utiliser le placeholder uniquement si aucune image n'est disponible
+                imageUrl = placeholderPath;
+            }
+
+            const row = document.createElement('tr');
+            row.innerHTML = `
+                <td>
+                    <label class="checkbox-container">
+                        <input type="checkbox" class="product-checkbox" value="${product.id}">
+                        <span class="checkmark"></span>
+                    </label>
+                </td>
+                <td class="image-cell">
+                    <div class="product-thumbnail">
+                        <img src="${imageUrl}" alt="${product.name || 'Produit'}" onerror="this.src='data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAGQAAABkCAYAAABw4pVUAAAABmJLR0QA/wD/AP+gvaeTAAAB70lEQVR4nO3doW4UQRSG4XeJQBCMIQiMa4JDkwZHHQ9QLPE8BLyAPIUmQYEhQYEiCMIljZ2QS9gEMXvOzM73Sbbnx+zMtydn9+zZSZIkSZIkSZIkSZIkSZKkkVzr8SaHh4dbwCPgDrAFXO/xvjVcAGfAMfABeH1ycvK99xvdGCDCa+ApsNn7/R7IP8A+8DIi3vV6k673gySP4g1OB7Cn/Oi55m7XIUnuAweEs8UJsB0Rv3r9cNKDcJV9asDMJoTNXm9O4kFjlbj0UuCxQJJVPw84FoTu9DQIJRmEkoS7rMsZ67KWcmyQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqWSQSgapZJBKBqlkkEoGqTQW5Gzp/RkLQqfmQXqJiM/AdJ3XrGLu7Oz0q5Y28lDWDsfAbfyD9kvAXkQ87HXT3X7YJIvZHe8ZYHb9zG7uvtNz+uGN0y/JJvAIOABOge2a6YeLnM+PRcT5OtZzP8hnALNb84vWdR+QJEmSJEmSJEmSJEmSJElaT/8BRvAPS2qSZhMAAAAASUVORK5CYII='">
+                    </div>
+                </td>
+                <td class="name-cell">
+                    <div class="product-name">${product.name || 'Sans nom'}</div>
+                </td>
+                <td>${product.sku || 'N/A'}</td>
+                <td>${categoryName}</td>
+                <td>${brandName}</td>
+                <td>${typeof product.price === 'number' ? product.price.toFixed(2) : '0.00'} €</td>
+                <td class="stock-cell">
+                    <span class="stock-badge ${stockClass}">${stockQuantity}</span>
+                </td>
+                <td>
+                    <span class="status-badge ${statusClass}">${statusText}</span>
+                </td>
+                <td class="actions-cell">
+                    <div class="actions-dropdown">
+                        <button class="btn-actions">Actions</button>
+                        <div class="dropdown-content">
+                            <a href="/admin/pages/products/edit.html?id=${product.id}" class="dropdown-item">
+                                <span class="icon-edit"></span> Modifier
+                            </a>
+                            <a href="#" class="dropdown-item duplicate-product" data-id="${product.id}">
+                                <span class="icon-duplicate"></span> Dupliquer
+                            </a>
+                            <a href="#" class="dropdown-item delete-product" data-id="${product.id}">
+                                <span class="icon-delete"></span> Supprimer
+                            </a>
+                        </div>
+                    </div>
+                </td>
+            `;
+            
+
+    // Ajouter les écouteurs pour la case à cocher et les actions
+    row.querySelector('.product-checkbox').addEventListener('change', updateSelectedCount);
+    
+    row.querySelector('.delete-product').addEventListener('click', (e) => {
+        e.preventDefault();
+        showDeleteConfirmation(product.id);
     });
-    container.appendChild(nextButton);
+    
+    row.querySelector('.duplicate-product').addEventListener('click', (e) => {
+        e.preventDefault();
+        duplicateProduct(product.id);
+    });
+    
+    return row;
 }
 
 /**
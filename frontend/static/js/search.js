@@ -1,21 +1,92 @@
-// static/js/search.js
-document.addEventListener('DOMContentLoaded', function() {
-    const searchForm = document.getElementById('search-form');
-    const searchInput = document.getElementById('search-input');
-    
-    if (searchForm) {
-        searchForm.addEventListener('submit', function(e) {
-            e.preventDefault();
-            
-            const query = searchInput.value.trim();
-            if (query.length < 2) {
-                // Afficher un message si la requête est trop courte
-                alert('Veuillez entrer au moins 2 caractères pour la recherche');
-                return;
-            }
-            
-            // Rediriger vers la page de résultats de recherche
-            window.location.href = `/pages/search-results.html?q=${encodeURIComponent(query)}`;
-        });
-    }
-});
\ No newline at end of file
+// static/js/search.js
+document.addEventListener('DOMContentLoaded', function() {
+    const searchForm = document.getElementById('search-form');
+    const searchInput = document.getElementById('search-input');
+
+    if (searchForm) {
+        searchForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+
+            const query = searchInput.value.trim();
+            if (query.length < 2) {
+                // Afficher un message si la requête est trop courte
+                alert('Veuillez entrer au moins 2 caractères pour la recherche');
+                return;
+            }
+
+            // Rediriger vers la page de résultats de recherche
+            window.location.href = `/pages/search-results.html?q=${encodeURIComponent(query)}`;
+        });
+    }
+
+    if (searchForm && searchInput) {
+        initSuggestions(searchForm, searchInput);
+    }
+});
+
+// ============================================================================
+//                         AUTOCOMPLÉTION
+// ============================================================================
+
+function initSuggestions(searchForm, searchInput) {
+    const list = document.createElement('ul');
+    list.className = 'search-suggestions';
+    list.hidden = true;
+    searchForm.style.position = 'relative';
+    searchForm.appendChild(list);
+
+    let timer = null;
+    let lastQuery = '';
+
+    searchInput.addEventListener('input', function() {
+        clearTimeout(timer);
+        const query = searchInput.value.trim();
+
+        if (query.length < 2) {
+            list.hidden = true;
+            return;
+        }
+
+        // Petite temporisation pour ne pas interroger l'API à chaque touche
+        timer = setTimeout(async function() {
+            lastQuery = query;
+            try {
+                const response = await fetch(`/api/products/suggest?q=${encodeURIComponent(query)}`);
+                if (!response.ok || query !== lastQuery) return;
+
+                const data = await response.json();
+                renderSuggestions(list, data.suggestions || []);
+            } catch (error) {
+                console.error('Erreur autocomplétion:', error);
+            }
+        }, 120);
+    });
+
+    searchInput.addEventListener('blur', function() {
+        // Laisser le temps au clic sur une suggestion d'être pris en compte
+        setTimeout(function() { list.hidden = true; }, 150);
+    });
+}
+
+function renderSuggestions(list, suggestions) {
+    list.innerHTML = '';
+
+    suggestions.forEach(function(suggestion) {
+        const item = document.createElement('li');
+        const link = document.createElement('a');
+
+        if (suggestion.type === 'brand') {
+            link.href = `/pages/search-results.html?q=${encodeURIComponent(suggestion.label)}`;
+            link.textContent = suggestion.label;
+            item.className = 'suggestion-brand';
+        } else {
+            link.href = `/pages/product.html?id=${suggestion.id}`;
+            link.textContent = `${suggestion.label} (${suggestion.sku})`;
+        }
+
+        item.appendChild(link);
+        list.appendChild(item);
+    });
+
+    list.hidden = suggestions.length === 0;
+}